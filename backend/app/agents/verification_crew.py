@@ -23,6 +23,9 @@ from app.agents.tools import (
     cross_reference_claims,
     fetch_github_profile,
 )
+from app.services.llm_budget import token_budget
+from app.services.llm_metrics import llm_calls
+from app.services.prompt_builder import count_tokens
 
 
 def _get_llm_instance():
@@ -42,7 +45,52 @@ def _get_llm_instance():
     if api_key and not os.environ.get("GROQ_API_KEY"):
         os.environ["GROQ_API_KEY"] = api_key
 
-    return LLM(model=_model_name, api_key=api_key)
+    # An explicit LLM_BASE_URL (e.g. the bench stand-in) applies to the crew too
+    base_url = os.getenv("LLM_BASE_URL")
+    if base_url:
+        return _instrumented(LLM(model=_model_name, api_key=api_key, base_url=base_url))
+    return _instrumented(LLM(model=_model_name, api_key=api_key))
+
+
+def _token_usage(llm) -> tuple[int, int]:
+    usage = getattr(llm, "_token_usage", None) or {}
+    return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+
+def _instrumented(llm):
+    """Record every agent turn in ``llm_calls`` under the ``crew_agent`` call
+    site and charge it to the token budget.
+
+    Token counts come from the LLM's running usage totals when it keeps
+    them, otherwise they are estimated from the messages and the reply.
+    """
+    original_call = llm.call
+
+    def call(messages, *args, **kwargs):
+        record = llm_calls.start("crew_agent", getattr(llm, "model", ""))
+        prompt_before, completion_before = _token_usage(llm)
+        try:
+            result = original_call(messages, *args, **kwargs)
+        except Exception as exc:
+            llm_calls.finish(record, "error", getattr(exc, "status_code", None))
+            raise
+
+        prompt, completion = _token_usage(llm)
+        prompt, completion = prompt - prompt_before, completion - completion_before
+        if not prompt:
+            text = messages if isinstance(messages, str) else " ".join(
+                str(m.get("content", "")) for m in messages
+            )
+            prompt = count_tokens(text)
+        if not completion:
+            completion = count_tokens(result if isinstance(result, str) else str(result))
+        llm_calls.finish(record, "success", 200, prompt, completion)
+        token_budget.record(prompt, completion)
+        return result
+
+    # Set on the instance: crewai's LLM may be a pydantic model that rejects unknown attributes
+    object.__setattr__(llm, "call", call)
+    return llm
 
 
 
@@ -0,0 +1,168 @@
+"""Background event loop for outbound I/O.
+
+Pooled ``httpx.AsyncClient`` instances are bound to the loop that created
+them, so all async service engines run on one long-lived loop thread. Async
+request handlers hop onto it with ``await io_loop.run(...)``; synchronous
+callers (CrewAI tools, scripts) block on ``io_loop.run_sync(...)`` or
+start work with ``io_loop.submit(...)``, and streaming responses are
+relayed with ``io_loop.stream(...)``. Because this loop only ever runs I/O
+coroutines it cannot be starved by a handler that blocks the server's own
+loop.
+
+CPU-bound work (PDF parsing, scoring) goes to a ``CPUPool`` instead, so it
+keeps neither loop busy.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import multiprocessing
+import threading
+from typing import Any, AsyncIterator, Callable, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+
+class BackgroundLoop:
+    def __init__(self, name: str = "aris-io") -> None:
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        self.start()
+        assert self._loop is not None
+        return self._loop
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._loop = loop
+            self._thread = threading.Thread(target=_run, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._loop is None or self._thread is None:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+
+    def in_loop(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    async def run(self, coro_factory: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        """Await a coroutine on the I/O loop from any other event loop."""
+        if self.in_loop():
+            return await coro_factory()
+        future = asyncio.run_coroutine_threadsafe(coro_factory(), self.loop)
+        return await asyncio.wrap_future(future)
+
+    async def stream(self, agen_factory: Callable[[], AsyncIterator[T]]) -> AsyncIterator[T]:
+        """Iterate an async generator running on the I/O loop from any other event loop.
+
+        Items are relayed through a queue on the caller's loop; closing this
+        iterator early cancels the producer.
+        """
+        if self.in_loop():
+            async for item in agen_factory():
+                yield item
+            return
+
+        caller = asyncio.get_running_loop()
+        queue: asyncio.Queue[tuple[bool, Any]] = asyncio.Queue()
+
+        async def pump() -> None:
+            try:
+                async for item in agen_factory():
+                    caller.call_soon_threadsafe(queue.put_nowait, (False, item))
+            except Exception as exc:
+                caller.call_soon_threadsafe(queue.put_nowait, (True, exc))
+            else:
+                caller.call_soon_threadsafe(queue.put_nowait, (True, None))
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self.loop)
+        try:
+            while True:
+                finished, item = await queue.get()
+                if finished:
+                    if item is not None:
+                        raise item
+                    return
+                yield item
+        finally:
+            future.cancel()
+
+    def submit(self, coro_factory: Callable[[], Coroutine[Any, Any, T]]) -> concurrent.futures.Future[T]:
+        """Start a coroutine on the I/O loop without waiting for it."""
+        return asyncio.run_coroutine_threadsafe(coro_factory(), self.loop)
+
+    def run_sync(self, coro_factory: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        """Block the calling thread until a coroutine finishes on the I/O loop."""
+        if self.in_loop():
+            raise RuntimeError("run_sync() called from the I/O loop thread")
+        return asyncio.run_coroutine_threadsafe(coro_factory(), self.loop).result()
+
+
+class CPUPool:
+    """Lazily started thread or process pool for CPU-bound functions.
+
+    With ``kind="process"`` the function and its arguments must be
+    picklable; workers are spawned, not forked, since the parent runs
+    threads.
+    """
+
+    def __init__(self, kind: str = "thread", workers: int = 2) -> None:
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown CPU pool kind: {kind}")
+        self.kind = kind
+        self.workers = workers
+        self._executor: concurrent.futures.Executor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> concurrent.futures.Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = concurrent.futures.ProcessPoolExecutor(
+                        self.workers, mp_context=multiprocessing.get_context("spawn"),
+                    )
+                else:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(
+                        self.workers, thread_name_prefix="aris-cpu",
+                    )
+            return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+io_loop = BackgroundLoop()
+
+
+def run_sync(coro_factory: Callable[[], Coroutine[Any, Any, T]]) -> T:
+    """Run a coroutine to completion from synchronous code."""
+    return io_loop.run_sync(coro_factory)
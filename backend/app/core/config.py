@@ -6,6 +6,17 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _github_tokens() -> tuple[str, ...]:
+    """GITHUB_TOKEN plus any comma-separated GITHUB_TOKENS, de-duplicated."""
+    raw = [os.getenv("GITHUB_TOKEN", "")] + os.getenv("GITHUB_TOKENS", "").split(",")
+    tokens: list[str] = []
+    for token in raw:
+        token = token.strip()
+        if token and token not in tokens:
+            tokens.append(token)
+    return tuple(tokens)
+
+
 @dataclass(frozen=True)
 class Settings:
     app_name: str = os.getenv("ARIS_APP_NAME", "ARIS Backend")
@@ -14,5 +25,77 @@ class Settings:
     groq_api_key: str | None = os.getenv("GROQ_API_KEY", None)
     model: str = os.getenv("MODEL", "llama3-70b-8192")
 
+    # Shared outbound HTTP pools
+    http_max_connections: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+    http_max_keepalive: int = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+    http_keepalive_expiry: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    http2: bool = os.getenv("HTTP2", "false").lower() in ("1", "true", "yes")
+
+    # GitHub fetch engine
+    github_api_url: str = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+    github_tokens: tuple[str, ...] = _github_tokens()
+    github_max_wait_seconds: float = float(os.getenv("GITHUB_MAX_WAIT_SECONDS", "120"))
+    github_backend: str = os.getenv("GITHUB_BACKEND", "rest").lower()
+    # Commit counting: "link" (exact, per_page=1 + Link header), "participation"
+    # (weekly stats, 13-week window) or "list" (download and count, max 100/repo)
+    github_commit_count: str = os.getenv("GITHUB_COMMIT_COUNT", "link").lower()
+    github_concurrency: int = int(os.getenv("GITHUB_CONCURRENCY", "8"))
+    github_deadline_seconds: float = float(os.getenv("GITHUB_DEADLINE_SECONDS", "20"))
+    github_cache_enabled: bool = os.getenv("GITHUB_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    github_cache_fresh_seconds: float = float(os.getenv("GITHUB_CACHE_FRESH_SECONDS", "60"))
+    github_snapshot_max_age_hours: float = float(os.getenv("GITHUB_SNAPSHOT_MAX_AGE_HOURS", "168"))
+    github_cache_max_age_days: int = int(os.getenv("GITHUB_CACHE_MAX_AGE_DAYS", "7"))
+    # Aggregated metrics per username; a TTL of 0 disables the cache
+    github_metrics_ttl_seconds: float = float(os.getenv("GITHUB_METRICS_TTL_SECONDS", "3600"))
+    github_metrics_memory_ttl_seconds: float = float(os.getenv("GITHUB_METRICS_MEMORY_TTL_SECONDS", "60"))
+    github_metrics_memory_entries: int = int(os.getenv("GITHUB_METRICS_MEMORY_ENTRIES", "256"))
+
+    # LLM response cache; a TTL of 0 disables it
+    llm_cache_ttl_seconds: float = float(os.getenv("LLM_CACHE_TTL_SECONDS", "604800"))
+    llm_cache_memory_entries: int = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "256"))
+    llm_cache_max_rows: int = int(os.getenv("LLM_CACHE_MAX_ROWS", "5000"))
+
+    # LLM resilience; a hedge delay of 0 disables hedging
+    llm_max_retries: int = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    llm_retry_base_seconds: float = float(os.getenv("LLM_RETRY_BASE_SECONDS", "0.5"))
+    llm_retry_max_seconds: float = float(os.getenv("LLM_RETRY_MAX_SECONDS", "10"))
+    llm_hedge_after_seconds: float = float(os.getenv("LLM_HEDGE_AFTER_SECONDS", "0"))
+    llm_breaker_failures: int = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+    llm_breaker_reset_seconds: float = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+    # Model routing; LLM_ROUTES is a JSON object of per-call-site overrides
+    # and an adaptive p95 threshold of 0 disables the fallback to the fast model
+    llm_routes: str = os.getenv("LLM_ROUTES", "")
+    llm_fast_model: str = os.getenv("LLM_FAST_MODEL", "")
+    llm_adaptive_p95_seconds: float = float(os.getenv("LLM_ADAPTIVE_P95_SECONDS", "0"))
+    llm_adaptive_min_samples: int = int(os.getenv("LLM_ADAPTIVE_MIN_SAMPLES", "20"))
+
+    # LLM token budget per UTC hour / day (0 = unlimited); features degrade
+    # to their deterministic paths from the soft ratio on
+    llm_hourly_token_budget: int = int(os.getenv("LLM_HOURLY_TOKEN_BUDGET", "0"))
+    llm_daily_token_budget: int = int(os.getenv("LLM_DAILY_TOKEN_BUDGET", "0"))
+    llm_budget_soft_ratio: float = float(os.getenv("LLM_BUDGET_SOFT_RATIO", "0.8"))
+
+    # Background job queue; JOB_INPROCESS_WORKERS threads run jobs inside the
+    # API process (0 leaves them to worker.py)
+    job_inprocess_workers: int = int(os.getenv("JOB_INPROCESS_WORKERS", "1"))
+    job_poll_seconds: float = float(os.getenv("JOB_POLL_SECONDS", "1"))
+    job_lease_seconds: float = float(os.getenv("JOB_LEASE_SECONDS", "600"))
+    job_max_attempts: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    job_retry_base_seconds: float = float(os.getenv("JOB_RETRY_BASE_SECONDS", "10"))
+
+    # How long an Idempotency-Key on POST /applications replays its first result
+    idempotency_key_ttl_hours: float = float(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+
+    # Pipeline stage executor: CPU-bound stages run in a "thread" or "process"
+    # pool; PIPELINE_STAGE_TIMEOUTS is a JSON object of per-stage seconds
+    pipeline_cpu_executor: str = os.getenv("PIPELINE_CPU_EXECUTOR", "thread").lower()
+    pipeline_cpu_workers: int = int(os.getenv("PIPELINE_CPU_WORKERS", "2"))
+    pipeline_stage_timeouts: str = os.getenv("PIPELINE_STAGE_TIMEOUTS", "")
+
+    # How long generate-plan waits for the LLM before answering with the
+    # deterministic plan (a late LLM plan replaces it); 0 always waits
+    plan_llm_deadline_seconds: float = float(os.getenv("PLAN_LLM_DEADLINE_SECONDS", "0"))
+
 
 settings = Settings()
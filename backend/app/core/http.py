@@ -0,0 +1,116 @@
+"""Process-wide pooled HTTP clients shared by the GitHub and LLM services.
+
+One client per upstream ("github", "llm") keeps its connections alive across
+requests instead of paying a TCP + TLS handshake per call. The clients are
+async and live on the shared I/O loop (see ``app.core.concurrency``); other
+loops and threads reach them through ``io_loop.run`` / ``run_sync``. ``app.main``
+opens the registry on startup and closes every pool on shutdown.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import threading
+from typing import Any
+
+import httpx
+
+from app.core.concurrency import io_loop
+from app.core.config import settings
+
+# Per-upstream request timeouts (seconds)
+CLIENT_TIMEOUTS: dict[str, float] = {
+    "github": 10.0,
+    "llm": 30.0,
+}
+
+
+def _http2_enabled() -> bool:
+    if not settings.http2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        print("HTTP2=true but the 'h2' package is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+class HttpClientRegistry:
+    def __init__(self) -> None:
+        self._async: dict[str, httpx.AsyncClient] = {}
+        self._requests: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._http2: bool | None = None
+
+    def _options(self, name: str) -> dict[str, Any]:
+        if self._http2 is None:
+            self._http2 = _http2_enabled()
+        return {
+            "timeout": CLIENT_TIMEOUTS.get(name, 10.0),
+            "limits": httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive,
+                keepalive_expiry=settings.http_keepalive_expiry,
+            ),
+            "http2": self._http2,
+        }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._requests[name] = self._requests.get(name, 0) + 1
+
+    def start(self) -> None:
+        io_loop.start()
+
+    def async_client(self, name: str) -> httpx.AsyncClient:
+        """Shared async client for ``name``; must be called on the I/O loop."""
+        if not io_loop.in_loop():
+            raise RuntimeError("async clients are only usable on the I/O loop")
+
+        client = self._async.get(name)
+        if client is None:
+            async def _on_request(_req: httpx.Request) -> None:
+                self._count(name)
+
+            client = httpx.AsyncClient(
+                event_hooks={"request": [_on_request]},
+                **self._options(name),
+            )
+            self._async[name] = client
+        return client
+
+    async def _aclose_async(self) -> None:
+        for client in list(self._async.values()):
+            await client.aclose()
+        self._async.clear()
+
+    def close(self) -> None:
+        if self._async:
+            io_loop.run_sync(self._aclose_async)
+        io_loop.stop()
+
+    @staticmethod
+    def _pool_stats(client: httpx.AsyncClient) -> dict[str, int]:
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for c in connections if c.is_idle())
+        return {
+            "open_connections": len(connections),
+            "idle_connections": idle,
+            "active_connections": len(connections) - idle,
+        }
+
+    def stats(self) -> dict[str, Any]:
+        pools = {name: self._pool_stats(client) for name, client in list(self._async.items())}
+        with self._lock:
+            requests = dict(self._requests)
+        return {
+            "http2": bool(self._http2),
+            "max_connections": settings.http_max_connections,
+            "max_keepalive_connections": settings.http_max_keepalive,
+            "keepalive_expiry": settings.http_keepalive_expiry,
+            "requests_total": requests,
+            "pools": pools,
+        }
+
+
+http_clients = HttpClientRegistry()
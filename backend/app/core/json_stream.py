@@ -0,0 +1,71 @@
+"""Incremental extraction of array elements from a JSON object being streamed.
+
+LLM replies arrive as text deltas. ``ArrayItemStream`` watches one top-level
+key of the reply object (e.g. ``weekly_plan``) and returns every element of
+that array as soon as its closing brace arrives, without waiting for the
+rest of the document.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+
+class ArrayItemStream:
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string: list[str] = []
+        self._last_string: str | None = None
+        self._current_key: str | None = None
+        self._in_array = False
+        self._item: list[str] | None = None
+
+    def feed(self, chunk: str) -> list[Any]:
+        """Consume ``chunk``; return the array elements it completed."""
+        items = []
+        for ch in chunk:
+            if self._item is not None:
+                self._item.append(ch)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = json.loads('"' + "".join(self._string) + '"')
+                    continue
+                if self._depth == 1:
+                    self._string.append(ch)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string = []
+            elif ch == ":" and self._depth == 1:
+                self._current_key = self._last_string
+            elif ch == "," and self._depth == 1:
+                self._current_key = None
+            elif ch in "{[":
+                if self._depth == 1 and ch == "[" and self._current_key == self.key:
+                    self._in_array = True
+                elif self._in_array and self._depth == 2 and self._item is None:
+                    self._item = [ch]
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._in_array and self._depth == 2 and self._item is not None:
+                    try:
+                        items.append(json.loads("".join(self._item)))
+                    except json.JSONDecodeError:
+                        pass
+                    self._item = None
+                elif self._in_array and self._depth == 1:
+                    self._in_array = False
+        return items
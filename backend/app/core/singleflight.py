@@ -0,0 +1,94 @@
+"""Single-flight execution: concurrent calls with the same key share one run.
+
+The first caller for a key (the leader) runs the work; callers arriving
+while it is in flight wait for it and get the same result or exception.
+Nothing is cached: once the run finishes, the next call starts a new one.
+
+``SingleFlight`` is for threads (blocking work such as the crew run);
+``AsyncSingleFlight`` is for coroutines on one event loop (the I/O loop).
+Both are per process: separate gunicorn workers and ``worker.py`` each
+coalesce their own callers, and the persistent caches behind the work
+absorb duplicates across them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Stats:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.leaders = 0
+        self.shared = 0
+
+    def stats(self, in_flight: int) -> dict[str, Any]:
+        return {"runs": self.leaders, "shared": self.shared, "in_flight": in_flight}
+
+
+class SingleFlight(_Stats):
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self._calls: dict[Hashable, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> tuple[T, bool]:
+        """Run ``fn`` unless a call for ``key`` is in flight; returns ``(result, shared)``."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = concurrent.futures.Future()
+                self.leaders += 1
+            else:
+                self.shared += 1
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def stats(self) -> dict[str, Any]:
+        return super().stats(len(self._calls))
+
+
+class AsyncSingleFlight(_Stats):
+    """Must only be used from one event loop."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Await ``factory()`` unless a call for ``key`` is in flight; returns ``(result, shared)``.
+
+        The work runs in its own task, so a cancelled caller (leader or not)
+        does not cancel it for the others.
+        """
+        task = self._tasks.get(key)
+        shared = task is not None
+        if shared:
+            self.shared += 1
+        else:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            self.leaders += 1
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task), shared
+
+    def stats(self) -> dict[str, Any]:
+        return super().stats(len(self._tasks))
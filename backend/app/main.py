@@ -6,6 +6,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.routes.applications import router as applications_router
+from app.routes.jobs import router as jobs_router
+from app.routes.metrics import router as metrics_router
+from .core.http import http_clients
+from .services.job_worker import worker_pool
+from .services.stage_graph import cpu_pool
 from .database import Base, engine
 
 app = FastAPI(title="ARIS Backend")
@@ -16,6 +21,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Plan-Source", "Location", "Idempotent-Replayed"],
 )
 
 
@@ -24,6 +30,15 @@ def on_startup() -> None:
     from . import models  # noqa: F401
 
     Base.metadata.create_all(bind=engine)
+    http_clients.start()
+    worker_pool.start()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    worker_pool.stop()
+    cpu_pool.shutdown()
+    http_clients.close()
 
 
 @app.get("/")
@@ -36,3 +51,15 @@ app.include_router(
     prefix="/applications",
     tags=["applications"],
 )
+
+app.include_router(
+    metrics_router,
+    prefix="/metrics",
+    tags=["metrics"],
+)
+
+app.include_router(
+    jobs_router,
+    prefix="/jobs",
+    tags=["jobs"],
+)
@@ -1 +1,8 @@
 from .application import Application
+from .github_cache import GitHubResponseCache
+from .github_snapshot import GitHubRepoSnapshot
+from .github_metrics import GitHubMetricsCache
+from .llm_cache import LLMResponseCache
+from .llm_budget import DeferredVerification, LLMTokenSpend
+from .job import Job, PipelineRun, StageResult
+from .idempotency import IdempotencyKey
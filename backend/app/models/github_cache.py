@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, String, Text
+
+from ..database import Base
+
+
+class GitHubResponseCache(Base):
+    """Last good GitHub response per URL, kept for conditional revalidation."""
+
+    __tablename__ = "github_response_cache"
+
+    url = Column(String, primary_key=True)
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    # Pagination header, needed to read commit counts from cached pages
+    link = Column(String, nullable=True)
+    body = Column(Text, nullable=False)
+    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
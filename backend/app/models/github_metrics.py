@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, String, Text
+
+from ..database import Base
+
+
+class GitHubMetricsCache(Base):
+    """Aggregated GitHub metrics per username, shared by every worker."""
+
+    __tablename__ = "github_metrics_cache"
+
+    username = Column(String, primary_key=True)
+    metrics_json = Column(Text, nullable=False)
+    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String, Text, UniqueConstraint
+
+from ..database import Base
+
+
+class GitHubRepoSnapshot(Base):
+    """Per-repo GitHub details from the last fetch, reused while unpushed."""
+
+    __tablename__ = "github_repo_snapshots"
+    __table_args__ = (UniqueConstraint("username", "repo_name"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    username = Column(String, nullable=False, index=True)
+    repo_name = Column(String, nullable=False)
+    pushed_at = Column(String, nullable=True)
+    language_bytes_json = Column(Text, nullable=False, default="{}")
+    commit_count = Column(Integer, nullable=False, default=0)
+    window_start = Column(DateTime, nullable=False)
+    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
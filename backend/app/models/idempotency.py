@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from ..database import Base
+
+
+class IdempotencyKey(Base):
+    """The application created by a ``POST /applications`` with an Idempotency-Key.
+
+    A retry with the same key (and the same request) returns this
+    application and job instead of creating new ones; ``request_hash``
+    catches a key reused for a different request.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    application_id = Column(Integer, nullable=False)
+    job_id = Column(String(32), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Float, Integer, LargeBinary, String, Text
+
+from ..database import Base
+
+
+class Job(Base):
+    """A unit of background pipeline work, claimed by one worker at a time."""
+
+    __tablename__ = "jobs"
+
+    id = Column(String(32), primary_key=True)
+    kind = Column(String, nullable=False)
+    application_id = Column(Integer, nullable=True, index=True)
+    # queued -> running -> succeeded | failed (or back to queued for a retry)
+    status = Column(String, default="queued", nullable=False, index=True)
+    stage = Column(String, nullable=True)
+    stages_json = Column(Text, default="[]", nullable=False)
+    payload_json = Column(Text, default="{}", nullable=False)
+    input_blob = Column(LargeBinary, nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    error = Column(Text, nullable=True)
+    run_after = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    locked_by = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class StageResult(Base):
+    """Output of a pipeline stage that succeeded, kept so a retry can skip it.
+
+    ``fingerprint`` hashes the stage's inputs; the output is only reused
+    while they are unchanged. Rows are dropped once the whole run succeeds.
+    """
+
+    __tablename__ = "stage_results"
+
+    application_id = Column(Integer, primary_key=True)
+    pipeline = Column(String, primary_key=True)
+    stage = Column(String, primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    output_json = Column(Text, nullable=False)
+    duration_ms = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class PipelineRun(Base):
+    """Timing breakdown of one run of an application's intake or verify pipeline."""
+
+    __tablename__ = "pipeline_runs"
+
+    id = Column(String(32), primary_key=True)
+    application_id = Column(Integer, nullable=False, index=True)
+    pipeline = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    wall_ms = Column(Float, nullable=False)
+    stages_json = Column(Text, default="[]", nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
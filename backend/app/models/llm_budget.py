@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from ..database import Base
+
+
+class LLMTokenSpend(Base):
+    """LLM tokens spent per UTC hour, summed across every worker."""
+
+    __tablename__ = "llm_token_spend"
+
+    hour = Column(DateTime, primary_key=True)
+    prompt_tokens = Column(Integer, default=0, nullable=False)
+    completion_tokens = Column(Integer, default=0, nullable=False)
+    calls = Column(Integer, default=0, nullable=False)
+
+
+class DeferredVerification(Base):
+    """Auto-verification skipped at intake (over the LLM budget), to be run later."""
+
+    __tablename__ = "deferred_verifications"
+
+    application_id = Column(Integer, primary_key=True)
+    reason = Column(String, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -1,26 +1,45 @@
+import asyncio
+import concurrent.futures
 import json
+import threading
 from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.core.concurrency import io_loop
+from app.core.config import settings
+from app.database import SessionLocal, get_db
 from app.models.application import Application
+from app.models.idempotency import IdempotencyKey
 from app.schemas.application import (
+    ApplicationAccepted,
     ApplicationResponse,
     ApplicationStatusUpdate,
 )
-from app.services.github_service import fetch_github_metrics
-from app.services.scoring_service import compute_scores
-from app.services.resume_service import parse_resume_pdf
+from app.services.auto_verification import coalesced_verification
+from app.services.github_service import _extract_username, github_user_exists, invalidate_github_metrics
+from app.services.job_queue import StageTracker, enqueue
+from app.services.llm_budget import token_budget
+from app.services.plan_patch import PlanPatchError, apply_plan_patch
+from app.services.stage_checkpoints import StageCheckpoints, fingerprint
+from app.services.stage_graph import StageGraph, timing_breakdown
 from app.services.training_plan_service import generate_training_plan
 from app.services.llm_service import (
-    generate_profile_analysis,
+    llm_breaker,
     generate_training_plan_llm,
-    generate_resume_ats,
+    generate_training_plan_llm_async,
     modify_plan_with_chat,
+    patch_plan_with_chat,
+    patch_plan_with_chat_async,
+    stream_modify_plan_with_chat,
+    stream_training_plan_llm,
 )
 
 router = APIRouter()
@@ -63,8 +82,78 @@ def get_stats(db: Session = Depends(get_db)):
     }
 
 
-@router.post("", response_model=ApplicationResponse)
+def _replay(db: Session, idempotency_key: str, request_hash: str) -> ApplicationAccepted | None:
+    """What the earlier request with ``idempotency_key`` returned, if it is still on record."""
+    record = db.get(IdempotencyKey, idempotency_key)
+    if record is None:
+        return None
+    db_obj = db.get(Application, record.application_id)
+    expires_at = record.created_at + timedelta(hours=settings.idempotency_key_ttl_hours)
+    if db_obj is None or expires_at < datetime.utcnow():
+        # The application was deleted or the key has expired; it starts over
+        db.delete(record)
+        db.commit()
+        return None
+    if record.request_hash != request_hash:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+    return ApplicationAccepted(**ApplicationResponse.model_validate(db_obj).model_dump(), job_id=record.job_id)
+
+
+def _accept_application(
+    fields: dict,
+    resume_pdf: bytes | None,
+    force_refresh: bool,
+    idempotency_key: str | None = None,
+) -> tuple[ApplicationAccepted, bool]:
+    """Store the application row and queue its intake job (blocking DB work).
+
+    Returns the application and whether it was replayed: a request with an
+    ``idempotency_key`` seen before gets the original application back.
+    """
+    request_hash = fingerprint({"fields": fields, "resume": resume_pdf, "force_refresh": force_refresh})
+    db = SessionLocal()
+    try:
+        if idempotency_key:
+            replayed = _replay(db, idempotency_key, request_hash)
+            if replayed is not None:
+                return replayed, True
+
+        # The row, its intake job and the key commit together
+        db_obj = Application(status="pending", **fields)
+        db.add(db_obj)
+        db.flush()
+        job_id = enqueue(
+            "intake",
+            {"force_refresh": force_refresh},
+            application_id=db_obj.id,
+            input_blob=resume_pdf or None,
+            db=db,
+        )
+        if idempotency_key:
+            db.add(IdempotencyKey(
+                key=idempotency_key, request_hash=request_hash, application_id=db_obj.id, job_id=job_id,
+            ))
+        try:
+            db.commit()
+        except IntegrityError:
+            if not idempotency_key:
+                raise
+            # A concurrent request with the same key committed first
+            db.rollback()
+            replayed = _replay(db, idempotency_key, request_hash)
+            if replayed is None:
+                # The conflict was not the key's; nothing to replay
+                raise
+            return replayed, True
+        db.refresh(db_obj)
+        return ApplicationAccepted(**ApplicationResponse.model_validate(db_obj).model_dump(), job_id=job_id), False
+    finally:
+        db.close()
+
+
+@router.post("", response_model=ApplicationAccepted, status_code=202)
 async def create_application(
+    response: Response,
     full_name: str = Form(...),
     email: str = Form(...),
     github_url: str = Form(...),
@@ -75,186 +164,61 @@ async def create_application(
     professional_json: str = Form("{}"),
     motivation_json: str = Form("{}"),
     resume_file: UploadFile | None = File(None),
-    db: Session = Depends(get_db),
+    force_refresh: bool = Form(False),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
 ):
-    """Create application — accepts multipart/form-data with optional PDF resume."""
-
-    # 1. Fetch GitHub metrics
+    """Create application — accepts multipart/form-data with optional PDF resume.
+
+    The application is stored right away and analysed by a background job
+    (GitHub metrics, resume, scores, LLM analysis, verification); follow it
+    at ``GET /jobs/{job_id}``. GitHub metrics and LLM replies come from their
+    caches when fresh; send ``force_refresh=true`` to re-fetch metrics and
+    re-run the LLM calls. A GitHub account that does not exist is rejected
+    with a 400 before anything is stored.
+
+    Send an ``Idempotency-Key`` header to make retries safe: a repeat of the
+    request with the same key (within ``IDEMPOTENCY_KEY_TTL_HOURS``) returns
+    the application and job it created first, marked with
+    ``Idempotent-Replayed: true``, and reusing the key for a different
+    request is a 422.
+
+    Nothing here blocks the event loop: the upload is read asynchronously
+    and the database writes run in a thread, with a session of their own
+    that is released as soon as they are done.
+    """
     try:
-        github_metrics = fetch_github_metrics(github_url)
+        _extract_username(github_url)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
-    except Exception as exc:
-        raise HTTPException(status_code=502, detail="GitHub API error") from exc
-
-    # 2. Parse resume PDF if provided
-    resume_data = None
-    resume_text = ""
+    if idempotency_key is not None and not 0 < len(idempotency_key) <= 255:
+        raise HTTPException(status_code=400, detail="Idempotency-Key must be 1 to 255 characters")
+    # A GitHub account that does not exist is a bad request, not a job that
+    # fails later; if GitHub cannot tell right now, the job finds out
+    if await github_user_exists(github_url) is False:
+        raise HTTPException(status_code=400, detail="GitHub user not found")
+
+    resume_pdf = None
     if resume_file and resume_file.filename:
-        try:
-            file_bytes = await resume_file.read()
-            resume_data = parse_resume_pdf(file_bytes)
-            resume_text = resume_data.get("raw_text", "")
-        except Exception:
-            resume_data = None
-
-    # 3. LLM ATS analysis of resume (if we have text)
-    llm_resume = None
-    if resume_text:
-        llm_resume = generate_resume_ats(resume_text, role_applied, full_name)
-        # Merge LLM keywords into resume_data
-        if llm_resume and resume_data:
-            llm_kw = llm_resume.get("keywords_detected", [])
-            existing_kw = set(resume_data.get("keywords_detected", []))
-            for kw in llm_kw:
-                existing_kw.add(str(kw).lower().strip())
-            resume_data["keywords_detected"] = sorted(existing_kw)
-            # Use better ATS score if LLM provides one
-            llm_ats = llm_resume.get("ats_score", 0)
-            if llm_ats > 0:
-                resume_data["ats_score"] = max(
-                    resume_data.get("ats_score", 0),
-                    float(llm_ats),
-                )
-
-    # 4. Compute deterministic scores
-    score_result = compute_scores(
-        github_metrics,
-        resume_data=resume_data,
-        role_applied=role_applied,
-    )
-
-    score_breakdown = score_result.get("score_breakdown", {})
-    learning_gaps = score_result.get("learning_gaps", [])
-
-    # 5. Parse education / experience for LLM context
-    education = None
-    experience = None
-    professional = None
-    try:
-        education = json.loads(education_json) if education_json else None
-    except Exception:
-        pass
-    try:
-        experience = json.loads(experience_json) if experience_json else None
-    except Exception:
-        pass
-    try:
-        professional = json.loads(professional_json) if professional_json else None
-    except Exception:
-        pass
-
-    # 6. LLM profile analysis with full candidate context
-    llm_profile = generate_profile_analysis(
-        candidate_name=full_name,
-        role_applied=role_applied,
-        github_metrics=github_metrics,
-        score_breakdown=score_breakdown,
-        learning_gaps=learning_gaps,
-        resume_data=resume_data,
-        education=education,
-        experience=experience,
-        professional=professional,
-    )
-
-    # 7. Save to database
-    db_obj = Application(
-        full_name=full_name,
-        email=email,
-        github_url=github_url,
-        role_applied=role_applied,
-        status="pending",
-        personal_json=personal_json,
-        education_json=education_json,
-        experience_json=experience_json,
-        professional_json=professional_json,
-        motivation_json=motivation_json,
+        resume_pdf = await resume_file.read()
+
+    fields = {
+        "full_name": full_name,
+        "email": email,
+        "github_url": github_url,
+        "role_applied": role_applied,
+        "personal_json": personal_json,
+        "education_json": education_json,
+        "experience_json": experience_json,
+        "professional_json": professional_json,
+        "motivation_json": motivation_json,
+    }
+    accepted, replayed = await asyncio.to_thread(
+        _accept_application, fields, resume_pdf, force_refresh, idempotency_key
     )
-
-    db_obj.master_score = score_result.get("master_score")
-    db_obj.confidence_band = score_result.get("confidence_band")
-    db_obj.github_metrics_json = json.dumps(github_metrics)
-    db_obj.score_breakdown_json = json.dumps(score_breakdown)
-    db_obj.learning_gaps_json = json.dumps(learning_gaps)
-
-    if resume_data:
-        # Store resume analysis (without raw_text to save space)
-        analysis_to_store = {k: v for k, v in resume_data.items() if k != "raw_text"}
-        if llm_resume:
-            analysis_to_store["missing_keywords"] = llm_resume.get("missing_keywords", [])
-            analysis_to_store["suggestions"] = llm_resume.get("suggestions", [])
-        db_obj.resume_analysis_json = json.dumps(analysis_to_store)
-
-    if llm_profile:
-        db_obj.background_report_json = json.dumps(llm_profile)
-    else:
-        master = db_obj.master_score or 0
-        band = db_obj.confidence_band or "Unknown"
-        db_obj.background_report_json = json.dumps({
-            "summary": (
-                f"{full_name} scored {master}/100 ({band} confidence) for the "
-                f"{role_applied} role. Their GitHub profile shows {github_metrics.get('total_public_repos', 0)} "
-                f"public repos with {github_metrics.get('commits_last_90_days', 0)} commits in the last 90 days."
-            ),
-            "strengths": [
-                f"Active GitHub presence with {github_metrics.get('total_public_repos', 0)} repositories",
-            ],
-            "weaknesses": learning_gaps[:3] if learning_gaps else ["No major weaknesses identified"],
-            "risks": [],
-            "growth_direction": f"Focus on strengthening {role_applied} specific skills.",
-        })
-
-    # 8. Save initial database object
-    db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
-
-    # 9. Auto-trigger agentic verification if LLM key is configured
-    from app.services.llm_service import _get_api_key
-    api_key = _get_api_key()
-    if api_key:
-        import os
-        os.environ["GROQ_API_KEY"] = api_key
-        os.environ["CREWAI_TELEMETRY_OPTOUT"] = "true"
-        if not os.environ.get("OPENAI_API_KEY"):
-            os.environ["OPENAI_API_KEY"] = "sk-placeholder-not-used"
-        try:
-            from app.agents.verification_crew import run_verification
-
-            # Parse resume skills for claims cross-referencing
-            resume_skills = []
-            if resume_data:
-                resume_skills = (
-                    resume_data.get("keywords_detected")
-                    or resume_data.get("skill_keywords")
-                    or []
-                )
-
-            # Trigger CrewAI
-            result = run_verification(
-                github_url=db_obj.github_url,
-                role_applied=db_obj.role_applied,
-                candidate_name=db_obj.full_name,
-                resume_skills=resume_skills,
-            )
-
-            db_obj.trust_score = result.get("trust_score", 0.0)
-            db_obj.verification_report_json = json.dumps(
-                result.get("verification_report", {})
-            )
-
-            crew_plan = result.get("training_plan")
-            if crew_plan and isinstance(crew_plan, dict) and crew_plan.get("weekly_plan"):
-                db_obj.training_plan_json = json.dumps(crew_plan)
-
-            db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
-        except Exception as e:
-            # If verification fails, log it but still return the created application
-            print(f"Auto-verification failed: {e}")
-
-    return db_obj
+    response.headers["Location"] = f"/jobs/{accepted.job_id}"
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return accepted
 
 
 @router.get("", response_model=list[ApplicationResponse])
@@ -285,75 +249,244 @@ def get_government_verification(application_id: int, db: Session = Depends(get_d
     return run_government_verification(db_obj.id, db_obj.full_name)
 
 
+@router.get("/{application_id}/timings")
+def get_pipeline_timings(application_id: int, db: Session = Depends(get_db)):
+    """Per-stage timing breakdown of the application's recent intake and verify runs."""
+    if db.get(Application, application_id) is None:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return timing_breakdown(application_id)
+
+
 class GeneratePlanRequest(BaseModel):
     weeks: int | None = None
     daily_hours: float | None = None
     target_role: str | None = None
+    # Ask the LLM again even if these inputs produced a cached plan
+    force_refresh: bool = False
+    # Overrides PLAN_LLM_DEADLINE_SECONDS; 0 waits for the LLM
+    deadline_seconds: float | None = None
 
 
-@router.post("/{application_id}/generate-plan", response_model=ApplicationResponse)
-def generate_plan(application_id: int, payload: GeneratePlanRequest = GeneratePlanRequest(), db: Session = Depends(get_db)):
+def _scored_application(db: Session, application_id: int) -> Application:
     db_obj = db.query(Application).filter(Application.id == application_id).first()
     if not db_obj:
         raise HTTPException(status_code=404, detail="Application not found")
 
     if db_obj.master_score is None:
         raise HTTPException(status_code=400, detail="Scoring not completed")
+    return db_obj
+
 
-    score_breakdown = json.loads(db_obj.score_breakdown_json or "{}")
-    learning_gaps = json.loads(db_obj.learning_gaps_json or "[]")
-    github_metrics = json.loads(db_obj.github_metrics_json or "{}")
+def _plan_llm_kwargs(db_obj: Application, payload: GeneratePlanRequest) -> dict:
     resume_data = None
     try:
         resume_data = json.loads(db_obj.resume_analysis_json or "null")
     except Exception:
         pass
 
-    # Try LLM first for candidate-specific plan
-    llm_plan = generate_training_plan_llm(
-        candidate_name=db_obj.full_name,
+    return {
+        "candidate_name": db_obj.full_name,
+        "role_applied": db_obj.role_applied,
+        "confidence_band": db_obj.confidence_band or "Moderate",
+        "master_score": db_obj.master_score or 0,
+        "learning_gaps": json.loads(db_obj.learning_gaps_json or "[]"),
+        "score_breakdown": json.loads(db_obj.score_breakdown_json or "{}"),
+        "github_metrics": json.loads(db_obj.github_metrics_json or "{}"),
+        "resume_data": resume_data,
+        "weeks": payload.weeks,
+        "daily_hours": payload.daily_hours,
+        "target_role": payload.target_role,
+    }
+
+
+def _fallback_plan(db_obj: Application) -> dict:
+    """Deterministic plan used when the LLM is unavailable."""
+    score_result = {
+        "master_score": db_obj.master_score,
+        "confidence_band": db_obj.confidence_band,
+        "score_breakdown": json.loads(db_obj.score_breakdown_json or "{}"),
+        "learning_gaps": json.loads(db_obj.learning_gaps_json or "[]"),
+    }
+    return generate_training_plan(
+        score_result,
         role_applied=db_obj.role_applied,
-        confidence_band=db_obj.confidence_band or "Moderate",
-        master_score=db_obj.master_score or 0,
-        learning_gaps=learning_gaps,
-        score_breakdown=score_breakdown,
-        github_metrics=github_metrics,
-        resume_data=resume_data,
-        weeks=payload.weeks,
-        daily_hours=payload.daily_hours,
-        target_role=payload.target_role,
+        candidate_name=db_obj.full_name,
     )
 
-    if llm_plan:
-        final_plan = llm_plan
+
+def _save_plan(application_id: int, plan: dict) -> None:
+    """Persist a plan from a streaming response, outside the request's session."""
+    db = SessionLocal()
+    try:
+        db_obj = db.get(Application, application_id)
+        if db_obj is not None:
+            db_obj.training_plan_json = json.dumps(plan)
+            db.commit()
+    finally:
+        db.close()
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _write_back_late_plan(application_id: int, placeholder_json: str, pending: concurrent.futures.Future) -> None:
+    """Done callback for an LLM plan that missed the deadline.
+
+    It runs on the I/O loop thread, so the database write is handed to a
+    thread of its own.
+    """
+    try:
+        plan = pending.result()
+    except Exception as exc:
+        print(f"[generate-plan] Late LLM plan for application {application_id} failed: {exc}")
+        return
+    if plan:
+        threading.Thread(
+            target=_store_late_plan,
+            args=(application_id, placeholder_json, plan),
+            name=f"late-plan-{application_id}",
+            daemon=True,
+        ).start()
+
+
+def _store_late_plan(application_id: int, placeholder_json: str, plan: dict) -> None:
+    """Swap in the late LLM plan, unless the stored plan was changed (e.g.
+    modified by an admin) in the meantime."""
+    db = SessionLocal()
+    try:
+        db_obj = db.get(Application, application_id)
+        if db_obj is not None and db_obj.training_plan_json == placeholder_json:
+            db_obj.training_plan_json = json.dumps(plan)
+            db.commit()
+    finally:
+        db.close()
+
+
+@router.post("/{application_id}/generate-plan", response_model=ApplicationResponse)
+def generate_plan(
+    application_id: int,
+    response: Response,
+    payload: GeneratePlanRequest = GeneratePlanRequest(),
+    db: Session = Depends(get_db),
+):
+    """Generate and store a training plan.
+
+    With a deadline (``deadline_seconds`` or ``PLAN_LLM_DEADLINE_SECONDS``)
+    the deterministic plan is built while the LLM works; if the LLM plan is
+    not ready in time the deterministic one is returned and stored, and the
+    LLM plan replaces it in the background once it arrives. The
+    ``X-Plan-Source`` header says which plan the response carries:
+    ``llm``, ``deterministic`` (the LLM failed) or ``deadline`` (the
+    deterministic plan, with the LLM plan still pending).
+    """
+    db_obj = _scored_application(db, application_id)
+    llm_kwargs = _plan_llm_kwargs(db_obj, payload)
+    use_cache = not payload.force_refresh
+    deadline = settings.plan_llm_deadline_seconds if payload.deadline_seconds is None else payload.deadline_seconds
+
+    pending = None
+    if deadline > 0:
+        pending = io_loop.submit(lambda: generate_training_plan_llm_async(**llm_kwargs, use_cache=use_cache))
+        fallback_plan = _fallback_plan(db_obj)
+        try:
+            llm_plan = pending.result(timeout=deadline)
+            pending = None
+        except concurrent.futures.TimeoutError:
+            llm_plan = None
     else:
-        # Deterministic fallback
-        score_result = {
-            "master_score": db_obj.master_score,
-            "confidence_band": db_obj.confidence_band,
-            "score_breakdown": score_breakdown,
-            "learning_gaps": learning_gaps,
-        }
-        final_plan = generate_training_plan(
-            score_result,
-            role_applied=db_obj.role_applied,
-            candidate_name=db_obj.full_name,
-        )
+        # Try LLM first for candidate-specific plan
+        llm_plan = generate_training_plan_llm(**llm_kwargs, use_cache=use_cache)
+        fallback_plan = None if llm_plan else _fallback_plan(db_obj)
+
+    final_plan = llm_plan or fallback_plan
+    source = "llm" if llm_plan else "deadline" if pending else "deterministic"
 
     db_obj.training_plan_json = json.dumps(final_plan)
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+
+    if pending is not None:
+        # No thread waits for it: the plan is written back when it arrives
+        pending.add_done_callback(partial(_write_back_late_plan, application_id, db_obj.training_plan_json))
+    response.headers["X-Plan-Source"] = source
     return db_obj
 
 
+def _plan_stream_inputs(application_id: int, payload: GeneratePlanRequest) -> tuple[dict, dict]:
+    # Own session, closed before the (long) stream starts
+    db = SessionLocal()
+    try:
+        db_obj = _scored_application(db, application_id)
+        return _plan_llm_kwargs(db_obj, payload), _fallback_plan(db_obj)
+    finally:
+        db.close()
+
+
+@router.post("/{application_id}/generate-plan/stream")
+async def generate_plan_stream(
+    application_id: int,
+    payload: GeneratePlanRequest = GeneratePlanRequest(),
+):
+    """Server-sent-events variant of generate-plan.
+
+    Emits a ``week`` event for each ``weekly_plan`` entry as soon as the LLM
+    has finished writing it, then a ``plan`` event with the persisted plan
+    and its ``source`` (``llm`` or ``deterministic``). If the LLM fails after
+    some weeks were sent, a ``reset`` event precedes the fallback plan's weeks.
+    """
+    llm_kwargs, fallback_plan = await asyncio.to_thread(_plan_stream_inputs, application_id, payload)
+
+    async def events():
+        sent = 0
+        plan = None
+        async for kind, value in stream_training_plan_llm(**llm_kwargs, use_cache=not payload.force_refresh):
+            if kind == "item":
+                sent += 1
+                yield _sse("week", value)
+            else:
+                plan = value
+
+        source = "llm"
+        if not plan:
+            source = "deterministic"
+            plan = fallback_plan
+            if sent:
+                yield _sse("reset", {})
+            for week in plan.get("weekly_plan", []):
+                yield _sse("week", week)
+
+        await asyncio.to_thread(_save_plan, application_id, plan)
+        yield _sse("plan", {"source": source, "training_plan": plan})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=_SSE_HEADERS)
+
+
 class ModifyPlanRequest(BaseModel):
     message: str
+    force_refresh: bool = False
+    # "patch" asks for edit operations and falls back to a full rewrite
+    mode: Literal["patch", "rewrite"] = "patch"
 
 
-@router.post("/{application_id}/modify-plan", response_model=ApplicationResponse)
-def modify_plan(application_id: int, payload: ModifyPlanRequest, db: Session = Depends(get_db)):
-    """Modify an existing training plan via a natural-language admin message."""
+def _llm_unavailable() -> HTTPException:
+    if not token_budget.allows("llm"):
+        return HTTPException(status_code=503, detail="LLM token budget exhausted, please retry later")
+    retry_after = llm_breaker.retry_after()
+    if retry_after:
+        return HTTPException(
+            status_code=503,
+            detail="LLM provider is failing, please retry later",
+            headers={"Retry-After": str(int(retry_after) + 1)},
+        )
+    return HTTPException(status_code=503, detail="LLM not available. Check LLM_API_KEY configuration.")
+
+
+def _existing_plan(db: Session, application_id: int) -> tuple[Application, dict]:
     db_obj = db.query(Application).filter(Application.id == application_id).first()
     if not db_obj:
         raise HTTPException(status_code=404, detail="Application not found")
@@ -361,16 +494,51 @@ def modify_plan(application_id: int, payload: ModifyPlanRequest, db: Session = D
     existing_plan = json.loads(db_obj.training_plan_json or "null")
     if not existing_plan:
         raise HTTPException(status_code=400, detail="No training plan exists yet. Generate one first.")
+    return db_obj, existing_plan
 
-    updated_plan = modify_plan_with_chat(
-        existing_plan=existing_plan,
-        admin_message=payload.message,
-        candidate_name=db_obj.full_name,
-        role_applied=db_obj.role_applied,
-    )
+
+def _modify_llm_kwargs(db_obj: Application, existing_plan: dict, payload: ModifyPlanRequest) -> dict:
+    return {
+        "existing_plan": existing_plan,
+        "admin_message": payload.message,
+        "candidate_name": db_obj.full_name,
+        "role_applied": db_obj.role_applied,
+        "use_cache": not payload.force_refresh,
+    }
+
+
+def _apply_patch(existing_plan: dict, operations: list | None) -> tuple[dict, list[int]] | None:
+    """The patched plan and touched week indexes, or ``None`` to fall back to a rewrite."""
+    if not operations:
+        return None
+    try:
+        return apply_plan_patch(existing_plan, operations)
+    except PlanPatchError as exc:
+        print(f"[modify-plan] Rejected LLM patch ({exc}), falling back to full rewrite")
+        return None
+
+
+@router.post("/{application_id}/modify-plan", response_model=ApplicationResponse)
+def modify_plan(application_id: int, payload: ModifyPlanRequest, db: Session = Depends(get_db)):
+    """Modify an existing training plan via a natural-language admin message.
+
+    In ``patch`` mode (the default) the LLM returns edit operations on the
+    stored plan, which is much less output than re-emitting it; requests it
+    cannot express that way are redone as a full rewrite.
+    """
+    db_obj, existing_plan = _existing_plan(db, application_id)
+    llm_kwargs = _modify_llm_kwargs(db_obj, existing_plan, payload)
+
+    updated_plan = None
+    if payload.mode == "patch":
+        patched = _apply_patch(existing_plan, patch_plan_with_chat(**llm_kwargs))
+        if patched:
+            updated_plan = patched[0]
+    if not updated_plan:
+        updated_plan = modify_plan_with_chat(**llm_kwargs)
 
     if not updated_plan:
-        raise HTTPException(status_code=503, detail="LLM not available. Check LLM_API_KEY configuration.")
+        raise _llm_unavailable()
 
     db_obj.training_plan_json = json.dumps(updated_plan)
     db.add(db_obj)
@@ -379,6 +547,53 @@ def modify_plan(application_id: int, payload: ModifyPlanRequest, db: Session = D
     return db_obj
 
 
+def _modify_stream_inputs(application_id: int, payload: ModifyPlanRequest) -> tuple[dict, dict]:
+    db = SessionLocal()
+    try:
+        db_obj, existing_plan = _existing_plan(db, application_id)
+        return existing_plan, _modify_llm_kwargs(db_obj, existing_plan, payload)
+    finally:
+        db.close()
+
+
+@router.post("/{application_id}/modify-plan/stream")
+async def modify_plan_stream(application_id: int, payload: ModifyPlanRequest):
+    """Server-sent-events variant of modify-plan.
+
+    Emits a ``week`` event per rewritten ``weekly_plan`` entry (in patch
+    mode, per week the patch changed), then a ``plan`` event once the
+    updated plan is persisted. If the LLM fails the stream ends with an
+    ``error`` event and the stored plan is unchanged.
+    """
+    existing_plan, llm_kwargs = await asyncio.to_thread(_modify_stream_inputs, application_id, payload)
+
+    async def events():
+        if payload.mode == "patch":
+            patched = _apply_patch(existing_plan, await patch_plan_with_chat_async(**llm_kwargs))
+            if patched:
+                plan, touched = patched
+                for index in touched:
+                    yield _sse("week", plan["weekly_plan"][index])
+                await asyncio.to_thread(_save_plan, application_id, plan)
+                yield _sse("plan", {"source": "llm", "training_plan": plan})
+                return
+
+        plan = None
+        async for kind, value in stream_modify_plan_with_chat(**llm_kwargs):
+            if kind == "item":
+                yield _sse("week", value)
+            else:
+                plan = value
+
+        if not plan:
+            yield _sse("error", {"detail": _llm_unavailable().detail})
+            return
+        await asyncio.to_thread(_save_plan, application_id, plan)
+        yield _sse("plan", {"source": "llm", "training_plan": plan})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=_SSE_HEADERS)
+
+
 @router.delete("/{application_id}", status_code=204)
 def delete_application(application_id: int, db: Session = Depends(get_db)):
     db_obj = db.query(Application).filter(Application.id == application_id).first()
@@ -389,6 +604,16 @@ def delete_application(application_id: int, db: Session = Depends(get_db)):
     return None
 
 
+@router.delete("/{application_id}/github-cache", status_code=204)
+def invalidate_github_cache(application_id: int, db: Session = Depends(get_db)):
+    """Drop the cached GitHub metrics for this applicant's profile."""
+    db_obj = db.query(Application).filter(Application.id == application_id).first()
+    if not db_obj:
+        raise HTTPException(status_code=404, detail="Application not found")
+    invalidate_github_metrics(db_obj.github_url)
+    return None
+
+
 @router.patch("/{application_id}/status", response_model=ApplicationResponse)
 def update_status(
     application_id: int,
@@ -421,7 +646,7 @@ def update_status(
 
 
 @router.post("/{application_id}/verify", response_model=ApplicationResponse)
-def verify_candidate(application_id: int, db: Session = Depends(get_db)):
+def verify_candidate(application_id: int, force_refresh: bool = False, db: Session = Depends(get_db)):
     """Trigger the full CrewAI agentic verification pipeline.
 
     Runs 4 agents sequentially:
@@ -431,6 +656,8 @@ def verify_candidate(application_id: int, db: Session = Depends(get_db)):
       4. Onboarding Planner — generates training plan
 
     Saves trust_score, verification_report_json, and training_plan_json.
+    ``?force_refresh=true`` makes the GitHub Analyst re-fetch the profile
+    instead of reading the cached metrics.
     """
     db_obj = db.query(Application).filter(Application.id == application_id).first()
     if not db_obj:
@@ -470,7 +697,7 @@ def verify_candidate(application_id: int, db: Session = Depends(get_db)):
         os.environ["OPENAI_API_KEY"] = "sk-placeholder-not-used"
 
     try:
-        from app.agents.verification_crew import run_verification
+        import app.agents.verification_crew  # noqa: F401
     except ImportError as ie:
         print(f"CrewAI import error: {ie}")
         raise HTTPException(
@@ -478,36 +705,56 @@ def verify_candidate(application_id: int, db: Session = Depends(get_db)):
             detail=f"CrewAI not installed. Install crewai and crewai-tools. ({ie})",
         )
 
-    try:
-        result = run_verification(
-            github_url=db_obj.github_url,
-            role_applied=db_obj.role_applied,
-            candidate_name=db_obj.full_name,
-            resume_skills=resume_skills,
-        )
+    # Stages that succeeded in an earlier, failed call are reused if their
+    # inputs are unchanged; force_refresh starts over
+    checkpoints = StageCheckpoints(db_obj.id, "verify")
+    tracker = StageTracker(None, checkpoints)
+    if force_refresh:
+        invalidate_github_metrics(db_obj.github_url)
+        checkpoints.clear()
+
+    crew_inputs = {
+        "github_url": db_obj.github_url,
+        "role_applied": db_obj.role_applied,
+        "candidate_name": db_obj.full_name,
+        "resume_skills": resume_skills,
+    }
 
+    def _government(application_id: int, full_name: str) -> dict:
         # Government verification (DigiLocker + ABC) — mock until API approved
-        try:
-            from app.services.digilocker_service import run_government_verification
-            gov_verify = run_government_verification(db_obj.id, db_obj.full_name)
-            verification_report = result.get("verification_report", {})
-            verification_report["government_verification"] = gov_verify
-        except Exception as gv_err:
-            print(f"Gov verification error (non-fatal): {gv_err}")
-            verification_report = result.get("verification_report", {})
+        from app.services.digilocker_service import run_government_verification
+        return run_government_verification(application_id, full_name)
+
+    # The crew and the government check are independent and run side by side
+    graph = StageGraph("verify")
+    # Joins the crew run already in flight for this application, if any
+    graph.add("crew", coalesced_verification, ("application_id", "crew_inputs"), kind="thread")
+    graph.add("government", _government, ("application_id", "full_name"), kind="thread", optional=True)
+    try:
+        results = asyncio.run(graph.run(
+            tracker,
+            {"crew_inputs": crew_inputs, "application_id": db_obj.id, "full_name": db_obj.full_name},
+            application_id=db_obj.id,
+        ))
+        result = results["crew"]
+        verification_report = result.get("verification_report", {})
+        if results["government"] is not None:
+            verification_report["government_verification"] = results["government"]
 
         # Save results
-        db_obj.trust_score = result.get("trust_score", 0.0)
-        db_obj.verification_report_json = json.dumps(verification_report)
+        with tracker.stage("save"):
+            db_obj.trust_score = result.get("trust_score", 0.0)
+            db_obj.verification_report_json = json.dumps(verification_report)
 
-        # Only overwrite training plan if crew produced one
-        crew_plan = result.get("training_plan")
-        if crew_plan and isinstance(crew_plan, dict) and crew_plan.get("weekly_plan"):
-            db_obj.training_plan_json = json.dumps(crew_plan)
+            # Only overwrite training plan if crew produced one
+            crew_plan = result.get("training_plan")
+            if crew_plan and isinstance(crew_plan, dict) and crew_plan.get("weekly_plan"):
+                db_obj.training_plan_json = json.dumps(crew_plan)
 
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+            db.add(db_obj)
+            db.commit()
+            db.refresh(db_obj)
+        checkpoints.clear()
         return db_obj
 
     except Exception as exc:
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, HTTPException
+
+from app.services.job_queue import get_job
+
+router = APIRouter()
+
+
+@router.get("/{job_id}")
+def get_job_status(job_id: str):
+    """Status of a background job and each stage it has run, with timings."""
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -0,0 +1,82 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.http import http_clients
+from app.services.github_cache import response_cache
+from app.services.github_metrics_cache import metrics_cache
+from app.services.github_ratelimit import rate_limit_stats
+from app.services.github_service import github_flight
+from app.services.auto_verification import deferred_count, verification_flight
+from app.services.llm_budget import token_budget
+from app.services.llm_cache import llm_cache
+from app.services.llm_metrics import llm_calls
+from app.services.llm_service import llm_breaker, llm_outcomes, llm_router
+
+router = APIRouter()
+
+
+@router.get("/github-cache")
+def get_github_cache_stats():
+    """Hit / miss / 304-revalidation counters of the GitHub response cache."""
+    return response_cache.stats()
+
+
+@router.get("/github-metrics-cache")
+def get_github_metrics_cache_stats():
+    """Memory / DB hit counters of the per-username GitHub metrics cache."""
+    return metrics_cache.stats()
+
+
+@router.get("/github-rate-limit")
+def get_github_rate_limit():
+    """Remaining budget per GitHub token and time spent queued for refills."""
+    return rate_limit_stats()
+
+
+@router.get("/http-pool")
+def get_http_pool_stats():
+    """Connection usage of the shared GitHub / LLM HTTP pools."""
+    return http_clients.stats()
+
+
+@router.get("/llm-cache")
+def get_llm_cache_stats():
+    """Memory / DB hit counters of the content-addressed LLM reply cache."""
+    return llm_cache.stats()
+
+
+@router.get("/llm-resilience")
+def get_llm_resilience_stats():
+    """Circuit-breaker state and per-outcome counters of LLM provider calls."""
+    return {"breaker": llm_breaker.stats(), "outcomes": llm_outcomes.snapshot()}
+
+
+@router.get("/llm-budget")
+def get_llm_budget():
+    """Token spend against the hourly / daily budget, which LLM features are on,
+    and how many auto-verifications are waiting for budget."""
+    return {**token_budget.stats(), "deferred_verifications": deferred_count()}
+
+
+@router.get("/llm-calls")
+def get_llm_call_summary():
+    """Latency percentiles, outcomes and token spend per LLM call site over the recent window."""
+    return llm_calls.summary()
+
+
+@router.get("/llm-routing")
+def get_llm_routing():
+    """Configured route per LLM call site and the model it currently uses."""
+    return llm_router.stats()
+
+
+@router.get("/single-flight")
+def get_single_flight_stats():
+    """Runs and coalesced callers of the GitHub fetch and verification single-flights."""
+    return {"github_metrics": github_flight.stats(), "verification": verification_flight.stats()}
+
+
+@router.get("/prometheus", response_class=PlainTextResponse)
+def get_prometheus_metrics():
+    """LLM call counters and latency histograms in the Prometheus text format."""
+    return PlainTextResponse(llm_calls.render_prometheus(), media_type="text/plain; version=0.0.4")
@@ -62,5 +62,11 @@ class ApplicationResponse(BaseModel):
         from_attributes = True
 
 
+class ApplicationAccepted(ApplicationResponse):
+    """A stored application whose analysis runs as background job ``job_id``."""
+
+    job_id: str
+
+
 class ApplicationStatusUpdate(BaseModel):
     status: str
@@ -0,0 +1,121 @@
+"""Agentic verification run at intake, and the queue for deferred runs.
+
+When the token budget is past its soft limit, or the LLM circuit breaker
+is open, intake does not start the 4-agent crew; the application is queued
+in ``deferred_verifications`` and ``run_deferred_verifications.py`` works
+through the queue once the budget allows it again.
+
+Crew runs are coalesced per application: a double-clicked ``/verify``, or
+``/verify`` while intake is still verifying, waits for the run in flight
+and stores its result instead of starting a second crew.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.singleflight import SingleFlight
+from app.database import SessionLocal
+from app.models.application import Application
+from app.models.llm_budget import DeferredVerification
+
+
+verification_flight = SingleFlight("verification")
+
+
+def _crew_environment(api_key: str) -> None:
+    os.environ["GROQ_API_KEY"] = api_key
+    os.environ["CREWAI_TELEMETRY_OPTOUT"] = "true"
+    if not os.environ.get("OPENAI_API_KEY"):
+        os.environ["OPENAI_API_KEY"] = "sk-placeholder-not-used"
+
+
+def crew_inputs(github_url: str, role_applied: str, candidate_name: str, resume_data: dict | None) -> dict:
+    # Parse resume skills for claims cross-referencing
+    resume_skills = []
+    if resume_data:
+        resume_skills = (
+            resume_data.get("keywords_detected")
+            or resume_data.get("skill_keywords")
+            or []
+        )
+    return {
+        "github_url": github_url,
+        "role_applied": role_applied,
+        "candidate_name": candidate_name,
+        "resume_skills": resume_skills,
+    }
+
+
+def coalesced_verification(application_id: int, inputs: dict) -> dict:
+    """Run the crew for ``application_id``, or wait for the run already in flight."""
+    from app.agents.verification_crew import run_verification
+
+    result, _ = verification_flight.do(application_id, lambda: run_verification(**inputs))
+    # Every caller gets its own copy: the report is edited before it is saved
+    return copy.deepcopy(result)
+
+
+def run_crew(inputs: dict, api_key: str, application_id: int) -> dict:
+    """Run the verification crew on ``crew_inputs``; raises on failure
+    (``ImportError`` if CrewAI is not installed)."""
+    _crew_environment(api_key)
+
+    # Trigger CrewAI
+    return coalesced_verification(application_id, inputs)
+
+
+def apply_crew_result(db: Session, db_obj: Application, result: dict) -> None:
+    db_obj.trust_score = result.get("trust_score", 0.0)
+    db_obj.verification_report_json = json.dumps(
+        result.get("verification_report", {})
+    )
+
+    crew_plan = result.get("training_plan")
+    if crew_plan and isinstance(crew_plan, dict) and crew_plan.get("weekly_plan"):
+        db_obj.training_plan_json = json.dumps(crew_plan)
+
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+
+
+def run_auto_verification(db: Session, db_obj: Application, resume_data: dict | None, api_key: str) -> bool:
+    """Run the verification crew for an application and store its results.
+
+    Returns whether it succeeded; failures are logged, never raised.
+    """
+    try:
+        inputs = crew_inputs(db_obj.github_url, db_obj.role_applied, db_obj.full_name, resume_data)
+        result = run_crew(inputs, api_key, db_obj.id)
+        apply_crew_result(db, db_obj, result)
+        return True
+    except Exception as e:
+        print(f"Auto-verification failed: {e}")
+        return False
+
+
+def defer_verification(application_id: int, reason: str) -> None:
+    db = SessionLocal()
+    try:
+        db.add(DeferredVerification(application_id=application_id, reason=reason))
+        try:
+            db.commit()
+        except IntegrityError:
+            # Already queued
+            db.rollback()
+    finally:
+        db.close()
+
+
+def deferred_count() -> int:
+    db = SessionLocal()
+    try:
+        return db.query(DeferredVerification).count()
+    finally:
+        db.close()
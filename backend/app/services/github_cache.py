@@ -0,0 +1,136 @@
+"""Conditional-request cache for GitHub REST responses.
+
+Stores the body, ETag and Last-Modified of every cacheable GitHub response in
+the database so that later fetches (re-verification, the crew's GitHub tool)
+can send ``If-None-Match`` / ``If-Modified-Since``. GitHub answers unchanged
+resources with ``304 Not Modified``, which does not count against the rate
+limit.
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta
+from typing import Any
+
+import httpx
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.github_cache import GitHubResponseCache
+
+
+class ResponseCache:
+    """DB-backed ETag/Last-Modified cache with hit, miss and revalidation counters."""
+
+    _PURGE_EVERY = 100
+
+    def __init__(self, fresh_seconds: float, max_age_days: int) -> None:
+        self.fresh_seconds = fresh_seconds
+        self.max_age_days = max_age_days
+        self._lock = threading.Lock()
+        self._stores = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def lookup(self, url: str) -> dict[str, Any] | None:
+        db = SessionLocal()
+        try:
+            row = db.get(GitHubResponseCache, url)
+            if row is None:
+                return None
+            return {
+                "etag": row.etag,
+                "last_modified": row.last_modified,
+                "link": row.link,
+                "body": row.body,
+                "fetched_at": row.fetched_at,
+            }
+        finally:
+            db.close()
+
+    def is_fresh(self, entry: dict[str, Any]) -> bool:
+        age = (datetime.utcnow() - entry["fetched_at"]).total_seconds()
+        return age < self.fresh_seconds
+
+    @staticmethod
+    def conditional_headers(entry: dict[str, Any]) -> dict[str, str]:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, response: httpx.Response) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        db = SessionLocal()
+        try:
+            row = db.get(GitHubResponseCache, url) or GitHubResponseCache(url=url)
+            row.etag = etag
+            row.last_modified = last_modified
+            row.link = response.headers.get("Link")
+            row.body = response.text
+            row.fetched_at = datetime.utcnow()
+            db.add(row)
+            try:
+                db.commit()
+            except IntegrityError:
+                # A concurrent fetch of the same URL stored it first
+                db.rollback()
+                return
+
+            with self._lock:
+                self._stores += 1
+                purge = self._stores % self._PURGE_EVERY == 0
+            if purge:
+                self._purge(db)
+        finally:
+            db.close()
+
+    def touch(self, url: str) -> None:
+        """Mark an entry as freshly validated after a 304."""
+        db = SessionLocal()
+        try:
+            row = db.get(GitHubResponseCache, url)
+            if row is not None:
+                row.fetched_at = datetime.utcnow()
+                db.add(row)
+                db.commit()
+        finally:
+            db.close()
+
+    def _purge(self, db) -> None:
+        cutoff = datetime.utcnow() - timedelta(days=self.max_age_days)
+        db.query(GitHubResponseCache).filter(
+            GitHubResponseCache.fetched_at < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses + self.revalidations
+            served = self.hits + self.revalidations
+            return {
+                "enabled": settings.github_cache_enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "hit_rate": round(served / total, 4) if total else 0.0,
+            }
+
+
+response_cache = ResponseCache(
+    fresh_seconds=settings.github_cache_fresh_seconds,
+    max_age_days=settings.github_cache_max_age_days,
+)
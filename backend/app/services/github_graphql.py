@@ -0,0 +1,139 @@
+"""GraphQL backend for GitHub metrics collection.
+
+Fetches the repository list, stargazer counts, language byte sizes and
+default-branch commit counts since the 90-day cutoff in one paginated query
+(100 repos per page), instead of the 2 + 2×N REST calls. Results are returned
+in the same shape the REST path produces so ``github_service._build_metrics``
+can aggregate either.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+REPOS_QUERY = """
+query($login: String!, $after: String, $since: GitTimestamp!, $withDetails: Boolean!) {
+  user(login: $login) {
+    repositories(
+      first: 100
+      after: $after
+      isFork: false
+      privacy: PUBLIC
+      ownerAffiliations: OWNER
+      orderBy: {field: PUSHED_AT, direction: DESC}
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        stargazerCount
+        pushedAt
+        owner { login }
+        primaryLanguage { name }
+      }
+    }
+    recent: repositories(
+      first: 10
+      isFork: false
+      privacy: PUBLIC
+      ownerAffiliations: OWNER
+      orderBy: {field: PUSHED_AT, direction: DESC}
+    ) @include(if: $withDetails) {
+      nodes {
+        name
+        languages(first: 100) { edges { size node { name } } }
+        defaultBranchRef {
+          target { ... on Commit { history(since: $since) { totalCount } } }
+        }
+      }
+    }
+  }
+}
+"""
+
+MAX_PAGES = 10
+
+
+class GraphQLError(Exception):
+    """Raised when GitHub returns GraphQL errors other than NOT_FOUND."""
+
+
+class GitHubUserNotFound(ValueError):
+    """The GitHub account does not exist (REST 404 or GraphQL NOT_FOUND)."""
+
+
+def _to_rest_repo(node: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "name": node.get("name"),
+        "fork": False,
+        "stargazers_count": node.get("stargazerCount", 0),
+        "pushed_at": node.get("pushedAt"),
+        "language": (node.get("primaryLanguage") or {}).get("name"),
+        "owner": {"login": (node.get("owner") or {}).get("login")},
+    }
+
+
+def _to_repo_details(node: dict[str, Any]) -> tuple[dict[str, int], int]:
+    languages = {
+        edge["node"]["name"]: int(edge.get("size", 0))
+        for edge in (node.get("languages") or {}).get("edges", [])
+    }
+    target = (node.get("defaultBranchRef") or {}).get("target") or {}
+    commit_count = (target.get("history") or {}).get("totalCount", 0)
+    return languages, int(commit_count)
+
+
+async def fetch_repos_graphql(
+    send: Callable[[dict[str, Any]], Awaitable[httpx.Response]],
+    username: str,
+    cutoff: datetime,
+) -> tuple[list[dict[str, Any]], list[tuple[dict[str, int], int]]]:
+    """Return ``(repos, repo_details)`` for ``username`` via the GraphQL API.
+
+    ``send`` posts one GraphQL request body and returns the response, so the
+    caller decides on client, endpoint and rate-limit scheduling.
+
+    ``repos`` uses REST field names; ``repo_details`` holds
+    ``(language_bytes, commit_count)`` for the 10 most recently pushed repos.
+    Raises ``ValueError`` if the user does not exist.
+    """
+    repos: list[dict[str, Any]] = []
+    repo_details: list[tuple[dict[str, int], int]] = []
+    after = None
+
+    for page in range(MAX_PAGES):
+        resp = await send({
+            "query": REPOS_QUERY,
+            "variables": {
+                "login": username,
+                "after": after,
+                "since": cutoff.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "withDetails": page == 0,
+            },
+        })
+        resp.raise_for_status()
+        payload = resp.json()
+
+        errors = payload.get("errors") or []
+        if any(e.get("type") == "NOT_FOUND" for e in errors):
+            raise GitHubUserNotFound("GitHub user not found")
+        user = (payload.get("data") or {}).get("user")
+        if user is None:
+            if errors:
+                raise GraphQLError(errors[0].get("message", "GraphQL error"))
+            raise GitHubUserNotFound("GitHub user not found")
+
+        connection = user["repositories"]
+        repos.extend(_to_rest_repo(node) for node in connection.get("nodes", []))
+        if page == 0:
+            recent = (user.get("recent") or {}).get("nodes", [])
+            repo_details = [_to_repo_details(node) for node in recent]
+
+        page_info = connection.get("pageInfo") or {}
+        if not page_info.get("hasNextPage"):
+            break
+        after = page_info.get("endCursor")
+
+    return repos, repo_details
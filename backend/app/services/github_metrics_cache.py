@@ -0,0 +1,136 @@
+"""Two-tier cache of aggregated GitHub metrics, keyed by username.
+
+One application lifecycle asks for the same profile several times: intake,
+the verification crew's ``fetch_github_profile`` tool, and every manual
+re-verification. The first tier is a per-process LRU; the second is a table
+every gunicorn worker shares. Entries live for ``GITHUB_METRICS_TTL_SECONDS``
+in the database, but only ``GITHUB_METRICS_MEMORY_TTL_SECONDS`` in memory, so
+an invalidation in one worker reaches the others within that window.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.github_metrics import GitHubMetricsCache
+
+
+class MetricsCache:
+    _PURGE_EVERY = 100
+
+    def __init__(self, ttl_seconds: float, memory_ttl_seconds: float, memory_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.memory = TTLCache(memory_entries, min(memory_ttl_seconds, ttl_seconds))
+        self._lock = threading.Lock()
+        self._stores = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    @staticmethod
+    def _key(username: str) -> str:
+        # GitHub logins are case-insensitive
+        return username.lower()
+
+    def get(self, username: str) -> dict[str, Any] | None:
+        if not self.enabled:
+            return None
+        key = self._key(username)
+        cached = self.memory.get(key)
+        if cached is not None:
+            return json.loads(cached)
+
+        db = SessionLocal()
+        try:
+            row = db.get(GitHubMetricsCache, key)
+            payload = row.metrics_json if row else None
+            age = (datetime.utcnow() - row.fetched_at).total_seconds() if row else 0.0
+        finally:
+            db.close()
+        if payload is None or age >= self.ttl_seconds:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.db_hits += 1
+        # Never keep the memory copy past the DB entry's own expiry
+        self.memory.set(key, payload, min(self.memory.ttl_seconds, self.ttl_seconds - age))
+        return json.loads(payload)
+
+    def set(self, username: str, metrics: dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        key = self._key(username)
+        payload = json.dumps(metrics)
+        self.memory.set(key, payload)
+
+        db = SessionLocal()
+        try:
+            row = db.get(GitHubMetricsCache, key) or GitHubMetricsCache(username=key)
+            row.metrics_json = payload
+            row.fetched_at = datetime.utcnow()
+            db.add(row)
+            try:
+                db.commit()
+            except IntegrityError:
+                # A concurrent fetch of the same user stored it first
+                db.rollback()
+                return
+
+            with self._lock:
+                self._stores += 1
+                purge = self._stores % self._PURGE_EVERY == 0
+            if purge:
+                self._purge(db)
+        finally:
+            db.close()
+
+    def invalidate(self, username: str) -> None:
+        key = self._key(username)
+        self.memory.delete(key)
+        db = SessionLocal()
+        try:
+            db.query(GitHubMetricsCache).filter(GitHubMetricsCache.username == key).delete()
+            db.commit()
+        finally:
+            db.close()
+
+    def _purge(self, db) -> None:
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+        db.query(GitHubMetricsCache).filter(
+            GitHubMetricsCache.fetched_at < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    def stats(self) -> dict[str, Any]:
+        memory = self.memory.stats()
+        with self._lock:
+            db_hits, misses = self.db_hits, self.misses
+        total = memory["hits"] + db_hits + misses
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl_seconds,
+            "memory": memory,
+            "db_hits": db_hits,
+            "misses": misses,
+            "hit_rate": round((memory["hits"] + db_hits) / total, 4) if total else 0.0,
+        }
+
+
+metrics_cache = MetricsCache(
+    ttl_seconds=settings.github_metrics_ttl_seconds,
+    memory_ttl_seconds=settings.github_metrics_memory_ttl_seconds,
+    memory_entries=settings.github_metrics_memory_entries,
+)
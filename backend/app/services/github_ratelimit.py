@@ -0,0 +1,230 @@
+"""Rate-limit-aware scheduling of GitHub API requests across a token pool.
+
+Each configured token is tracked as a bucket refilled by GitHub at
+``X-RateLimit-Reset``. Requests draw from the bucket with the most budget
+left; the local count is decremented on dispatch so concurrent requests do not
+all race for the last unit, and corrected from ``X-RateLimit-Remaining`` on
+every response. When every bucket is empty (or blocked by ``Retry-After``)
+requests wait for the earliest refill instead of failing, up to
+``GITHUB_MAX_WAIT_SECONDS``; only then is ``GitHubRateLimitError`` raised.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+import httpx
+
+from app.core.config import settings
+
+DEFAULT_LIMITS = {"core": 5000, "graphql": 5000}
+ANONYMOUS_LIMIT = 60
+
+
+class GitHubRateLimitError(Exception):
+    """All tokens are exhausted for longer than the configured max wait."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"GitHub rate limit exhausted; retry in {int(retry_after)}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class TokenBucket:
+    token: str | None
+    limit: int
+    remaining: int
+    reset_at: float = 0.0
+    blocked_until: float = 0.0
+    in_flight: int = 0
+
+    def available(self, now: float) -> int:
+        if self.reset_at and now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = 0.0
+        if now < self.blocked_until:
+            return 0
+        return self.remaining
+
+    def next_refill(self, now: float) -> float:
+        if self.blocked_until > now and self.remaining > 0:
+            return self.blocked_until
+        candidates = [t for t in (self.reset_at, self.blocked_until) if t > now]
+        return max(candidates) if candidates else now + 1.0
+
+    @property
+    def label(self) -> str:
+        if not self.token:
+            return "anonymous"
+        return f"…{self.token[-4:]}"
+
+
+def _is_rate_limited(resp: httpx.Response) -> bool:
+    if resp.status_code == 429:
+        return True
+    if resp.status_code == 403:
+        return resp.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in resp.headers
+    return False
+
+
+class RateLimitScheduler:
+    """Token-bucket scheduler for one GitHub rate-limit resource."""
+
+    def __init__(self, resource: str, tokens: list[str], max_wait: float) -> None:
+        self.resource = resource
+        self.max_wait = max_wait
+        limit = DEFAULT_LIMITS.get(resource, 5000)
+        self.buckets = [TokenBucket(token=t, limit=limit, remaining=limit) for t in tokens] or [
+            TokenBucket(token=None, limit=ANONYMOUS_LIMIT, remaining=ANONYMOUS_LIMIT)
+        ]
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.waits_total = 0
+        self.wait_seconds_total = 0.0
+        self.rate_limited_responses = 0
+
+    def _try_reserve(self, now: float) -> TokenBucket | float:
+        """Reserve one unit from the richest bucket, or return when to retry."""
+        with self._lock:
+            best = max(self.buckets, key=lambda b: b.available(now))
+            if best.available(now) > 0:
+                best.remaining -= 1
+                best.in_flight += 1
+                return best
+            return min(b.next_refill(now) for b in self.buckets)
+
+    async def acquire(self) -> tuple[TokenBucket, float]:
+        """Return a bucket to spend and the seconds spent queueing for it."""
+        waited = 0.0
+        while True:
+            now = time.time()
+            result = self._try_reserve(now)
+            if isinstance(result, TokenBucket):
+                if waited:
+                    with self._lock:
+                        self.waits_total += 1
+                        self.wait_seconds_total += waited
+                return result, waited
+
+            delay = max(0.05, result - now)
+            if waited + delay > self.max_wait:
+                raise GitHubRateLimitError(retry_after=delay)
+
+            with self._lock:
+                self.queued += 1
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                with self._lock:
+                    self.queued -= 1
+            waited += delay
+
+    def release(self, bucket: TokenBucket, resp: httpx.Response | None) -> None:
+        with self._lock:
+            bucket.in_flight -= 1
+            if resp is None:
+                return
+
+            limit = resp.headers.get("X-RateLimit-Limit")
+            remaining = resp.headers.get("X-RateLimit-Remaining")
+            reset = resp.headers.get("X-RateLimit-Reset")
+            if limit is not None and limit.isdigit():
+                bucket.limit = int(limit)
+            if remaining is not None and remaining.isdigit() and reset is not None and reset.isdigit():
+                reset_at = float(reset)
+                if reset_at > bucket.reset_at:
+                    # New window: the header is authoritative
+                    bucket.reset_at = reset_at
+                    bucket.remaining = int(remaining) - bucket.in_flight
+                else:
+                    # Same window, responses may arrive out of order
+                    bucket.remaining = min(bucket.remaining, int(remaining))
+
+            if _is_rate_limited(resp):
+                self.rate_limited_responses += 1
+                retry_after = resp.headers.get("Retry-After")
+                now = time.time()
+                if retry_after is not None and retry_after.isdigit():
+                    # Secondary limit: pause the token, its window budget is left
+                    bucket.blocked_until = now + int(retry_after)
+                else:
+                    bucket.blocked_until = bucket.reset_at or now + 60
+                    bucket.remaining = 0
+
+    def stats(self) -> dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            return {
+                "tokens": [
+                    {
+                        "token": b.label,
+                        "limit": b.limit,
+                        "remaining": b.available(now),
+                        "in_flight": b.in_flight,
+                        "reset_at": _iso(b.reset_at),
+                        "blocked_until": _iso(b.blocked_until) if b.blocked_until > now else None,
+                    }
+                    for b in self.buckets
+                ],
+                "remaining_total": sum(b.available(now) for b in self.buckets),
+                "queued": self.queued,
+                "waits_total": self.waits_total,
+                "wait_seconds_total": round(self.wait_seconds_total, 2),
+                "rate_limited_responses": self.rate_limited_responses,
+            }
+
+
+def _iso(ts: float) -> str | None:
+    if not ts:
+        return None
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+
+schedulers: dict[str, RateLimitScheduler] = {
+    resource: RateLimitScheduler(resource, list(settings.github_tokens), settings.github_max_wait_seconds)
+    for resource in ("core", "graphql")
+}
+
+
+async def github_request(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    headers: dict[str, str],
+    resource: str = "core",
+    **kwargs: Any,
+) -> tuple[httpx.Response, float]:
+    """Send a request with a scheduled token.
+
+    Rate-limited responses release their token as blocked and the request is
+    retried on the next available one. Returns the response and the seconds
+    spent queued, so callers can exclude that time from their own deadlines.
+    """
+    scheduler = schedulers[resource]
+    waited_total = 0.0
+    while True:
+        bucket, waited = await scheduler.acquire()
+        waited_total += waited
+        request_headers = dict(headers)
+        if bucket.token:
+            request_headers["Authorization"] = f"Bearer {bucket.token}"
+        try:
+            resp = await client.request(method, url, headers=request_headers, **kwargs)
+        except BaseException:
+            # Including cancellation (fetch deadline): the unit must not stay in flight
+            scheduler.release(bucket, None)
+            raise
+        scheduler.release(bucket, resp)
+        if not _is_rate_limited(resp):
+            return resp, waited_total
+        if waited_total >= scheduler.max_wait:
+            raise GitHubRateLimitError(retry_after=max(0.0, bucket.blocked_until - time.time()))
+
+
+def rate_limit_stats() -> dict[str, Any]:
+    return {resource: s.stats() for resource, s in schedulers.items()}
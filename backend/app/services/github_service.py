@@ -1,12 +1,28 @@
 from __future__ import annotations
 
+import asyncio
+import re
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import Any
 from urllib.parse import urlparse
 
 import httpx
 
+from app.core.concurrency import io_loop, run_sync
 from app.core.config import settings
+from app.core.http import http_clients
+from app.core.singleflight import AsyncSingleFlight
+from app.services.github_cache import response_cache
+from app.services.github_graphql import GitHubUserNotFound, fetch_repos_graphql
+from app.services.github_metrics_cache import metrics_cache
+from app.services.github_ratelimit import GitHubRateLimitError, github_request
+from app.services.github_snapshots import load_snapshots, reusable_details, save_snapshots
+
+_LAST_PAGE_RE = re.compile(r'<[^>]*[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+# Concurrent fetches of one profile share a single run; used on io_loop only
+github_flight = AsyncSingleFlight("github_metrics")
 
 
 def _clamp(value: float, min_value: float, max_value: float) -> float:
@@ -43,46 +59,233 @@ def _safe_empty(username: str) -> dict[str, Any]:
     }
 
 
-def fetch_github_metrics(github_url: str) -> dict[str, Any]:
-    username = _extract_username(github_url)
+def _build_headers() -> dict[str, str]:
+    # Authorization is added per request by the rate-limit scheduler
+    return {"Accept": "application/vnd.github+json"}
+
+
+@dataclass
+class _FetchContext:
+    """Per-fetch state shared by every request of one metrics collection."""
+
+    client: httpx.AsyncClient
+    semaphore: asyncio.Semaphore
+    headers: dict[str, str]
+    # Skip the fresh window and revalidate every cached response
+    revalidate: bool = False
+    # (start, end) loop times each request spent queued behind the rate limiter
+    waits: list[tuple[float, float]] = field(default_factory=list)
+
+    def record_wait(self, start: float, waited: float) -> None:
+        if waited:
+            self.waits.append((start, start + waited))
+
+    @property
+    def rate_limit_wait(self) -> float:
+        """Wall-clock seconds during which at least one request was queued.
+
+        Concurrent requests queue side by side; summing their waits would
+        stretch the deadline by the concurrency factor.
+        """
+        total, covered_until = 0.0, float("-inf")
+        for start, end in sorted(self.waits):
+            if end > covered_until:
+                total += end - max(start, covered_until)
+                covered_until = end
+        return total
+
+
+async def _send(ctx: _FetchContext, url: str, headers: dict[str, str]) -> httpx.Response:
+    async with ctx.semaphore:
+        start = asyncio.get_running_loop().time()
+        resp, waited = await github_request(ctx.client, "GET", url, headers)
+    ctx.record_wait(start, waited)
+    return resp
+
+
+async def _get(ctx: _FetchContext, url: str) -> httpx.Response:
+    """GET a GitHub URL, revalidating against the response cache when enabled.
+
+    A fresh cache entry is served without a request; a stale one is sent as a
+    conditional request and a 304 is turned back into the cached 200.
+    """
+    if not settings.github_cache_enabled:
+        return await _send(ctx, url, ctx.headers)
+
+    entry = await asyncio.to_thread(response_cache.lookup, url)
+    if entry is not None and not ctx.revalidate and response_cache.is_fresh(entry):
+        response_cache.record("hits")
+        return _cached_response(url, entry)
+
+    request_headers = dict(ctx.headers)
+    if entry is not None:
+        request_headers.update(response_cache.conditional_headers(entry))
+
+    resp = await _send(ctx, url, request_headers)
+
+    if resp.status_code == 304 and entry is not None:
+        response_cache.record("revalidations")
+        await asyncio.to_thread(response_cache.touch, url)
+        return _cached_response(url, entry)
+
+    response_cache.record("misses")
+    if resp.status_code == 200:
+        await asyncio.to_thread(response_cache.store, url, resp)
+    return resp
+
+
+async def _wait_with_deadline(ctx: _FetchContext, tasks: list[asyncio.Task], deadline: float) -> None:
+    """Wait for ``tasks`` until ``deadline``, cancelling whatever is left.
+
+    Time spent queued behind the rate limiter extends the deadline: delayed
+    work is still worth finishing, it is just not allowed to hang.
+    """
+    loop = asyncio.get_running_loop()
+    pending = set(tasks)
+    while pending:
+        timeout = deadline + ctx.rate_limit_wait - loop.time()
+        if timeout <= 0:
+            break
+        _, pending = await asyncio.wait(pending, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    # cancel() only requests it; let the tasks finish so callers can inspect them
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+def _cached_response(url: str, entry: dict[str, Any]) -> httpx.Response:
+    headers = {"Content-Type": "application/json"}
+    if entry.get("link"):
+        headers["Link"] = entry["link"]
+    return httpx.Response(
+        200,
+        content=entry["body"].encode(),
+        headers=headers,
+        request=httpx.Request("GET", url),
+    )
 
-    user_url = f"https://api.github.com/users/{username}"
-    repos_url = f"https://api.github.com/users/{username}/repos?per_page=100"
 
-    headers = {"Accept": "application/vnd.github+json"}
-    if settings.github_token:
-        headers["Authorization"] = f"Bearer {settings.github_token}"
+def _commits_cutoff() -> datetime:
+    """Start of the 90-day commit window, truncated to the hour.
+
+    Truncating keeps the /commits URL stable long enough for the response
+    cache to revalidate it instead of treating every call as a new URL.
+    """
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    return now - timedelta(days=90)
+
+
+def _last_page(link_header: str | None) -> int | None:
+    """Page number of the ``rel="last"`` entry of a GitHub ``Link`` header."""
+    if not link_header:
+        return None
+    match = _LAST_PAGE_RE.search(link_header)
+    return int(match.group(1)) if match else None
+
+
+async def _count_commits_listing(ctx: _FetchContext, commits_base: str, since: str) -> int:
+    """Download up to 100 commit objects and count them (legacy strategy)."""
+    resp = await _get(ctx, f"{commits_base}?since={since}&per_page=100")
+    if resp.status_code != 200:
+        return 0
+    return len(resp.json())
+
+
+async def _count_commits_link(ctx: _FetchContext, commits_base: str, since: str) -> int:
+    """Exact count from one ``per_page=1`` page: the last page number is the total."""
+    resp = await _get(ctx, f"{commits_base}?since={since}&per_page=1")
+    if resp.status_code != 200:
+        # 409 = empty repository
+        return 0
+    last_page = _last_page(resp.headers.get("Link"))
+    if last_page is not None:
+        return last_page
+    return len(resp.json())
+
+
+async def _count_commits_participation(
+    ctx: _FetchContext, owner: str, repo_name: str, commits_base: str, since: str
+) -> int:
+    """Sum of the last 13 weekly totals from the participation statistics.
+
+    Week-granular (91 days) but a single small, well-cached response. GitHub
+    answers 202 while it computes the statistics; fall back to the Link count.
+    """
+    resp = await _get(ctx, f"{settings.github_api_url}/repos/{owner}/{repo_name}/stats/participation")
+    if resp.status_code == 200:
+        weekly = resp.json().get("all") or []
+        return int(sum(weekly[-13:]))
+    return await _count_commits_link(ctx, commits_base, since)
+
+
+async def _count_commits(ctx: _FetchContext, owner: str, repo_name: str, cutoff: datetime) -> int:
+    commits_base = f"{settings.github_api_url}/repos/{owner}/{repo_name}/commits"
+    since = cutoff.strftime("%Y-%m-%dT%H:%M:%SZ")
+    strategy = settings.github_commit_count
+    if strategy == "participation":
+        return await _count_commits_participation(ctx, owner, repo_name, commits_base, since)
+    if strategy == "list":
+        return await _count_commits_listing(ctx, commits_base, since)
+    return await _count_commits_link(ctx, commits_base, since)
+
+
+async def _fetch_repo_details(
+    ctx: _FetchContext,
+    owner: str,
+    repo_name: str,
+    cutoff: datetime,
+) -> tuple[dict[str, int], int]:
+    """Fetch language bytes and the 90-day commit count for one repo.
+
+    Both are fetched together; a failure in either only zeroes its part.
+    """
+    languages_url = f"{settings.github_api_url}/repos/{owner}/{repo_name}/languages"
+
+    lang_resp, commit_count = await asyncio.gather(
+        _get(ctx, languages_url),
+        _count_commits(ctx, owner, repo_name, cutoff),
+        return_exceptions=True,
+    )
 
-    try:
-        with httpx.Client(timeout=10.0) as client:
-            user_resp = client.get(user_url, headers=headers)
-            if user_resp.status_code == 404:
-                raise ValueError("GitHub user not found")
-            user_resp.raise_for_status()
+    repo_langs: dict[str, int] = {}
+    if isinstance(lang_resp, httpx.Response) and lang_resp.status_code == 200:
+        try:
+            repo_langs = {lang: int(n) for lang, n in lang_resp.json().items()}
+        except Exception:
+            repo_langs = {}
 
-            repos_resp = client.get(repos_url, headers=headers)
-            repos_resp.raise_for_status()
+    if not isinstance(commit_count, int):
+        commit_count = 0
 
-            repos = repos_resp.json()
-    except ValueError:
-        raise
-    except Exception:
-        return _safe_empty(username)
+    return repo_langs, commit_count
 
-    non_fork_repos = [r for r in repos if not r.get("fork")]
-    total_public_repos = len(non_fork_repos)
-    total_stars = sum(r.get("stargazers_count", 0) for r in non_fork_repos)
 
-    sorted_by_pushed = sorted(
+def _analyzed_repos(repos: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """The 10 most recently pushed non-fork repos that get per-repo calls."""
+    non_fork_repos = [r for r in repos if not r.get("fork")]
+    return sorted(
         non_fork_repos,
         key=lambda r: r.get("pushed_at") or "",
         reverse=True,
-    )
-    analyzed_repos = sorted_by_pushed[:10]
+    )[:10]
 
+
+def _build_metrics(
+    username: str,
+    repos: list[dict[str, Any]],
+    repo_details: list[tuple[dict[str, int], int]],
+) -> dict[str, Any]:
+    """Aggregate the repo list and per-repo details into the metrics dict."""
+    non_fork_repos = [r for r in repos if not r.get("fork")]
+    total_public_repos = len(non_fork_repos)
+    total_stars = sum(r.get("stargazers_count", 0) for r in non_fork_repos)
+
+    analyzed_repos = _analyzed_repos(repos)
+
+    # Ties broken by recency so REST and GraphQL (different list orders) agree
     top_repositories = sorted(
         non_fork_repos,
-        key=lambda r: r.get("stargazers_count", 0),
+        key=lambda r: (r.get("stargazers_count", 0), r.get("pushed_at") or ""),
         reverse=True,
     )[:3]
     top_repositories = [
@@ -94,43 +297,12 @@ def fetch_github_metrics(github_url: str) -> dict[str, Any]:
         for r in top_repositories
     ]
 
-    cutoff = datetime.now(timezone.utc) - timedelta(days=90)
     commits_last_90_days = 0
     language_bytes: dict[str, int] = {}
-
-    with httpx.Client(timeout=10.0) as client:
-        for repo in analyzed_repos:
-            owner = repo.get("owner", {}).get("login") or username
-            repo_name = repo.get("name")
-            if not repo_name:
-                continue
-
-            languages_url = f"https://api.github.com/repos/{owner}/{repo_name}/languages"
-            commits_url = (
-                f"https://api.github.com/repos/{owner}/{repo_name}/commits"
-                f"?since={cutoff.isoformat()}&per_page=100"
-            )
-
-            try:
-                lang_resp = client.get(languages_url, headers=headers)
-                if lang_resp.status_code == 200:
-                    repo_langs = lang_resp.json()
-                    for lang, bytes_count in repo_langs.items():
-                        language_bytes[lang] = language_bytes.get(lang, 0) + int(bytes_count)
-            except Exception:
-                pass
-
-            try:
-                commits_resp = client.get(commits_url, headers=headers)
-                if commits_resp.status_code == 200:
-                    commits = commits_resp.json()
-                    commits_last_90_days += min(len(commits), 100)
-            except Exception:
-                pass
-
-            if commits_last_90_days >= 500:
-                commits_last_90_days = 500
-                break
+    for repo_langs, commit_count in repo_details:
+        for lang, bytes_count in repo_langs.items():
+            language_bytes[lang] = language_bytes.get(lang, 0) + bytes_count
+        commits_last_90_days += commit_count
 
     total_lang_bytes = sum(language_bytes.values())
     if total_lang_bytes > 0:
@@ -157,6 +329,223 @@ def fetch_github_metrics(github_url: str) -> dict[str, Any]:
     }
 
 
+async def _collect_rest(ctx: _FetchContext, username: str, incremental: bool = False) -> dict[str, Any]:
+    user_url = f"{settings.github_api_url}/users/{username}"
+    repos_url = f"{settings.github_api_url}/users/{username}/repos?per_page=100"
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.github_deadline_seconds
+
+    # Incremental refreshes skip /users: a 404 on the repo list says the same
+    first_tasks = {"repos": asyncio.ensure_future(_get(ctx, repos_url))}
+    if not incremental:
+        first_tasks["user"] = asyncio.ensure_future(_get(ctx, user_url))
+    await _wait_with_deadline(ctx, list(first_tasks.values()), deadline)
+
+    for task in first_tasks.values():
+        if not task.cancelled() and isinstance(task.exception(), GitHubRateLimitError):
+            raise task.exception()
+
+    if any(task.cancelled() for task in first_tasks.values()):
+        return _safe_empty(username)
+
+    try:
+        responses = {name: task.result() for name, task in first_tasks.items()}
+        if any(resp.status_code == 404 for resp in responses.values()):
+            raise GitHubUserNotFound("GitHub user not found")
+        for resp in responses.values():
+            resp.raise_for_status()
+
+        repos = responses["repos"].json()
+    except GitHubUserNotFound:
+        raise
+    except Exception:
+        return _safe_empty(username)
+
+    cutoff = _commits_cutoff()
+    snapshots = await asyncio.to_thread(load_snapshots, username) if incremental else {}
+
+    repo_details: list[tuple[dict[str, int], int]] = []
+    tasks: dict[asyncio.Task, dict[str, Any]] = {}
+    for repo in _analyzed_repos(repos):
+        owner = repo.get("owner", {}).get("login") or username
+        repo_name = repo.get("name")
+        if not repo_name:
+            continue
+        reused = reusable_details(snapshots.get(repo_name), repo, cutoff)
+        if reused is not None:
+            repo_details.append(reused)
+            continue
+        tasks[asyncio.ensure_future(_fetch_repo_details(ctx, owner, repo_name, cutoff))] = repo
+
+    await _wait_with_deadline(ctx, list(tasks), deadline)
+    fetched = [
+        (repo, task.result())
+        for task, repo in tasks.items()
+        if task.done() and not task.cancelled() and not task.exception()
+    ]
+    repo_details.extend(details for _, details in fetched)
+    await asyncio.to_thread(save_snapshots, username, fetched, cutoff)
+
+    return _build_metrics(username, repos, repo_details)
+
+
+async def _collect_graphql(ctx: _FetchContext, username: str) -> dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.github_deadline_seconds
+
+    async def send(body: dict[str, Any]) -> httpx.Response:
+        async with ctx.semaphore:
+            start = loop.time()
+            resp, waited = await github_request(
+                ctx.client,
+                "POST",
+                f"{settings.github_api_url}/graphql",
+                ctx.headers,
+                resource="graphql",
+                json=body,
+            )
+        ctx.record_wait(start, waited)
+        return resp
+
+    task = asyncio.ensure_future(fetch_repos_graphql(send, username, _commits_cutoff()))
+    await _wait_with_deadline(ctx, [task], deadline)
+    if task.cancelled():
+        return _safe_empty(username)
+
+    try:
+        repos, repo_details = task.result()
+    except (GitHubUserNotFound, GitHubRateLimitError):
+        raise
+    except Exception:
+        return _safe_empty(username)
+
+    return _build_metrics(username, repos, repo_details)
+
+
+async def _collect(
+    client: httpx.AsyncClient | None,
+    username: str,
+    refresh: str,
+    force_refresh: bool = False,
+) -> dict[str, Any]:
+    ctx = _FetchContext(
+        # Without an explicit client this runs on the I/O loop, where the pooled one lives
+        client=client or http_clients.async_client("github"),
+        semaphore=asyncio.Semaphore(max(1, settings.github_concurrency)),
+        headers=_build_headers(),
+        revalidate=force_refresh,
+    )
+    use_graphql = settings.github_backend == "graphql" and bool(settings.github_tokens)
+    if use_graphql:
+        return await _collect_graphql(ctx, username)
+    return await _collect_rest(ctx, username, incremental=refresh == "incremental")
+
+
+async def fetch_github_metrics_async(
+    github_url: str,
+    client: httpx.AsyncClient | None = None,
+    refresh: str = "full",
+    force_refresh: bool = False,
+) -> dict[str, Any]:
+    """Fetch GitHub metrics using the backend selected by ``GITHUB_BACKEND``.
+
+    ``rest`` issues the per-repo calls concurrently: at most
+    ``settings.github_concurrency`` requests are in flight at once and the
+    whole fetch is bounded by ``settings.github_deadline_seconds`` (plus any
+    time spent queued behind the rate limiter); repos whose calls have not
+    finished by then are left out of the aggregate.
+    ``graphql`` collects everything in one paginated query and needs a token,
+    so it falls back to REST when no GitHub token is configured. Without an
+    explicit ``client`` the pooled "github" client is used.
+
+    ``refresh="incremental"`` (REST only) skips the ``/users`` call and reuses
+    per-repo snapshots for repos whose ``pushed_at`` has not changed since the
+    last fetch, so an unchanged profile costs a single (usually 304) request.
+
+    Results are cached per username (see ``github_metrics_cache``). Full
+    fetches are served from the cache unless ``force_refresh`` is set, which
+    also revalidates every cached GitHub response; incremental ones always go
+    to GitHub. Either way a non-empty result
+    replaces the cached entry. Calls with an explicit ``client`` bypass the
+    cache entirely.
+
+    Concurrent fetches of the same profile (by lowercased username, with the
+    same ``refresh`` / ``force_refresh``) are coalesced: one of them goes to
+    GitHub and the others wait for and share its result.
+
+    Raises ``GitHubRateLimitError`` if every token stays exhausted for longer
+    than ``GITHUB_MAX_WAIT_SECONDS``.
+    """
+    username = _extract_username(github_url)
+    if client is not None:
+        return await _collect(client, username, refresh, force_refresh)
+
+    if refresh == "full" and not force_refresh:
+        cached = await asyncio.to_thread(metrics_cache.get, username)
+        if cached is not None:
+            return cached
+
+    # GitHub logins are case-insensitive
+    key = (username.lower(), refresh, force_refresh)
+    metrics, _ = await io_loop.run(
+        lambda: github_flight.do(key, lambda: _collect_and_cache(username, refresh, force_refresh))
+    )
+    return metrics
+
+
+async def _collect_and_cache(username: str, refresh: str, force_refresh: bool) -> dict[str, Any]:
+    metrics = await _collect(None, username, refresh, force_refresh)
+    # An empty aggregate may be a degraded fetch; never pin it in the cache
+    if metrics["total_public_repos"]:
+        await asyncio.to_thread(metrics_cache.set, username, metrics)
+    return metrics
+
+
+async def github_user_exists(github_url: str) -> bool | None:
+    """Whether the GitHub account behind ``github_url`` exists; ``None`` if GitHub
+    could not tell within ``GITHUB_DEADLINE_SECONDS`` (rate limit, network).
+
+    Cached metrics answer without a request; otherwise ``/users/{name}`` goes
+    through the response cache, so a repeat check is usually a 304.
+    """
+    username = _extract_username(github_url)
+    if await asyncio.to_thread(metrics_cache.get, username) is not None:
+        return True
+
+    async def _lookup() -> httpx.Response:
+        ctx = _FetchContext(
+            client=http_clients.async_client("github"),
+            semaphore=asyncio.Semaphore(1),
+            headers=_build_headers(),
+        )
+        return await _get(ctx, f"{settings.github_api_url}/users/{username}")
+
+    try:
+        resp = await asyncio.wait_for(io_loop.run(_lookup), settings.github_deadline_seconds)
+    except (asyncio.TimeoutError, GitHubRateLimitError, httpx.HTTPError):
+        return None
+    if resp.status_code == 404:
+        return False
+    return True if resp.status_code == 200 else None
+
+
+def fetch_github_metrics(
+    github_url: str,
+    refresh: str = "full",
+    force_refresh: bool = False,
+) -> dict[str, Any]:
+    """Synchronous entry point for callers outside the event loop."""
+    return run_sync(
+        lambda: fetch_github_metrics_async(github_url, refresh=refresh, force_refresh=force_refresh)
+    )
+
+
+def invalidate_github_metrics(github_url: str) -> None:
+    """Drop the cached metrics for the profile behind ``github_url``."""
+    metrics_cache.invalidate(_extract_username(github_url))
+
+
 if __name__ == "__main__":
     # Manual test only (requires network access)
     sample = fetch_github_metrics("https://github.com/octocat")
@@ -0,0 +1,98 @@
+"""Per-repo snapshots backing the incremental GitHub metrics refresh.
+
+A snapshot records a repo's ``pushed_at``, language bytes and 90-day commit
+count as of the last fetch. While ``pushed_at`` is unchanged the repo has no
+new commits, so an incremental refresh can reuse the snapshot instead of
+re-querying ``/languages`` and ``/commits``. Snapshots older than
+``GITHUB_SNAPSHOT_MAX_AGE_HOURS`` are re-queried anyway, which bounds how
+stale the sliding 90-day window can get for repos nobody pushes to.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.github_snapshot import GitHubRepoSnapshot
+
+
+def _key(username: str) -> str:
+    # GitHub logins are case-insensitive; same key as the metrics cache
+    return username.lower()
+
+
+def load_snapshots(username: str) -> dict[str, dict[str, Any]]:
+    db = SessionLocal()
+    try:
+        rows = db.query(GitHubRepoSnapshot).filter(GitHubRepoSnapshot.username == _key(username)).all()
+        return {
+            row.repo_name: {
+                "pushed_at": row.pushed_at,
+                "language_bytes": json.loads(row.language_bytes_json or "{}"),
+                "commit_count": row.commit_count,
+                "window_start": row.window_start,
+                "fetched_at": row.fetched_at,
+            }
+            for row in rows
+        }
+    finally:
+        db.close()
+
+
+def save_snapshots(
+    username: str,
+    repos: list[tuple[dict[str, Any], tuple[dict[str, int], int]]],
+    window_start: datetime,
+) -> None:
+    """Upsert ``(repo, (language_bytes, commit_count))`` pairs for ``username``."""
+    if not repos:
+        return
+    username = _key(username)
+    db = SessionLocal()
+    try:
+        existing = {
+            row.repo_name: row
+            for row in db.query(GitHubRepoSnapshot).filter(GitHubRepoSnapshot.username == username)
+        }
+        now = datetime.utcnow()
+        for repo, (language_bytes, commit_count) in repos:
+            name = repo.get("name")
+            row = existing.get(name) or GitHubRepoSnapshot(username=username, repo_name=name)
+            row.pushed_at = repo.get("pushed_at")
+            row.language_bytes_json = json.dumps(language_bytes)
+            row.commit_count = commit_count
+            row.window_start = window_start.replace(tzinfo=None)
+            row.fetched_at = now
+            db.add(row)
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent refresh of the same user saved these repos first
+            db.rollback()
+    finally:
+        db.close()
+
+
+def reusable_details(
+    snapshot: dict[str, Any] | None,
+    repo: dict[str, Any],
+    window_start: datetime,
+) -> tuple[dict[str, int], int] | None:
+    """Snapshot details for ``repo`` if nothing was pushed since, else ``None``."""
+    if snapshot is None or snapshot["pushed_at"] != repo.get("pushed_at"):
+        return None
+    max_age = timedelta(hours=settings.github_snapshot_max_age_hours)
+    if datetime.utcnow() - snapshot["fetched_at"] > max_age:
+        return None
+
+    commit_count = snapshot["commit_count"]
+    pushed_at = repo.get("pushed_at") or ""
+    if pushed_at < window_start.strftime("%Y-%m-%dT%H:%M:%SZ"):
+        # Last push is older than the window: every commit has aged out
+        commit_count = 0
+    return snapshot["language_bytes"], commit_count
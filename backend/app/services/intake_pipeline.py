@@ -0,0 +1,297 @@
+"""The intake pipeline, run by a queue worker for each new application.
+
+``POST /applications`` stores the form fields and queues an ``intake`` job;
+this module fills in everything else: GitHub metrics, the parsed resume,
+scores, the LLM analyses and the agentic verification. The steps are
+stages of a ``StageGraph``::
+
+    github ─┐
+            ├─ scores ── llm_analysis ─┬─ save
+    resume ─┘                          └─ verification
+
+so the GitHub fetch overlaps the PDF parse and the crew run overlaps the
+save. Each stage shows up in ``GET /jobs/{id}`` and is checkpointed, so a
+retried job only repeats the stage that failed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from app.database import SessionLocal
+from app.models.application import Application
+from app.models.job import Job
+from app.services.auto_verification import apply_crew_result, crew_inputs, defer_verification, run_crew
+from app.services.github_graphql import GitHubUserNotFound
+from app.services.github_service import fetch_github_metrics_async
+from app.services.job_queue import PermanentJobError, StageTracker
+from app.services.llm_budget import token_budget
+from app.services.llm_service import (
+    generate_profile_analysis_async,
+    generate_resume_ats_async,
+    llm_breaker,
+)
+from app.services.resume_service import parse_resume_pdf
+from app.services.scoring_service import compute_scores
+from app.services.stage_checkpoints import StageCheckpoints
+from app.services.stage_graph import StageGraph
+
+
+def _json_field(raw: str | None):
+    try:
+        return json.loads(raw) if raw else None
+    except Exception:
+        return None
+
+
+def _fallback_report(candidate: dict, score_result: dict, github_metrics: dict) -> dict:
+    master = score_result.get("master_score") or 0
+    band = score_result.get("confidence_band") or "Unknown"
+    learning_gaps = score_result.get("learning_gaps", [])
+    return {
+        "summary": (
+            f"{candidate['full_name']} scored {master}/100 ({band} confidence) for the "
+            f"{candidate['role_applied']} role. Their GitHub profile shows {github_metrics.get('total_public_repos', 0)} "
+            f"public repos with {github_metrics.get('commits_last_90_days', 0)} commits in the last 90 days."
+        ),
+        "strengths": [
+            f"Active GitHub presence with {github_metrics.get('total_public_repos', 0)} repositories",
+        ],
+        "weaknesses": learning_gaps[:3] if learning_gaps else ["No major weaknesses identified"],
+        "risks": [],
+        "growth_direction": f"Focus on strengthening {candidate['role_applied']} specific skills.",
+    }
+
+
+async def _fetch_github(github_url: str, force_refresh: bool) -> dict:
+    try:
+        return await fetch_github_metrics_async(github_url, force_refresh=force_refresh)
+    except GitHubUserNotFound as exc:
+        raise PermanentJobError(str(exc)) from exc
+
+
+def _parse_resume(resume_pdf: bytes) -> dict | None:
+    try:
+        return parse_resume_pdf(resume_pdf)
+    except Exception:
+        return None
+
+
+def _score(github_metrics: dict, resume_data: dict | None, role_applied: str) -> dict:
+    return compute_scores(github_metrics, resume_data=resume_data, role_applied=role_applied)
+
+
+async def _llm_analysis(
+    candidate: dict,
+    github_metrics: dict,
+    resume_data: dict | None,
+    score_result: dict,
+    force_refresh: bool,
+    ats: bool,
+) -> dict:
+    full_name = candidate["full_name"]
+    role_applied = candidate["role_applied"]
+    resume_text = resume_data.get("raw_text", "") if resume_data else ""
+
+    def _profile_analysis(resume: dict | None, scores: dict):
+        return asyncio.create_task(generate_profile_analysis_async(
+            candidate_name=full_name,
+            role_applied=role_applied,
+            github_metrics=github_metrics,
+            score_breakdown=scores.get("score_breakdown", {}),
+            learning_gaps=scores.get("learning_gaps", []),
+            resume_data=resume,
+            education=candidate["education"],
+            experience=candidate["experience"],
+            professional=candidate["professional"],
+            use_cache=not force_refresh,
+        ))
+
+    # LLM profile analysis runs alongside the ATS call, speculatively on
+    # the deterministic keywords (a copy: the ATS merge below replaces them)
+    profile_task = _profile_analysis(dict(resume_data) if resume_data else None, score_result)
+
+    # LLM ATS analysis of resume (if we have text and budget for it)
+    llm_resume = None
+    if resume_text and ats:
+        llm_resume = await generate_resume_ats_async(
+            resume_text, role_applied, full_name, use_cache=not force_refresh
+        )
+        # Merge LLM keywords into resume_data
+        if llm_resume and resume_data:
+            resume_data = dict(resume_data)
+            llm_kw = llm_resume.get("keywords_detected", [])
+            existing_kw = set(resume_data.get("keywords_detected", []))
+            for kw in llm_kw:
+                existing_kw.add(str(kw).lower().strip())
+            resume_data["keywords_detected"] = sorted(existing_kw)
+            # Use better ATS score if LLM provides one
+            llm_ats = llm_resume.get("ats_score", 0)
+            if llm_ats > 0:
+                resume_data["ats_score"] = max(
+                    resume_data.get("ats_score", 0),
+                    float(llm_ats),
+                )
+
+            merged_result = compute_scores(
+                github_metrics,
+                resume_data=resume_data,
+                role_applied=role_applied,
+            )
+            # The speculative analysis stands unless the merged keywords
+            # move the candidate into another confidence band
+            if merged_result.get("confidence_band") != score_result.get("confidence_band"):
+                profile_task.cancel()
+                profile_task = _profile_analysis(resume_data, merged_result)
+            score_result = merged_result
+
+    return {
+        "resume_data": resume_data,
+        "llm_resume": llm_resume,
+        "score_result": score_result,
+        "llm_profile": await profile_task,
+    }
+
+
+def _save_analysis(application_id: int, candidate: dict, github_metrics: dict, analysis: dict) -> None:
+    resume_data = analysis["resume_data"]
+    llm_resume = analysis["llm_resume"]
+    score_result = analysis["score_result"]
+
+    db = SessionLocal()
+    try:
+        db_obj = db.get(Application, application_id)
+        db_obj.master_score = score_result.get("master_score")
+        db_obj.confidence_band = score_result.get("confidence_band")
+        db_obj.github_metrics_json = json.dumps(github_metrics)
+        db_obj.score_breakdown_json = json.dumps(score_result.get("score_breakdown", {}))
+        db_obj.learning_gaps_json = json.dumps(score_result.get("learning_gaps", []))
+
+        if resume_data:
+            # Store resume analysis (without raw_text to save space)
+            analysis_to_store = {k: v for k, v in resume_data.items() if k != "raw_text"}
+            if llm_resume:
+                analysis_to_store["missing_keywords"] = llm_resume.get("missing_keywords", [])
+                analysis_to_store["suggestions"] = llm_resume.get("suggestions", [])
+            db_obj.resume_analysis_json = json.dumps(analysis_to_store)
+
+        db_obj.background_report_json = json.dumps(
+            analysis["llm_profile"] or _fallback_report(candidate, score_result, github_metrics)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _verify(application_id: int, candidate: dict, analysis: dict, api_key: str) -> dict | None:
+    inputs = crew_inputs(
+        candidate["github_url"], candidate["role_applied"], candidate["full_name"], analysis["resume_data"],
+    )
+    try:
+        return run_crew(inputs, api_key, application_id)
+    except ImportError as exc:
+        print(f"Auto-verification skipped: {exc}")
+        return None
+
+
+def _intake_graph(api_key: str | None) -> StageGraph:
+    graph = StageGraph("intake")
+    graph.add("github", _fetch_github, ("github_url", "force_refresh"), kind="io")
+    graph.add("resume", _parse_resume, ("resume_pdf",), kind="cpu", when=lambda pdf: bool(pdf))
+    graph.add("scores", _score, ("github", "resume", "role_applied"), kind="cpu")
+    graph.add(
+        "llm_analysis",
+        _llm_analysis,
+        ("candidate", "github", "resume", "scores", "force_refresh", "ats"),
+        kind="io",
+    )
+    graph.add("save", _save_analysis, ("application_id", "candidate", "github", "llm_analysis"), kind="thread")
+    # A crew failure fails the job, whose retry resumes here
+    graph.add(
+        "verification",
+        lambda application_id, candidate, analysis, verify: _verify(application_id, candidate, analysis, api_key),
+        ("application_id", "candidate", "llm_analysis", "verify"),
+        kind="thread",
+        when=lambda application_id, candidate, analysis, verify: verify,
+    )
+    return graph
+
+
+async def run_intake(
+    application_id: int,
+    resume_pdf: bytes | None,
+    force_refresh: bool,
+    tracker: StageTracker,
+) -> None:
+    """Analyse a stored application; raises if a stage fails so the job is retried.
+
+    Stage outputs are checkpointed when ``tracker`` has checkpoints, so a
+    retry resumes at the stage that failed.
+    """
+    db = SessionLocal()
+    try:
+        db_obj = db.get(Application, application_id)
+        if db_obj is None:
+            raise PermanentJobError(f"Application {application_id} no longer exists")
+        candidate = {
+            "full_name": db_obj.full_name,
+            "role_applied": db_obj.role_applied,
+            "github_url": db_obj.github_url,
+            # Parse education / experience for LLM context
+            "education": _json_field(db_obj.education_json),
+            "experience": _json_field(db_obj.experience_json),
+            "professional": _json_field(db_obj.professional_json),
+        }
+    finally:
+        db.close()
+
+    # Auto-trigger agentic verification if LLM key is configured; while the
+    # provider is known to be down (open circuit breaker) or past the token
+    # budget's soft limit it is queued for later instead
+    from app.services.llm_service import _get_api_key
+    api_key = _get_api_key()
+    verify = False
+    if api_key:
+        if llm_breaker.state == "open":
+            defer_verification(application_id, "circuit open")
+        else:
+            verify = token_budget.allows("auto_verification")
+            if not verify:
+                defer_verification(application_id, f"token budget {token_budget.level()}")
+
+    results = await _intake_graph(api_key).run(
+        tracker,
+        {
+            "application_id": application_id,
+            "candidate": candidate,
+            "github_url": candidate["github_url"],
+            "role_applied": candidate["role_applied"],
+            "resume_pdf": resume_pdf,
+            "force_refresh": force_refresh,
+            "ats": token_budget.allows("resume_ats"),
+            "verify": verify,
+        },
+        application_id=application_id,
+    )
+
+    if results["verification"] is not None:
+        db = SessionLocal()
+        try:
+            apply_crew_result(db, db.get(Application, application_id), results["verification"])
+        finally:
+            db.close()
+
+    if tracker.checkpoints is not None:
+        tracker.checkpoints.clear()
+
+
+async def run_intake_job(job: Job, tracker: StageTracker) -> None:
+    payload = json.loads(job.payload_json or "{}")
+    tracker.checkpoints = StageCheckpoints(job.application_id, "intake")
+    await run_intake(
+        job.application_id,
+        job.input_blob,
+        bool(payload.get("force_refresh")),
+        tracker,
+    )
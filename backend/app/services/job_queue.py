@@ -0,0 +1,337 @@
+"""Durable job queue on the application database.
+
+Jobs live in the ``jobs`` table, so the queue needs no broker and works on
+both SQLite and Postgres. Workers claim a job with a compare-and-set update
+and hold it under a lease that a heartbeat renews while the job runs; a job
+whose worker died is picked up again once its lease has expired. Updates
+from a worker are fenced on ``locked_by``, so one that lost its lease cannot
+overwrite the job after another worker has taken it over. A failed
+attempt is retried with exponential backoff until ``max_attempts``.
+
+Each job records the stages it has been through, with their status and
+timings, for ``GET /jobs/{id}``; with checkpoints, a retried job reports
+the stages it could skip as ``reused``.
+"""
+
+from __future__ import annotations
+
+import inspect
+import json
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterator
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.job import Job
+from app.services.stage_checkpoints import StageCheckpoints, fingerprint
+
+
+class PermanentJobError(Exception):
+    """Raised by a job handler when retrying cannot help; the job fails at once."""
+
+
+def _claimable(now: datetime):
+    return or_(
+        and_(Job.status == "queued", Job.run_after <= now),
+        and_(Job.status == "running", Job.lease_expires_at < now),
+    )
+
+
+def enqueue(
+    kind: str,
+    payload: dict[str, Any],
+    application_id: int | None = None,
+    input_blob: bytes | None = None,
+    max_attempts: int | None = None,
+    db: Session | None = None,
+) -> str:
+    """Queue a job and return its id.
+
+    With ``db`` the job is only added to that session, so it is committed
+    (or rolled back) together with the caller's own writes.
+    """
+    job = Job(
+        id=uuid.uuid4().hex,
+        kind=kind,
+        application_id=application_id,
+        payload_json=json.dumps(payload),
+        input_blob=input_blob,
+        max_attempts=max_attempts or settings.job_max_attempts,
+    )
+    if db is not None:
+        db.add(job)
+        return job.id
+    db = SessionLocal()
+    try:
+        db.add(job)
+        db.commit()
+        return job.id
+    finally:
+        db.close()
+
+
+def claim(worker_id: str, kinds: list[str] | None = None) -> Job | None:
+    """Take the oldest runnable job (or one whose lease expired), if any."""
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        candidates = db.query(Job.id).filter(_claimable(now))
+        if kinds:
+            candidates = candidates.filter(Job.kind.in_(kinds))
+        for (job_id,) in candidates.order_by(Job.created_at).limit(5).all():
+            claimed = db.query(Job).filter(Job.id == job_id, _claimable(now)).update(
+                {
+                    Job.status: "running",
+                    Job.locked_by: worker_id,
+                    Job.lease_expires_at: _lease_expiry(),
+                    Job.attempts: Job.attempts + 1,
+                },
+                synchronize_session=False,
+            )
+            db.commit()
+            if claimed:
+                job = db.get(Job, job_id)
+                db.expunge(job)
+                return job
+        return None
+    finally:
+        db.close()
+
+
+def _update(job_id: str, worker_id: str | None = None, **fields: Any) -> bool:
+    """Update a job; with ``worker_id`` only while that worker still holds it."""
+    db = SessionLocal()
+    try:
+        query = db.query(Job).filter(Job.id == job_id)
+        if worker_id is not None:
+            query = query.filter(Job.locked_by == worker_id)
+        updated = query.update(fields, synchronize_session=False)
+        db.commit()
+        return bool(updated)
+    finally:
+        db.close()
+
+
+def _lease_expiry() -> datetime:
+    return datetime.utcnow() + timedelta(seconds=settings.job_lease_seconds)
+
+
+def renew_lease(job: Job) -> bool:
+    """Extend the lease of a claimed job; False if its worker no longer holds it."""
+    return _update(job.id, job.locked_by, lease_expires_at=_lease_expiry())
+
+
+@contextmanager
+def heartbeat(job: Job, interval: float | None = None) -> Iterator[None]:
+    """Renew the job's lease in the background while the block runs.
+
+    Stages such as verification can outlast the lease, so it cannot only be
+    extended when a stage starts or finishes.
+    """
+    stop = threading.Event()
+    interval = interval or settings.job_lease_seconds / 3
+
+    def beat() -> None:
+        while not stop.wait(interval):
+            try:
+                if not renew_lease(job):
+                    print(f"Job {job.id} lease lost by {job.locked_by}; another worker took it over")
+                    return
+            except Exception as exc:
+                print(f"Job {job.id} lease renewal failed: {exc!r}")
+
+    thread = threading.Thread(target=beat, name=f"job-lease-{job.id[:8]}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def complete(job: Job) -> bool:
+    """Mark a job succeeded; False if its worker had lost the lease."""
+    return _update(
+        job.id, job.locked_by,
+        status="succeeded", stage=None, error=None, locked_by=None, finished_at=datetime.utcnow(),
+    )
+
+
+def fail(job: Job, error: str, retry: bool = True, retry_after: float | None = None) -> bool:
+    """Record a failed attempt; requeue it unless attempts are used up.
+
+    Returns whether the job will be retried. Nothing is recorded if the
+    worker had lost the lease: the job belongs to whoever took it over.
+    """
+    if not retry or job.attempts >= job.max_attempts:
+        _update(job.id, job.locked_by, status="failed", error=error, locked_by=None, finished_at=datetime.utcnow())
+        return False
+    delay = retry_after if retry_after is not None else settings.job_retry_base_seconds * 2 ** (job.attempts - 1)
+    return _update(
+        job.id,
+        job.locked_by,
+        status="queued",
+        error=error,
+        locked_by=None,
+        run_after=datetime.utcnow() + timedelta(seconds=delay),
+    )
+
+
+def get_job(job_id: str) -> dict[str, Any] | None:
+    db = SessionLocal()
+    try:
+        job = db.get(Job, job_id)
+        return job_view(job) if job else None
+    finally:
+        db.close()
+
+
+def job_view(job: Job) -> dict[str, Any]:
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "application_id": job.application_id,
+        "status": job.status,
+        "stage": job.stage,
+        "stages": json.loads(job.stages_json or "[]"),
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "error": job.error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "finished_at": job.finished_at,
+    }
+
+
+class StageTracker:
+    """Records stage progress on a job row and extends its lease.
+
+    Without a job id it only keeps the stages in memory, for pipelines run
+    inside a request. With ``worker_id`` the row is only written while that
+    worker holds the job.
+    """
+
+    def __init__(
+        self,
+        job_id: str | None,
+        checkpoints: StageCheckpoints | None = None,
+        worker_id: str | None = None,
+    ) -> None:
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.checkpoints = checkpoints
+        self.stages: list[dict[str, Any]] = []
+        if job_id:
+            db = SessionLocal()
+            try:
+                job = db.get(Job, job_id)
+                # Keep the history of earlier attempts
+                self.stages = json.loads(job.stages_json or "[]") if job else []
+            finally:
+                db.close()
+            for entry in self.stages:
+                if entry["status"] == "running":
+                    entry["status"] = "interrupted"
+
+    def _save(self) -> None:
+        if not self.job_id:
+            return
+        # Stages can run concurrently; report all the running ones
+        running = [entry["name"] for entry in self.stages if entry["status"] == "running"]
+        _update(
+            self.job_id,
+            self.worker_id,
+            stage=", ".join(running) or None,
+            stages_json=json.dumps(self.stages),
+            lease_expires_at=_lease_expiry(),
+        )
+
+    def start(self, name: str) -> dict[str, Any]:
+        entry = {"name": name, "status": "running", "started_at": datetime.utcnow().isoformat()}
+        self.stages.append(entry)
+        self._save()
+        return entry
+
+    def finish(self, entry: dict[str, Any], status: str = "succeeded", error: str | None = None) -> None:
+        finished = datetime.utcnow()
+        entry["status"] = status
+        entry["finished_at"] = finished.isoformat()
+        entry["duration_ms"] = round(
+            (finished - datetime.fromisoformat(entry["started_at"])).total_seconds() * 1000, 1
+        )
+        if error:
+            entry["error"] = error
+        self._save()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[dict[str, Any]]:
+        entry = self.start(name)
+        try:
+            yield entry
+        except BaseException as exc:
+            self.finish(entry, "failed", str(exc) or type(exc).__name__)
+            raise
+        self.finish(entry)
+
+    def _reuse(self, name: str, fp: str) -> tuple[bool, Any]:
+        if self.checkpoints is None:
+            return False, None
+        hit, output = self.checkpoints.load(name, fp)
+        if hit:
+            now = datetime.utcnow().isoformat()
+            self.stages.append({
+                "name": name, "status": "reused", "started_at": now, "finished_at": now, "duration_ms": 0.0,
+            })
+            self._save()
+        return hit, output
+
+    def _keep(self, name: str, fp: str, output: Any, entry: dict[str, Any]) -> None:
+        if self.checkpoints is not None:
+            self.checkpoints.save(name, fp, output, entry.get("duration_ms"))
+
+    async def run(self, name: str, inputs: Any, compute: Callable[[], Any]) -> Any:
+        """Run stage ``name``, or return its checkpointed output for the same inputs.
+
+        ``compute`` may return a value or an awaitable; its result must be
+        JSON-serialisable.
+        """
+        fp = fingerprint(inputs)
+        hit, output = self._reuse(name, fp)
+        if hit:
+            return output
+        with self.stage(name) as entry:
+            output = compute()
+            if inspect.isawaitable(output):
+                output = await output
+        self._keep(name, fp, output, entry)
+        return output
+
+    def run_blocking(self, name: str, inputs: Any, compute: Callable[[], Any]) -> Any:
+        """``run`` for synchronous callers and ``compute`` functions."""
+        fp = fingerprint(inputs)
+        hit, output = self._reuse(name, fp)
+        if hit:
+            return output
+        with self.stage(name) as entry:
+            output = compute()
+        self._keep(name, fp, output, entry)
+        return output
+
+
+def queue_stats() -> dict[str, Any]:
+    db = SessionLocal()
+    try:
+        rows = db.query(Job.kind, Job.status).all()
+    finally:
+        db.close()
+    counts: dict[str, dict[str, int]] = {}
+    for kind, status in rows:
+        counts.setdefault(kind, {}).setdefault(status, 0)
+        counts[kind][status] += 1
+    return counts
@@ -0,0 +1,90 @@
+"""Worker pool that runs queued jobs.
+
+Each worker is a thread that claims one job at a time and runs its handler
+on a private event loop; outbound HTTP still goes through the shared I/O
+loop. The API process starts ``JOB_INPROCESS_WORKERS`` of them; ``worker.py``
+runs a pool on its own, so intake can scale apart from the web workers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import threading
+from typing import Awaitable, Callable
+
+from app.core.config import settings
+from app.models.job import Job
+from app.services import job_queue
+from app.services.github_ratelimit import GitHubRateLimitError
+from app.services.intake_pipeline import run_intake_job
+
+Handler = Callable[[Job, job_queue.StageTracker], Awaitable[None]]
+
+HANDLERS: dict[str, Handler] = {
+    "intake": run_intake_job,
+}
+
+
+def run_job(job: Job) -> None:
+    """Run one claimed job and record how it ended."""
+    handler = HANDLERS.get(job.kind)
+    if handler is None:
+        job_queue.fail(job, f"Unknown job kind {job.kind!r}", retry=False)
+        return
+    tracker = job_queue.StageTracker(job.id, worker_id=job.locked_by)
+    try:
+        with job_queue.heartbeat(job):
+            asyncio.run(handler(job, tracker))
+    except GitHubRateLimitError as exc:
+        job_queue.fail(job, "GitHub rate limit exhausted", retry_after=exc.retry_after + 1)
+    except job_queue.PermanentJobError as exc:
+        job_queue.fail(job, str(exc), retry=False)
+    except Exception as exc:
+        retried = job_queue.fail(job, f"{type(exc).__name__}: {exc}")
+        print(f"Job {job.id} ({job.kind}) failed on attempt {job.attempts}: {exc!r}"
+              f"{', will retry' if retried else ''}")
+    else:
+        if not job_queue.complete(job):
+            print(f"Job {job.id} ({job.kind}) finished after its lease was taken over; result not recorded")
+
+
+class WorkerPool:
+    def __init__(self, concurrency: int, poll_seconds: float) -> None:
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+    def start(self) -> None:
+        self._stop.clear()
+        for n in range(self.concurrency):
+            thread = threading.Thread(
+                target=self._run, args=(f"{self._prefix}:{n}",), name=f"job-worker-{n}", daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop claiming jobs and wait for the running ones to finish."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self, worker_id: str) -> None:
+        while not self._stop.is_set():
+            try:
+                job = job_queue.claim(worker_id, list(HANDLERS))
+            except Exception as exc:
+                print(f"Job claim failed: {exc!r}")
+                job = None
+            if job is None:
+                self._stop.wait(self.poll_seconds)
+                continue
+            run_job(job)
+
+
+worker_pool = WorkerPool(settings.job_inprocess_workers, settings.job_poll_seconds)
@@ -0,0 +1,156 @@
+"""LLM token budget governor.
+
+Every completed LLM call adds its ``usage`` tokens to a per-hour row shared
+by all workers. Spend is compared with ``LLM_HOURLY_TOKEN_BUDGET`` and
+``LLM_DAILY_TOKEN_BUDGET`` (UTC day); the worse of the two sets the level:
+
+* ``ok``: everything runs;
+* ``soft`` (``LLM_BUDGET_SOFT_RATIO`` of a limit used): intake skips the ATS
+  LLM call and queues auto-verification instead of running the crew;
+* ``hard`` (a limit used up): no LLM calls at all, so profile analysis and
+  plans take their deterministic paths.
+
+A limit of 0 is unlimited. Totals are re-read from the database at most
+every ``refresh_seconds``, so the level can lag a burst by that long.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.llm_budget import LLMTokenSpend
+
+LEVELS = ("ok", "soft", "hard")
+
+# The budget level at which each feature stops using the LLM
+FEATURE_CUTOFFS = {
+    "resume_ats": "soft",
+    "auto_verification": "soft",
+    "llm": "hard",
+}
+
+
+def _hour(now: datetime) -> datetime:
+    return now.replace(minute=0, second=0, microsecond=0)
+
+
+class TokenBudget:
+    def __init__(
+        self,
+        hourly_limit: int,
+        daily_limit: int,
+        soft_ratio: float,
+        refresh_seconds: float = 5.0,
+    ) -> None:
+        self.hourly_limit = hourly_limit
+        self.daily_limit = daily_limit
+        self.soft_ratio = soft_ratio
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._usage: dict[str, int] | None = None
+        self._read_at = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.hourly_limit > 0 or self.daily_limit > 0
+
+    def record(self, prompt_tokens: int, completion_tokens: int) -> None:
+        """Add one call's tokens to the current hour."""
+        if not self.enabled:
+            return
+        hour = _hour(datetime.utcnow())
+        values = {
+            LLMTokenSpend.prompt_tokens: LLMTokenSpend.prompt_tokens + prompt_tokens,
+            LLMTokenSpend.completion_tokens: LLMTokenSpend.completion_tokens + completion_tokens,
+            LLMTokenSpend.calls: LLMTokenSpend.calls + 1,
+        }
+        db = SessionLocal()
+        try:
+            updated = db.query(LLMTokenSpend).filter(LLMTokenSpend.hour == hour).update(values)
+            if not updated:
+                db.add(LLMTokenSpend(
+                    hour=hour, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, calls=1,
+                ))
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another worker opened this hour's row first
+                db.rollback()
+                db.query(LLMTokenSpend).filter(LLMTokenSpend.hour == hour).update(values)
+                db.commit()
+        finally:
+            db.close()
+
+        with self._lock:
+            if self._usage is not None:
+                self._usage["hour"] += prompt_tokens + completion_tokens
+                self._usage["day"] += prompt_tokens + completion_tokens
+
+    def usage(self) -> dict[str, int]:
+        """Tokens spent this UTC hour and day."""
+        with self._lock:
+            if self._usage is not None and time.monotonic() - self._read_at < self.refresh_seconds:
+                return dict(self._usage)
+
+        now = datetime.utcnow()
+        total = LLMTokenSpend.prompt_tokens + LLMTokenSpend.completion_tokens
+        db = SessionLocal()
+        try:
+            hour = db.query(func.sum(total)).filter(LLMTokenSpend.hour == _hour(now)).scalar() or 0
+            day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            day = db.query(func.sum(total)).filter(LLMTokenSpend.hour >= day_start).scalar() or 0
+        finally:
+            db.close()
+
+        with self._lock:
+            self._usage = {"hour": int(hour), "day": int(day)}
+            self._read_at = time.monotonic()
+            return dict(self._usage)
+
+    def level(self) -> str:
+        if not self.enabled:
+            return "ok"
+        usage = self.usage()
+        ratio = max(
+            usage["hour"] / self.hourly_limit if self.hourly_limit else 0.0,
+            usage["day"] / self.daily_limit if self.daily_limit else 0.0,
+        )
+        if ratio >= 1:
+            return "hard"
+        if ratio >= self.soft_ratio:
+            return "soft"
+        return "ok"
+
+    def allows(self, feature: str) -> bool:
+        """Whether ``feature`` (a ``FEATURE_CUTOFFS`` key) may use the LLM now."""
+        return LEVELS.index(self.level()) < LEVELS.index(FEATURE_CUTOFFS[feature])
+
+    def stats(self) -> dict[str, Any]:
+        level = self.level()
+        usage = self.usage() if self.enabled else {"hour": 0, "day": 0}
+        return {
+            "enabled": self.enabled,
+            "level": level,
+            "soft_ratio": self.soft_ratio,
+            "hour": {"used": usage["hour"], "limit": self.hourly_limit},
+            "day": {"used": usage["day"], "limit": self.daily_limit},
+            "features": {
+                feature: LEVELS.index(level) < LEVELS.index(cutoff)
+                for feature, cutoff in FEATURE_CUTOFFS.items()
+            },
+        }
+
+
+token_budget = TokenBudget(
+    hourly_limit=settings.llm_hourly_token_budget,
+    daily_limit=settings.llm_daily_token_budget,
+    soft_ratio=settings.llm_budget_soft_ratio,
+)
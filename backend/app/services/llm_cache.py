@@ -0,0 +1,146 @@
+"""Content-addressed cache of parsed LLM completions.
+
+The key is a SHA-256 over everything that determines the completion: model,
+messages, max_tokens and temperature. Reprocessing a candidate with
+unchanged inputs (a repeated ``/generate-plan`` click, a re-run intake)
+therefore returns the stored reply instead of paying for a new one. The
+memory tier is a per-worker LRU; the database tier is shared, expires rows
+after ``LLM_CACHE_TTL_SECONDS`` and keeps at most ``LLM_CACHE_MAX_ROWS``,
+evicting the least recently used.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.llm_cache import LLMResponseCache
+
+
+def cache_key(payload: dict[str, Any]) -> str:
+    material = {k: payload.get(k) for k in ("model", "messages", "max_tokens", "temperature")}
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+
+
+class LLMCache:
+    _PURGE_EVERY = 50
+
+    def __init__(self, ttl_seconds: float, memory_entries: int, max_rows: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        self.memory = TTLCache(memory_entries, ttl_seconds)
+        self._lock = threading.Lock()
+        self._stores = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, key: str) -> dict | None:
+        cached = self.memory.get(key)
+        if cached is not None:
+            return json.loads(cached)
+
+        db = SessionLocal()
+        try:
+            row = db.get(LLMResponseCache, key)
+            now = datetime.utcnow()
+            age = (now - row.created_at).total_seconds() if row else 0.0
+            if row is None or age >= self.ttl_seconds:
+                payload = None
+            else:
+                payload = row.response_json
+                row.last_used_at = now
+                db.commit()
+        finally:
+            db.close()
+
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+            else:
+                self.db_hits += 1
+        if payload is None:
+            return None
+        self.memory.set(key, payload, self.ttl_seconds - age)
+        return json.loads(payload)
+
+    def set(self, key: str, model: str, response: dict) -> None:
+        payload = json.dumps(response)
+        self.memory.set(key, payload)
+
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            row = db.get(LLMResponseCache, key) or LLMResponseCache(key=key)
+            row.model = model
+            row.response_json = payload
+            row.created_at = now
+            row.last_used_at = now
+            db.add(row)
+            try:
+                db.commit()
+            except IntegrityError:
+                # A concurrent call with the same inputs stored it first
+                db.rollback()
+                return
+
+            with self._lock:
+                self._stores += 1
+                purge = self._stores % self._PURGE_EVERY == 0
+            if purge:
+                self._purge(db)
+        finally:
+            db.close()
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self.bypassed += 1
+
+    def _purge(self, db) -> None:
+        """Drop expired rows, then the least recently used beyond ``max_rows``."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+        db.query(LLMResponseCache).filter(
+            LLMResponseCache.created_at < cutoff
+        ).delete(synchronize_session=False)
+
+        overflow = db.query(LLMResponseCache.key).order_by(
+            LLMResponseCache.last_used_at.desc()
+        ).offset(self.max_rows)
+        db.query(LLMResponseCache).filter(
+            LLMResponseCache.key.in_(overflow.scalar_subquery())
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    def stats(self) -> dict[str, Any]:
+        memory = self.memory.stats()
+        with self._lock:
+            db_hits, misses, bypassed = self.db_hits, self.misses, self.bypassed
+        total = memory["hits"] + db_hits + misses
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl_seconds,
+            "memory": memory,
+            "db_hits": db_hits,
+            "misses": misses,
+            "bypassed": bypassed,
+            "hit_rate": round((memory["hits"] + db_hits) / total, 4) if total else 0.0,
+        }
+
+
+llm_cache = LLMCache(
+    ttl_seconds=settings.llm_cache_ttl_seconds,
+    memory_entries=settings.llm_cache_memory_entries,
+    max_rows=settings.llm_cache_max_rows,
+)
@@ -0,0 +1,182 @@
+"""Per-call instrumentation of LLM requests.
+
+Every logical LLM call (including retries) is recorded under its call site
+(``resume_ats``, ``profile_analysis``, ``training_plan``, ``modify_plan``,
+``modify_plan_patch``, ``crew_agent``) and model with its latency, outcome,
+last HTTP status, prompt / completion tokens and JSON-parse failures. Cumulative
+counters and latency histograms are rendered in the Prometheus text format;
+a rolling window of recent calls backs the JSON summary.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+
+@dataclass
+class CallRecord:
+    call: str
+    model: str = ""
+    started: float = field(default_factory=time.perf_counter)
+    json_failures: int = 0
+    finished: bool = False
+
+
+@dataclass
+class _Histogram:
+    buckets: list[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    count: int = 0
+    total: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def _labels(**labels: Any) -> str:
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}"
+
+
+class LLMCallMetrics:
+    def __init__(self, window_seconds: float = 300.0, window_size: int = 2000) -> None:
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._calls: Counter[tuple[str, str, str]] = Counter()
+        self._statuses: Counter[tuple[str, int]] = Counter()
+        self._tokens: Counter[tuple[str, str]] = Counter()
+        self._json_failures: Counter[str] = Counter()
+        self._latency: defaultdict[tuple[str, str, str], _Histogram] = defaultdict(_Histogram)
+        # (finished_at, call, outcome, latency, prompt_tokens, completion_tokens, model)
+        self._recent: deque[tuple[float, str, str, float, int, int, str]] = deque(maxlen=window_size)
+
+    def start(self, call: str, model: str = "") -> CallRecord:
+        return CallRecord(call, model)
+
+    def finish(
+        self,
+        record: CallRecord,
+        outcome: str,
+        status: int | None = None,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+    ) -> None:
+        """Record the call's outcome; later calls for the same record are ignored."""
+        if record.finished:
+            return
+        record.finished = True
+        latency = time.perf_counter() - record.started
+        with self._lock:
+            self._calls[(record.call, record.model, outcome)] += 1
+            if status is not None:
+                self._statuses[(record.call, status)] += 1
+            self._tokens[(record.call, "prompt")] += prompt_tokens
+            self._tokens[(record.call, "completion")] += completion_tokens
+            self._json_failures[record.call] += record.json_failures
+            self._latency[(record.call, record.model, outcome)].observe(latency)
+            self._recent.append(
+                (time.monotonic(), record.call, outcome, latency, prompt_tokens, completion_tokens, record.model)
+            )
+
+    def _window(self) -> list[tuple]:
+        cutoff = time.monotonic() - self.window_seconds
+        with self._lock:
+            return [r for r in self._recent if r[0] >= cutoff]
+
+    def latency_percentile(self, call: str, model: str, pct: float, min_samples: int = 1) -> float | None:
+        """Recent ``pct`` latency of provider calls to ``model`` from ``call``,
+        or ``None`` with fewer than ``min_samples`` in the window."""
+        latencies = sorted(
+            r[3] for r in self._window()
+            if r[1] == call and r[6] == model and r[2] not in ("cache_hit", "short_circuited")
+        )
+        if len(latencies) < min_samples:
+            return None
+        return _percentile(latencies, pct)
+
+    def summary(self) -> dict[str, Any]:
+        """Per call site: count, outcomes, latency percentiles and token totals
+        over the last ``window_seconds``."""
+        recent = self._window()
+
+        by_call: defaultdict[str, list[tuple]] = defaultdict(list)
+        for row in recent:
+            by_call[row[1]].append(row)
+
+        calls = {}
+        for call, rows in sorted(by_call.items()):
+            # Cache hits would drag the percentiles towards zero
+            latencies = sorted(r[3] for r in rows if r[2] != "cache_hit")
+            calls[call] = {
+                "calls": len(rows),
+                "models": dict(Counter(r[6] for r in rows if r[6])),
+                "outcomes": dict(Counter(r[2] for r in rows)),
+                "p50_ms": round(_percentile(latencies, 50) * 1000, 1),
+                "p95_ms": round(_percentile(latencies, 95) * 1000, 1),
+                "p99_ms": round(_percentile(latencies, 99) * 1000, 1),
+                "prompt_tokens": sum(r[4] for r in rows),
+                "completion_tokens": sum(r[5] for r in rows),
+            }
+        return {"window_seconds": self.window_seconds, "calls": calls}
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            calls = dict(self._calls)
+            statuses = dict(self._statuses)
+            tokens = dict(self._tokens)
+            json_failures = dict(self._json_failures)
+            latency = {key: (list(h.buckets), h.count, h.total) for key, h in self._latency.items()}
+
+        lines = [
+            "# HELP aris_llm_calls_total LLM calls by call site, model and outcome.",
+            "# TYPE aris_llm_calls_total counter",
+        ]
+        lines += [
+            f"aris_llm_calls_total{_labels(call=c, model=m, outcome=o)} {n}" for (c, m, o), n in sorted(calls.items())
+        ]
+        lines += [
+            "# HELP aris_llm_http_responses_total Final HTTP status of LLM calls.",
+            "# TYPE aris_llm_http_responses_total counter",
+        ]
+        lines += [
+            f"aris_llm_http_responses_total{_labels(call=c, status=s)} {n}" for (c, s), n in sorted(statuses.items())
+        ]
+        lines += [
+            "# HELP aris_llm_tokens_total Prompt and completion tokens spent.",
+            "# TYPE aris_llm_tokens_total counter",
+        ]
+        lines += [f"aris_llm_tokens_total{_labels(call=c, kind=k)} {n}" for (c, k), n in sorted(tokens.items())]
+        lines += [
+            "# HELP aris_llm_json_failures_total Replies that were not valid JSON.",
+            "# TYPE aris_llm_json_failures_total counter",
+        ]
+        lines += [f"aris_llm_json_failures_total{_labels(call=c)} {n}" for c, n in sorted(json_failures.items())]
+        lines += [
+            "# HELP aris_llm_call_duration_seconds LLM call latency, retries included.",
+            "# TYPE aris_llm_call_duration_seconds histogram",
+        ]
+        for (c, m, o), (buckets, count, total) in sorted(latency.items()):
+            for bound, n in zip(LATENCY_BUCKETS, buckets):
+                lines.append(f"aris_llm_call_duration_seconds_bucket{_labels(call=c, model=m, outcome=o, le=bound)} {n}")
+            lines.append(f"aris_llm_call_duration_seconds_bucket{_labels(call=c, model=m, outcome=o, le='+Inf')} {count}")
+            lines.append(f"aris_llm_call_duration_seconds_sum{_labels(call=c, model=m, outcome=o)} {total:.6f}")
+            lines.append(f"aris_llm_call_duration_seconds_count{_labels(call=c, model=m, outcome=o)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+llm_calls = LLMCallMetrics()
@@ -0,0 +1,171 @@
+"""Retry, hedging and circuit-breaking for LLM provider calls.
+
+``_request_llm`` retries timeouts, 429s and 5xx responses with jittered
+exponential backoff, honouring ``Retry-After``. With
+``LLM_HEDGE_AFTER_SECONDS`` set, a request still running after that long
+gets a second, identical request and the first good reply wins. After
+``LLM_BREAKER_FAILURES`` consecutive provider failures the breaker opens:
+calls fail immediately (callers take their deterministic paths) until
+``LLM_BREAKER_RESET_SECONDS`` have passed and a single probe succeeds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+from app.core.config import settings
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_seconds: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self.opened_total = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if now - self._opened_at < self.reset_seconds:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        """Whether a call may go out; in half-open state only one probe at a time."""
+        with self._lock:
+            state = self._state(time.monotonic())
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker lets a probe through (0 when closed)."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self.reset_seconds - (time.monotonic() - self._opened_at))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def release_probe(self) -> None:
+        """Give back the probe slot of a call that ended without an outcome (cancelled)."""
+        with self._lock:
+            if self._state(time.monotonic()) == "half_open":
+                self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._failures += 1
+            # A failed probe re-opens; failures of calls started before opening do not extend it
+            if self._probing or (self._opened_at is None and self._failures >= self.failure_threshold):
+                self.opened_total += 1
+                self._opened_at = now
+            self._probing = False
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._state(time.monotonic()),
+                "consecutive_failures": self._failures,
+                "opened_total": self.opened_total,
+            }
+
+
+class OutcomeCounters:
+    """Thread-safe counters of call outcomes (``success``, ``timeout``, ...)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: Counter[str] = Counter()
+
+    def inc(self, outcome: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[outcome] += amount
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """``Retry-After`` as seconds, from either delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: float | None = None) -> float:
+    """Full-jitter exponential backoff for ``attempt`` (0-based), or ``Retry-After``."""
+    if retry_after is not None:
+        return retry_after
+    cap = min(settings.llm_retry_max_seconds, settings.llm_retry_base_seconds * 2 ** attempt)
+    return random.uniform(0, cap)
+
+
+async def hedged(
+    send: Callable[[], Awaitable[httpx.Response]],
+    hedge_after: float,
+    counters: OutcomeCounters,
+) -> httpx.Response:
+    """Run ``send``; if it has not finished after ``hedge_after`` seconds, race a second copy.
+
+    The first 200 wins and the loser is cancelled. If neither succeeds the
+    later outcome (response or exception) is returned / raised.
+    """
+    tasks = [asyncio.ensure_future(send())]
+    try:
+        if hedge_after <= 0:
+            return await tasks[0]
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if done:
+            return tasks[0].result()
+
+        counters.inc("hedged")
+        tasks.append(asyncio.ensure_future(send()))
+        pending = set(tasks)
+        last: asyncio.Future | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                last = task
+                if task.exception() is None and task.result().status_code == 200:
+                    if task is tasks[1]:
+                        counters.inc("hedge_won")
+                    return task.result()
+        return last.result()
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
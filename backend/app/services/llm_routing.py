@@ -0,0 +1,101 @@
+"""Per-call-site model, max_tokens and timeout selection.
+
+Each call site (``resume_ats``, ``profile_analysis``, ``training_plan``,
+``modify_plan``, ``modify_plan_patch``) has a route. ``LLM_ROUTES`` is a JSON
+object overriding any of ``model`` / ``max_tokens`` / ``timeout`` per call
+site, e.g. ``{"profile_analysis": {"model": "llama-3.1-8b-instant"}}``.
+
+Cheap call sites default to ``LLM_FAST_MODEL`` (``LLM_MODEL`` when unset).
+In adaptive mode (``LLM_ADAPTIVE_P95_SECONDS`` > 0) a call site whose
+primary model has shown a p95 latency above the threshold over the recent
+metrics window is sent to ``LLM_FAST_MODEL`` instead. Once the slow samples
+age out of the window the primary model is tried again.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, replace
+
+from app.core.config import settings
+from app.services.llm_metrics import LLMCallMetrics
+
+
+@dataclass(frozen=True)
+class Route:
+    model: str
+    max_tokens: int
+    timeout: float | None = None  # None keeps the shared LLM client's timeout
+
+
+# Use the primary model unless "fast"; keyword extraction does not need the large one
+_DEFAULTS: dict[str, tuple[bool, int]] = {
+    "resume_ats": (True, 1000),
+    "profile_analysis": (False, 1500),
+    "training_plan": (False, 2500),
+    "modify_plan": (False, 2500),
+    "modify_plan_patch": (False, 800),
+}
+
+
+def _parse_overrides(raw: str) -> dict[str, dict]:
+    if not raw:
+        return {}
+    try:
+        overrides = json.loads(raw)
+    except ValueError:
+        print("[llm] Ignoring LLM_ROUTES: not valid JSON")
+        return {}
+    return {k: v for k, v in overrides.items() if isinstance(v, dict)}
+
+
+class ModelRouter:
+    def __init__(
+        self,
+        primary_model: str,
+        fast_model: str,
+        metrics: LLMCallMetrics,
+        overrides: str = "",
+        adaptive_p95_seconds: float = 0.0,
+        adaptive_min_samples: int = 20,
+    ) -> None:
+        self.fast_model = fast_model or primary_model
+        self.metrics = metrics
+        self.adaptive_p95_seconds = adaptive_p95_seconds
+        self.adaptive_min_samples = adaptive_min_samples
+        self.routes: dict[str, Route] = {}
+        parsed = _parse_overrides(overrides)
+        for call, (fast, max_tokens) in _DEFAULTS.items():
+            route = Route(model=self.fast_model if fast else primary_model, max_tokens=max_tokens)
+            fields = {k: v for k, v in parsed.get(call, {}).items() if k in ("model", "max_tokens", "timeout")}
+            self.routes[call] = replace(route, **fields)
+
+    def route(self, call: str) -> Route:
+        route = self.routes[call]
+        if self.adaptive_p95_seconds <= 0 or route.model == self.fast_model:
+            return route
+        p95 = self.metrics.latency_percentile(call, route.model, 95, self.adaptive_min_samples)
+        if p95 is not None and p95 > self.adaptive_p95_seconds:
+            return replace(route, model=self.fast_model)
+        return route
+
+    def stats(self) -> dict:
+        return {
+            "adaptive_p95_seconds": self.adaptive_p95_seconds,
+            "fast_model": self.fast_model,
+            "routes": {
+                call: {**route.__dict__, "current_model": self.route(call).model}
+                for call, route in self.routes.items()
+            },
+        }
+
+
+def build_router(primary_model: str, metrics: LLMCallMetrics) -> ModelRouter:
+    return ModelRouter(
+        primary_model,
+        settings.llm_fast_model,
+        metrics,
+        overrides=settings.llm_routes,
+        adaptive_p95_seconds=settings.llm_adaptive_p95_seconds,
+        adaptive_min_samples=settings.llm_adaptive_min_samples,
+    )
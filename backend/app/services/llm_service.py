@@ -1,61 +1,409 @@
 """LLM service — deep candidate-specific analysis and training plan generation.
 
 Uses rich prompts with full candidate context per PRD §6.4.5 and §7.
+
+Every generator is async and runs its request on the shared I/O loop, so
+async routes can overlap independent calls with ``asyncio.gather``. The
+plain-named functions are blocking wrappers for synchronous callers.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
-from typing import Any
+from typing import Any, AsyncIterator
 
 import httpx
 
+from app.core.concurrency import io_loop, run_sync
+from app.core.config import settings
+from app.core.http import http_clients
+from app.core.json_stream import ArrayItemStream
+from app.services.llm_budget import token_budget
+from app.services.llm_cache import cache_key, llm_cache
+from app.services.llm_metrics import CallRecord, llm_calls
+from app.services.llm_routing import Route, build_router
+from app.services.llm_resilience import (
+    CircuitBreaker,
+    OutcomeCounters,
+    backoff_delay,
+    hedged,
+    parse_retry_after,
+)
+from app.services.prompt_builder import PromptBuilder, compact_json, count_tokens
+
 
 LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://api.groq.com/openai/v1")
 LLM_MODEL = os.getenv("LLM_MODEL", "llama-3.3-70b-versatile")
 
+llm_breaker = CircuitBreaker(settings.llm_breaker_failures, settings.llm_breaker_reset_seconds)
+llm_outcomes = OutcomeCounters()
+llm_router = build_router(LLM_MODEL, llm_calls)
+
+# User-prompt token budget per call; low-priority sections are trimmed to fit
+PROMPT_BUDGETS = {
+    "profile_analysis": 1200,
+    "training_plan": 900,
+    "resume_ats": 1400,
+    "modify_plan": 3500,
+    "modify_plan_patch": 3500,
+}
+
 
 def _get_api_key():
     return os.getenv("LLM_API_KEY")
 
 
-def _request_llm(messages: list[dict[str, str]], max_tokens: int = 2048) -> dict | None:
-    """Send a chat completion request and parse JSON response."""
-    api_key = _get_api_key()
-    if not api_key:
-        return None
-
-    payload = {
-        "model": LLM_MODEL,
+def _chat_payload(messages: list[dict[str, str]], route: Route) -> dict[str, Any]:
+    return {
+        "model": route.model,
         "messages": messages,
         "response_format": {"type": "json_object"},
         "temperature": 0.3,
-        "max_tokens": max_tokens,
+        "max_tokens": route.max_tokens,
     }
 
-    headers = {
+
+def _request_options(route: Route) -> dict[str, Any]:
+    """Per-route overrides of the shared LLM client's settings."""
+    return {"timeout": route.timeout} if route.timeout else {}
+
+
+def _chat_headers(api_key: str) -> dict[str, str]:
+    return {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
     }
 
+
+def _log_usage(
+    call: str,
+    messages: list[dict[str, str]],
+    usage: dict | None,
+    completion: str = "",
+) -> tuple[int, int]:
+    """Print and return the (prompt, completion) token spend of one call,
+    from the provider's ``usage`` when present."""
+    usage = usage or {}
+    prompt = usage.get("prompt_tokens") or sum(count_tokens(m["content"]) for m in messages)
+    completion_tokens = usage.get("completion_tokens") or count_tokens(completion)
+    estimated = "" if usage else " (estimated)"
+    print(
+        f"[llm] {call}: prompt_tokens={prompt} completion_tokens={completion_tokens}"
+        f" budget={PROMPT_BUDGETS.get(call, '-')}{estimated}"
+    )
+    return prompt, completion_tokens
+
+
+async def _cached_reply(key: str, use_cache: bool) -> dict | None:
+    if not llm_cache.enabled:
+        return None
+    if not use_cache:
+        llm_cache.record_bypass()
+        return None
+    return await asyncio.to_thread(llm_cache.get, key)
+
+
+async def _store_reply(key: str, model: str, result: dict) -> None:
+    if llm_cache.enabled:
+        await asyncio.to_thread(llm_cache.set, key, model, result)
+
+
+# Outcomes that count against the circuit breaker
+_PROVIDER_FAILURES = {"timeout", "transport_error", "rate_limited", "server_error"}
+
+
+def _status_outcome(status_code: int) -> str:
+    if status_code == 200:
+        return "ok"
+    if status_code == 429:
+        return "rate_limited"
+    if status_code >= 500:
+        return "server_error"
+    return "client_error"
+
+
+def _cancelled(record: CallRecord, status: int | None) -> None:
+    # A cancelled call neither succeeded nor failed; if it was the half-open
+    # probe it must give the slot back, or every later call short-circuits
+    llm_breaker.release_probe()
+    llm_calls.finish(record, "cancelled", status)
+
+
+async def _request_llm(
+    call: str,
+    messages: list[dict[str, str]],
+    use_cache: bool = True,
+) -> dict | None:
+    """Send a chat completion request and parse JSON response.
+
+    Replies are cached by a hash of the request (see ``llm_cache``);
+    ``use_cache=False`` always asks the model and overwrites the entry.
+    Failures are retried, hedged and circuit-broken as described in
+    ``llm_resilience``; ``None`` means no usable reply. ``call`` names the
+    call site, which picks the model, max_tokens and timeout from
+    ``llm_router`` and labels logs and ``llm_calls`` metrics.
+    """
+    api_key = _get_api_key()
+    if not api_key:
+        return None
+
+    route = llm_router.route(call)
+    record = llm_calls.start(call, route.model)
+    payload = _chat_payload(messages, route)
+    key = cache_key(payload)
+    cached = await _cached_reply(key, use_cache)
+    if cached is not None:
+        llm_calls.finish(record, "cache_hit")
+        return cached
+
+    if not await asyncio.to_thread(token_budget.allows, "llm"):
+        llm_outcomes.inc("over_budget")
+        llm_calls.finish(record, "over_budget")
+        return None
+
+    if not llm_breaker.allow():
+        llm_outcomes.inc("short_circuited")
+        llm_calls.finish(record, "short_circuited")
+        return None
+
+    headers = _chat_headers(api_key)
+
+    async def _post():
+        # The pooled async client lives on the I/O loop
+        return await http_clients.async_client("llm").post(
+            f"{LLM_BASE_URL}/chat/completions",
+            headers=headers,
+            json=payload,
+            **_request_options(route),
+        )
+
+    async def _send():
+        return await hedged(_post, settings.llm_hedge_after_seconds, llm_outcomes)
+
+    status = None
     try:
-        with httpx.Client(timeout=30.0) as client:
-            resp = client.post(
-                f"{LLM_BASE_URL}/chat/completions",
-                headers=headers,
-                json=payload,
-            )
-            if resp.status_code != 200:
-                return None
-            data = resp.json()
-            content = data["choices"][0]["message"]["content"]
-            return json.loads(content)
-    except Exception:
+        for attempt in range(settings.llm_max_retries + 1):
+            retry_after = None
+            try:
+                resp = await io_loop.run(_send)
+            except httpx.TimeoutException:
+                outcome = "timeout"
+            except httpx.TransportError:
+                outcome = "transport_error"
+            else:
+                status = resp.status_code
+                outcome = _status_outcome(status)
+                if outcome == "ok":
+                    try:
+                        data = resp.json()
+                        content = data["choices"][0]["message"]["content"]
+                        result = json.loads(content)
+                    except (ValueError, KeyError, IndexError, TypeError):
+                        # The provider is healthy, the model just wrote bad JSON
+                        outcome = "invalid_json"
+                        record.json_failures += 1
+                    else:
+                        llm_breaker.record_success()
+                        llm_outcomes.inc("success")
+                        tokens = _log_usage(call, messages, data.get("usage"), content)
+                        llm_calls.finish(record, "success", status, *tokens)
+                        await asyncio.to_thread(token_budget.record, *tokens)
+                        await _store_reply(key, route.model, result)
+                        return result
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+
+            llm_outcomes.inc(outcome)
+            if outcome in _PROVIDER_FAILURES:
+                llm_breaker.record_failure()
+            else:
+                llm_breaker.record_success()
+            if outcome == "client_error" or attempt == settings.llm_max_retries:
+                break
+
+            delay = backoff_delay(attempt, retry_after)
+            if delay > settings.llm_retry_max_seconds or not llm_breaker.allow():
+                break
+            llm_outcomes.inc("retries")
+            await asyncio.sleep(delay)
+
+        llm_outcomes.inc("gave_up")
+        llm_calls.finish(record, outcome, status)
         return None
+    except asyncio.CancelledError:
+        _cancelled(record, status)
+        raise
+
+
+class _StreamStatusError(Exception):
+    def __init__(self, status_code: int, retry_after: float | None) -> None:
+        super().__init__(f"LLM stream failed with HTTP {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
 
 
-def generate_profile_analysis(
+async def _stream_deltas(
+    payload: dict[str, Any],
+    headers: dict[str, str],
+    route: Route,
+    usage: dict[str, Any],
+) -> AsyncIterator[str]:
+    """Yield content deltas of a ``stream=true`` completion (runs on the I/O loop).
+
+    The final usage chunk, if the provider sends one, is copied into ``usage``.
+    """
+    client = http_clients.async_client("llm")
+    async with client.stream(
+        "POST",
+        f"{LLM_BASE_URL}/chat/completions",
+        headers=headers,
+        json={**payload, "stream": True, "stream_options": {"include_usage": True}},
+        **_request_options(route),
+    ) as resp:
+        if resp.status_code != 200:
+            raise _StreamStatusError(resp.status_code, parse_retry_after(resp.headers.get("Retry-After")))
+        async for line in resp.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            chunk = json.loads(data)
+            # Groq reports it under x_groq even without stream_options
+            chunk_usage = chunk.get("usage") or (chunk.get("x_groq") or {}).get("usage")
+            if chunk_usage:
+                usage.update(chunk_usage)
+            choices = chunk.get("choices") or [{}]
+            delta = (choices[0].get("delta") or {}).get("content")
+            if delta:
+                yield delta
+
+
+async def _stream_llm(
+    call: str,
+    messages: list[dict[str, str]],
+    array_key: str,
+    use_cache: bool = True,
+) -> AsyncIterator[tuple[str, Any]]:
+    """Stream a JSON completion, yielding ``("item", element)`` for every
+    element of ``array_key`` as soon as it is complete, then exactly one
+    ``("result", reply)`` with the parsed reply (``None`` on failure).
+
+    A cached reply is replayed through the same events.
+    """
+    api_key = _get_api_key()
+    if not api_key:
+        yield "result", None
+        return
+
+    route = llm_router.route(call)
+    record = llm_calls.start(call, route.model)
+    payload = _chat_payload(messages, route)
+    key = cache_key(payload)
+    cached = await _cached_reply(key, use_cache)
+    if cached is not None:
+        llm_calls.finish(record, "cache_hit")
+        for item in cached.get(array_key) or []:
+            yield "item", item
+        yield "result", cached
+        return
+
+    if not await asyncio.to_thread(token_budget.allows, "llm"):
+        llm_outcomes.inc("over_budget")
+        llm_calls.finish(record, "over_budget")
+        yield "result", None
+        return
+
+    if not llm_breaker.allow():
+        llm_outcomes.inc("short_circuited")
+        llm_calls.finish(record, "short_circuited")
+        yield "result", None
+        return
+
+    headers = _chat_headers(api_key)
+    status = None
+    try:
+        for attempt in range(settings.llm_max_retries + 1):
+            parser = ArrayItemStream(array_key)
+            parts: list[str] = []
+            usage: dict[str, Any] = {}
+            emitted = False
+            retry_after = None
+            try:
+                async for delta in io_loop.stream(lambda: _stream_deltas(payload, headers, route, usage)):
+                    parts.append(delta)
+                    for item in parser.feed(delta):
+                        emitted = True
+                        yield "item", item
+                content = "".join(parts)
+                result = json.loads(content)
+            except httpx.TimeoutException:
+                outcome = "timeout"
+            except httpx.TransportError:
+                outcome = "transport_error"
+            except _StreamStatusError as exc:
+                status = exc.status_code
+                outcome = _status_outcome(status)
+                retry_after = exc.retry_after
+            except ValueError:
+                status = 200
+                outcome = "invalid_json"
+                record.json_failures += 1
+            else:
+                llm_breaker.record_success()
+                llm_outcomes.inc("success")
+                # Estimated only if no usage chunk arrived
+                tokens = _log_usage(call, messages, usage, content)
+                llm_calls.finish(record, "success", 200, *tokens)
+                await asyncio.to_thread(token_budget.record, *tokens)
+                await _store_reply(key, route.model, result)
+                yield "result", result
+                return
+
+            llm_outcomes.inc(outcome)
+            if outcome in _PROVIDER_FAILURES:
+                llm_breaker.record_failure()
+            else:
+                llm_breaker.record_success()
+            # Items already sent cannot be taken back, so only retry clean failures
+            if emitted or outcome == "client_error" or attempt == settings.llm_max_retries:
+                break
+
+            delay = backoff_delay(attempt, retry_after)
+            if delay > settings.llm_retry_max_seconds or not llm_breaker.allow():
+                break
+            llm_outcomes.inc("retries")
+            await asyncio.sleep(delay)
+
+        llm_outcomes.inc("gave_up")
+        llm_calls.finish(record, outcome, status)
+        yield "result", None
+    except (asyncio.CancelledError, GeneratorExit):
+        _cancelled(record, status)
+        raise
+
+
+def _scores_line(score_breakdown: dict, skip: tuple[str, ...] = ()) -> str:
+    """``key value`` pairs on one line instead of indented JSON."""
+    return ", ".join(
+        f"{k} {compact_json(v) if isinstance(v, (dict, list)) else v}"
+        for k, v in score_breakdown.items()
+        if k not in skip
+    )
+
+
+def _repo_line(repo: dict) -> str:
+    details = ", ".join(str(d) for d in (repo.get("language"), f"{repo.get('stars', 0)} stars") if d)
+    return f"{repo.get('name', '?')} ({details})"
+
+
+def _compact_resume(text: str) -> str:
+    """Collapse the whitespace runs PDF extraction leaves behind."""
+    return "\n".join(" ".join(line.split()) for line in text.splitlines() if line.strip())
+
+
+def _profile_analysis_messages(
     candidate_name: str,
     role_applied: str,
     github_metrics: dict,
@@ -65,11 +413,7 @@ def generate_profile_analysis(
     education: dict | None = None,
     experience: dict | None = None,
     professional: dict | None = None,
-) -> dict | None:
-    """Generate a thorough, candidate-specific profile analysis.
-
-    Returns: { summary, strengths, weaknesses, risks, growth_direction }
-    """
+) -> list[dict[str, str]]:
     # Build rich context about this specific candidate
     languages = github_metrics.get("languages", {})
     top_langs = sorted(languages.items(), key=lambda x: x[1], reverse=True)[:5]
@@ -79,81 +423,94 @@ def generate_profile_analysis(
     stars = github_metrics.get("total_stars", 0)
     commits = github_metrics.get("commits_last_90_days", 0)
 
+    system_prompt = (
+        "You are TechAlpha's senior technical evaluator. You must provide a thorough, "
+        "SPECIFIC analysis of this particular candidate — NOT a generic template. "
+        "Reference their actual skills, repos, languages, and scores. "
+        "Return ONLY valid JSON with keys: summary, strengths (array of 3-5 strings), "
+        "weaknesses (array of 2-4 strings), risks (array of 1-3 strings), "
+        "growth_direction (string). "
+        "The 'summary' must be exactly 150-200 words and mention the candidate BY NAME. "
+        "JSON only, no markdown."
+    )
+
+    # Higher priority sections survive trimming longer
+    prompt = PromptBuilder(PROMPT_BUDGETS["profile_analysis"])
+    prompt.text("header", (
+        f"Analyze candidate: {candidate_name}\n"
+        f"Applied for: {role_applied}\n"
+        f"\nGitHub Profile:\n"
+        f"- {repos} public repos, {stars} stars, {commits} commits in last 90 days\n"
+        f"- Top languages: {lang_str}"
+    ), required=True)
+    prompt.items(
+        "repos",
+        [_repo_line(r) for r in github_metrics.get("top_repositories", [])],
+        prefix="\n- Top repos: ",
+        joiner="; ",
+        priority=3,
+    )
+
     # Resume context
-    resume_ctx = ""
     if resume_data:
-        kw = resume_data.get("keywords_detected", [])
         ats = resume_data.get("ats_score", 0)
         pq = resume_data.get("project_quality", 0)
-        resume_ctx = (
-            f"\nResume Analysis: ATS score {ats}/100, project quality {pq}/100. "
-            f"Keywords: {', '.join(kw[:15])}."
-        )
+        prompt.text("resume", f"\n\nResume Analysis: ATS score {ats}/100, project quality {pq}/100.", required=True)
+        prompt.items("keywords", resume_data.get("keywords_detected", [])[:15], prefix=" Keywords: ", priority=1)
 
     # Education context
-    edu_ctx = ""
     if education:
-        edu_ctx = (
+        prompt.text("education", (
             f"\nEducation: {education.get('degree', 'N/A')} in "
             f"{education.get('fieldOfStudy', 'N/A')} from "
             f"{education.get('institution', 'N/A')}. "
             f"CGPA: {education.get('gpa', 'N/A')}."
-        )
+        ), priority=4)
 
     # Experience context
-    exp_ctx = ""
     if experience:
         has_intern = experience.get("hasPreviousInternship", False)
         company = experience.get("company", "")
         exp_ctx = f"\nExperience: {'Has' if has_intern else 'No'} previous internship"
         if company:
             exp_ctx += f" at {company}"
-        exp_ctx += "."
+        prompt.text("experience", exp_ctx + ".", priority=4)
 
     # Professional context
-    prof_ctx = ""
     if professional:
         tech_stack = professional.get("primaryTechStack", [])
         yoe = professional.get("yearsOfExperience", 0)
         if tech_stack:
-            prof_ctx = f"\nTech Stack: {', '.join(tech_stack[:8])}. Experience: {yoe} years."
-
-    scores_str = json.dumps(score_breakdown, indent=2)
-    gaps_str = ", ".join(learning_gaps) if learning_gaps else "No major gaps identified"
-
-    system_prompt = (
-        "You are TechAlpha's senior technical evaluator. You must provide a thorough, "
-        "SPECIFIC analysis of this particular candidate — NOT a generic template. "
-        "Reference their actual skills, repos, languages, and scores. "
-        "Return ONLY valid JSON with keys: summary, strengths (array of 3-5 strings), "
-        "weaknesses (array of 2-4 strings), risks (array of 1-3 strings), "
-        "growth_direction (string). "
-        "The 'summary' must be exactly 150-200 words and mention the candidate BY NAME. "
-        "JSON only, no markdown."
-    )
-
-    user_prompt = (
-        f"Analyze candidate: {candidate_name}\n"
-        f"Applied for: {role_applied}\n"
-        f"\nGitHub Profile:\n"
-        f"- {repos} public repos, {stars} stars, {commits} commits in last 90 days\n"
-        f"- Top languages: {lang_str}\n"
-        f"- Top repos: {json.dumps(github_metrics.get('top_repositories', []))}\n"
-        f"{resume_ctx}{edu_ctx}{exp_ctx}{prof_ctx}\n"
-        f"\nScore Breakdown:\n{scores_str}\n"
-        f"\nIdentified Learning Gaps: {gaps_str}\n"
-        f"\nProvide a thorough, specific profile analysis for {candidate_name}. "
+            prompt.text("professional", f"\nProfessional: {yoe} years of experience.", priority=4)
+            prompt.items("tech_stack", tech_stack[:8], prefix=" Tech Stack: ", priority=2)
+
+    prompt.text("scores", f"\n\nScore Breakdown: {_scores_line(score_breakdown)}", required=True)
+    if learning_gaps:
+        prompt.items("gaps", learning_gaps, prefix="\nIdentified Learning Gaps: ", joiner="; ", priority=5)
+    else:
+        prompt.text("gaps", "\nIdentified Learning Gaps: No major gaps identified", required=True)
+    prompt.text("instructions", (
+        f"\n\nProvide a thorough, specific profile analysis for {candidate_name}. "
         f"Be concrete — mention specific technologies, repos, and scores."
-    )
+    ), required=True)
 
-    messages = [
+    return [
         {"role": "system", "content": system_prompt},
-        {"role": "user", "content": user_prompt},
+        {"role": "user", "content": prompt.build()},
     ]
-    return _request_llm(messages, max_tokens=1500)
 
 
-def generate_training_plan_llm(
+async def generate_profile_analysis_async(*args: Any, use_cache: bool = True, **kwargs: Any) -> dict | None:
+    """Generate a thorough, candidate-specific profile analysis.
+
+    Takes the arguments of ``_profile_analysis_messages``.
+    Returns: { summary, strengths, weaknesses, risks, growth_direction }
+    """
+    messages = _profile_analysis_messages(*args, **kwargs)
+    return await _request_llm("profile_analysis", messages, use_cache=use_cache)
+
+
+def _training_plan_messages(
     candidate_name: str,
     role_applied: str,
     confidence_band: str,
@@ -165,11 +522,7 @@ def generate_training_plan_llm(
     weeks: int | None = None,
     daily_hours: float | None = None,
     target_role: str | None = None,
-) -> dict | None:
-    """Generate a candidate-specific, structured training plan using LLM.
-
-    Returns: { summary, focus_areas, weekly_plan: [{ week, goal, objectives, topics, tasks, deliverables }] }
-    """
+) -> list[dict[str, str]]:
     languages = github_metrics.get("languages", {})
     top_langs = list(languages.keys())[:5]
     repos = github_metrics.get("total_public_repos", 0)
@@ -200,38 +553,71 @@ def generate_training_plan_llm(
         "JSON only, no markdown."
     )
 
-    gaps_str = "; ".join(learning_gaps) if learning_gaps else "No major gaps"
     all_roles = score_breakdown.get("all_role_scores", {})
-    role_scores_str = ", ".join(f"{r}: {s}%" for r, s in all_roles.items()) if all_roles else "N/A"
 
-    user_prompt = (
+    prompt = PromptBuilder(PROMPT_BUDGETS["training_plan"])
+    prompt.text("header", (
         f"Candidate: {candidate_name}\n"
         f"Role: {plan_role}\n"
         f"Score: {master_score}/100 ({confidence_band})\n"
         f"Languages: {', '.join(top_langs) if top_langs else 'None'}\n"
         f"Repos: {repos}, Commits (90d): {commits}\n"
-        f"Resume Keywords: {', '.join(kw_list) if kw_list else 'No resume'}\n"
-        f"Role Match Scores: {role_scores_str}\n"
-        f"Learning Gaps: {gaps_str}\n"
-        f"Score Breakdown: {json.dumps(score_breakdown)}\n\n"
-        f"Create a {plan_weeks}-week training plan specifically for {candidate_name} "
+    ), required=True)
+    if kw_list:
+        prompt.items("keywords", kw_list, prefix="Resume Keywords: ", priority=2)
+    else:
+        prompt.text("keywords", "Resume Keywords: No resume", required=True)
+    if all_roles:
+        # Best matches first, so trimming drops the least relevant roles
+        ranked = sorted(all_roles.items(), key=lambda rs: rs[1], reverse=True)
+        prompt.items("role_scores", [f"{r}: {s}%" for r, s in ranked], prefix="\nRole Match Scores: ", priority=1)
+    if learning_gaps:
+        prompt.items("gaps", learning_gaps, prefix="\nLearning Gaps: ", joiner="; ", priority=3)
+    else:
+        prompt.text("gaps", "\nLearning Gaps: No major gaps", required=True)
+    # Role scores are listed above, no need to repeat them
+    prompt.text("scores", f"\nScore Breakdown: {_scores_line(score_breakdown, skip=('all_role_scores',))}", required=True)
+    prompt.text("instructions", (
+        f"\n\nCreate a {plan_weeks}-week training plan specifically for {candidate_name} "
         f"to prepare them for the {plan_role} role. "
         f"Address their gaps while building on their strengths in {', '.join(top_langs[:3]) if top_langs else 'general programming'}."
-    )
+    ), required=True)
 
     messages = [
         {"role": "system", "content": system_prompt},
-        {"role": "user", "content": user_prompt},
+        {"role": "user", "content": prompt.build()},
     ]
-    return _request_llm(messages, max_tokens=2500)
+    return messages
+
 
+async def generate_training_plan_llm_async(*args: Any, use_cache: bool = True, **kwargs: Any) -> dict | None:
+    """Generate a candidate-specific, structured training plan using LLM.
 
-def generate_resume_ats(
+    Takes the arguments of ``_training_plan_messages``.
+    Returns: { summary, focus_areas, weekly_plan: [{ week, goal, objectives, topics, tasks, deliverables }] }
+    """
+    messages = _training_plan_messages(*args, **kwargs)
+    return await _request_llm("training_plan", messages, use_cache=use_cache)
+
+
+def stream_training_plan_llm(*args: Any, use_cache: bool = True, **kwargs: Any) -> AsyncIterator[tuple[str, Any]]:
+    """Streaming ``generate_training_plan_llm_async``: one ``("item", week)``
+    event per ``weekly_plan`` entry, then ``("result", plan | None)``."""
+    messages = _training_plan_messages(*args, **kwargs)
+    return _stream_llm("training_plan", messages, "weekly_plan", use_cache)
+
+
+async def generate_resume_ats_async(
     resume_text: str,
     role: str,
     candidate_name: str = "",
+    use_cache: bool = True,
 ) -> dict | None:
-    """LLM-powered ATS evaluation of resume text."""
+    """LLM-powered ATS evaluation of resume text.
+
+    The resume is whitespace-compacted and then cut to whatever the
+    ``resume_ats`` budget leaves after the rest of the prompt.
+    """
     system_prompt = (
         "You are an ATS evaluator for technical internship positions. "
         "Analyze this candidate's resume thoroughly for the specified role. "
@@ -243,30 +629,23 @@ def generate_resume_ats(
         "JSON only."
     )
 
-    user_content = (
-        f"Candidate: {candidate_name}\n"
-        f"Applied Role: {role}\n\n"
-        f"Resume Text:\n{resume_text[:3000]}"
-    )
+    prompt = PromptBuilder(PROMPT_BUDGETS["resume_ats"])
+    prompt.text("header", f"Candidate: {candidate_name}\nApplied Role: {role}\n\nResume Text:\n", required=True)
+    prompt.text("resume", _compact_resume(resume_text))
 
     messages = [
         {"role": "system", "content": system_prompt},
-        {"role": "user", "content": user_content},
+        {"role": "user", "content": prompt.build()},
     ]
-    return _request_llm(messages, max_tokens=1000)
+    return await _request_llm("resume_ats", messages, use_cache=use_cache)
 
 
-def modify_plan_with_chat(
+def _modify_plan_messages(
     existing_plan: dict,
     admin_message: str,
     candidate_name: str,
     role_applied: str,
-) -> dict | None:
-    """Modify an existing training plan based on admin's natural-language instruction.
-
-    Preserves plan structure while applying the requested changes.
-    Returns the updated plan JSON.
-    """
+) -> list[dict[str, str]]:
     system_prompt = (
         "You are an expert training plan editor for a tech internship program. "
         "You receive an existing training plan and an admin's modification request. "
@@ -278,10 +657,12 @@ def modify_plan_with_chat(
         "JSON only, no markdown, no explanation."
     )
 
+    # The plan and the request cannot be trimmed; compact JSON is roughly
+    # half the tokens of the indented form
     user_prompt = (
         f"Candidate: {candidate_name}\n"
         f"Role: {role_applied}\n\n"
-        f"Current Training Plan:\n{json.dumps(existing_plan, indent=2)}\n\n"
+        f"Current Training Plan:\n{compact_json(existing_plan)}\n\n"
         f"Admin's modification request: {admin_message}\n\n"
         f"Apply the admin's changes and return the updated training plan JSON."
     )
@@ -290,5 +671,88 @@ def modify_plan_with_chat(
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_prompt},
     ]
-    return _request_llm(messages, max_tokens=2500)
+    return messages
+
+
+async def modify_plan_with_chat_async(*args: Any, use_cache: bool = True, **kwargs: Any) -> dict | None:
+    """Modify an existing training plan based on admin's natural-language instruction.
+
+    Takes the arguments of ``_modify_plan_messages``. Preserves plan
+    structure while applying the requested changes. Returns the updated plan JSON.
+    """
+    messages = _modify_plan_messages(*args, **kwargs)
+    return await _request_llm("modify_plan", messages, use_cache=use_cache)
+
+
+def stream_modify_plan_with_chat(*args: Any, use_cache: bool = True, **kwargs: Any) -> AsyncIterator[tuple[str, Any]]:
+    """Streaming ``modify_plan_with_chat_async``, with the events of ``stream_training_plan_llm``."""
+    messages = _modify_plan_messages(*args, **kwargs)
+    return _stream_llm("modify_plan", messages, "weekly_plan", use_cache)
+
+
+def _patch_plan_messages(
+    existing_plan: dict,
+    admin_message: str,
+    candidate_name: str,
+    role_applied: str,
+) -> list[dict[str, str]]:
+    system_prompt = (
+        "You are an expert training plan editor for a tech internship program. "
+        "You receive an existing training plan and an admin's modification request. "
+        "Express the change as a minimal list of edit operations instead of rewriting the plan. "
+        "Return ONLY valid JSON: {\"operations\": [{\"op\": \"replace\"|\"add\"|\"remove\", "
+        "\"path\": string, \"value\": ...}]}. Allowed paths: "
+        "/summary (string), /focus_areas (array of strings), "
+        "/weekly_plan/<i>/goal (string), "
+        "/weekly_plan/<i>/<field> (array of strings) and /weekly_plan/<i>/<field>/<j> (string, "
+        "j may be - to append) where field is objectives, topics, tasks or deliverables. "
+        "<i> and <j> are 0-based array positions. Only replace is allowed on whole fields. "
+        "If the request needs anything else, such as adding or removing weeks, "
+        "return {\"operations\": null}. JSON only, no markdown, no explanation."
+    )
+
+    user_prompt = (
+        f"Candidate: {candidate_name}\n"
+        f"Role: {role_applied}\n\n"
+        f"Current Training Plan:\n{compact_json(existing_plan)}\n\n"
+        f"Admin's modification request: {admin_message}\n\n"
+        f"Return the edit operations."
+    )
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+async def patch_plan_with_chat_async(*args: Any, use_cache: bool = True, **kwargs: Any) -> list | None:
+    """Edit operations implementing an admin's instruction, for ``apply_plan_patch``.
+
+    Takes the arguments of ``_modify_plan_messages``. Returns ``None`` when
+    the LLM is unavailable or declined to express the change as a patch.
+    """
+    messages = _patch_plan_messages(*args, **kwargs)
+    reply = await _request_llm("modify_plan_patch", messages, use_cache=use_cache)
+    return (reply or {}).get("operations") or None
+
+
+# Blocking variants for synchronous routes and scripts
+
+def generate_profile_analysis(*args: Any, **kwargs: Any) -> dict | None:
+    return run_sync(lambda: generate_profile_analysis_async(*args, **kwargs))
+
+
+def generate_training_plan_llm(*args: Any, **kwargs: Any) -> dict | None:
+    return run_sync(lambda: generate_training_plan_llm_async(*args, **kwargs))
+
+
+def generate_resume_ats(*args: Any, **kwargs: Any) -> dict | None:
+    return run_sync(lambda: generate_resume_ats_async(*args, **kwargs))
+
+
+def modify_plan_with_chat(*args: Any, **kwargs: Any) -> dict | None:
+    return run_sync(lambda: modify_plan_with_chat_async(*args, **kwargs))
+
 
+def patch_plan_with_chat(*args: Any, **kwargs: Any) -> list | None:
+    return run_sync(lambda: patch_plan_with_chat_async(*args, **kwargs))
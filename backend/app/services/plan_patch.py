@@ -0,0 +1,113 @@
+"""Validated edit operations on a stored training plan.
+
+Patch-mode plan modification has the LLM return a short list of JSON
+Patch-style operations instead of the whole plan. Only these paths may be
+touched:
+
+* ``/summary`` and ``/focus_areas`` (``replace``);
+* ``/weekly_plan/<i>/<field>`` (``replace``) for ``goal`` and the list
+  fields ``objectives``, ``topics``, ``tasks``, ``deliverables``;
+* ``/weekly_plan/<i>/<list field>/<j>`` (``replace``, ``remove``, and
+  ``add`` where ``j`` may be ``-`` to append).
+
+Adding or removing whole weeks is out of scope; the caller falls back to a
+full rewrite for those.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+PLAN_TEXT_FIELDS = {"goal"}
+PLAN_LIST_FIELDS = {"objectives", "topics", "tasks", "deliverables"}
+
+
+class PlanPatchError(ValueError):
+    pass
+
+
+def _index(token: str, length: int, allow_end: bool = False) -> int:
+    if allow_end and token == "-":
+        return length
+    if not token.isdigit():
+        raise PlanPatchError(f"invalid index {token!r}")
+    index = int(token)
+    if index >= length + (1 if allow_end else 0):
+        raise PlanPatchError(f"index {index} out of range")
+    return index
+
+
+def _check_strings(value: Any, path: str) -> list[str]:
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise PlanPatchError(f"{path} needs a list of strings")
+    return value
+
+
+def _apply_one(plan: dict, operation: Any) -> int | None:
+    """Apply one operation in place; return the week index it touched, if any."""
+    if not isinstance(operation, dict):
+        raise PlanPatchError("operation must be an object")
+    op, path, value = operation.get("op"), operation.get("path"), operation.get("value")
+    if op not in ("replace", "add", "remove") or not isinstance(path, str) or not path.startswith("/"):
+        raise PlanPatchError(f"unsupported operation {op!r} on {path!r}")
+    tokens = path[1:].split("/")
+
+    if tokens == ["summary"] and op == "replace":
+        if not isinstance(value, str):
+            raise PlanPatchError("/summary needs a string")
+        plan["summary"] = value
+        return None
+    if tokens == ["focus_areas"] and op == "replace":
+        plan["focus_areas"] = _check_strings(value, path)
+        return None
+    if tokens[0] != "weekly_plan" or len(tokens) not in (3, 4):
+        raise PlanPatchError(f"path {path!r} is outside weekly_plan fields")
+
+    weeks = plan.get("weekly_plan") or []
+    week_index = _index(tokens[1], len(weeks))
+    week, field = weeks[week_index], tokens[2]
+
+    if len(tokens) == 3:
+        if op != "replace":
+            raise PlanPatchError(f"only replace is allowed on {path!r}")
+        if field in PLAN_TEXT_FIELDS:
+            if not isinstance(value, str):
+                raise PlanPatchError(f"{path} needs a string")
+            week[field] = value
+        elif field in PLAN_LIST_FIELDS:
+            week[field] = _check_strings(value, path)
+        else:
+            raise PlanPatchError(f"field {field!r} cannot be edited")
+        return week_index
+
+    if field not in PLAN_LIST_FIELDS:
+        raise PlanPatchError(f"field {field!r} is not a list")
+    items = week.setdefault(field, [])
+    item_index = _index(tokens[3], len(items), allow_end=(op == "add"))
+    if op == "remove":
+        del items[item_index]
+    elif not isinstance(value, str):
+        raise PlanPatchError(f"{path} needs a string")
+    elif op == "add":
+        items.insert(item_index, value)
+    else:
+        items[item_index] = value
+    return week_index
+
+
+def apply_plan_patch(plan: dict, operations: Any) -> tuple[dict, list[int]]:
+    """Return a patched copy of ``plan`` and the indexes of the weeks changed.
+
+    All operations are validated before the result is returned, so a
+    ``PlanPatchError`` leaves nothing half-applied.
+    """
+    if not isinstance(operations, list) or not operations:
+        raise PlanPatchError("no operations")
+    patched = copy.deepcopy(plan)
+    touched: list[int] = []
+    for operation in operations:
+        week_index = _apply_one(patched, operation)
+        if week_index is not None and week_index not in touched:
+            touched.append(week_index)
+    return patched, touched
@@ -0,0 +1,100 @@
+"""Token-budgeted prompt assembly.
+
+A prompt is built from named sections, each with a priority. When the
+sections together exceed the call's token budget, the lowest-priority
+trimmable sections are cut first: list sections lose items from the end,
+text sections are truncated. Required sections are never touched.
+
+Token counts use ``tiktoken`` when it is installed and a characters-per-token
+estimate otherwise; both are close enough for budgeting, and the provider's
+own ``usage`` numbers are what get logged after each call.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import math
+from dataclasses import dataclass, field
+from typing import Any
+
+_CHARS_PER_TOKEN = 4.0
+_encoding = None
+if importlib.util.find_spec("tiktoken") is not None:
+    import tiktoken
+
+    _encoding = tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+
+def compact_json(value: Any) -> str:
+    """JSON without indentation or spaces after separators."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+@dataclass
+class _Section:
+    name: str
+    text: str = ""
+    items: list[str] | None = None
+    prefix: str = ""
+    joiner: str = ", "
+    priority: int = 0
+    required: bool = False
+
+    def render(self) -> str:
+        if self.items is not None:
+            return f"{self.prefix}{self.joiner.join(self.items)}" if self.items else ""
+        return self.text
+
+
+@dataclass
+class PromptBuilder:
+    budget: int
+    sections: list[_Section] = field(default_factory=list)
+
+    def text(self, name: str, text: str, priority: int = 0, required: bool = False) -> PromptBuilder:
+        self.sections.append(_Section(name, text=text, priority=priority, required=required))
+        return self
+
+    def items(
+        self,
+        name: str,
+        items: list[str],
+        prefix: str = "",
+        joiner: str = ", ",
+        priority: int = 0,
+    ) -> PromptBuilder:
+        """A list section (keywords, repos ...) that trims by dropping trailing items."""
+        self.sections.append(_Section(name, items=list(items), prefix=prefix, joiner=joiner, priority=priority))
+        return self
+
+    def _total(self) -> int:
+        return count_tokens("".join(s.render() for s in self.sections))
+
+    def build(self) -> str:
+        """Render all sections in insertion order, trimmed to the budget."""
+        excess = self._total() - self.budget
+        for section in sorted(self.sections, key=lambda s: s.priority):
+            if excess <= 0:
+                break
+            if section.required:
+                continue
+            before = count_tokens(section.render())
+            if section.items is not None:
+                while section.items and count_tokens(section.render()) > before - excess:
+                    section.items.pop()
+            else:
+                keep_chars = max(0, len(section.text) - math.ceil(excess * _CHARS_PER_TOKEN))
+                section.text = section.text[:keep_chars]
+                while section.text and count_tokens(section.text) > before - excess:
+                    section.text = section.text[: int(len(section.text) * 0.9)]
+            excess -= before - count_tokens(section.render())
+        return "".join(s.render() for s in self.sections)
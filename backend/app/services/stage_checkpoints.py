@@ -0,0 +1,83 @@
+"""Checkpoints of finished pipeline stages, per application.
+
+Intake and ``/verify`` run as named stages; each stage that succeeds stores
+its output in ``stage_results`` under a fingerprint of its inputs. When a
+run fails part-way and is retried (the job is requeued, a worker restarts
+or ``/verify`` is called again), stages whose inputs are unchanged return
+their stored output instead of running again, so only the failed stage is
+repeated. A run that completes clears its checkpoints: the results live on
+the application from then on, and the next run starts fresh.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any
+
+from sqlalchemy.exc import IntegrityError
+
+from app.database import SessionLocal
+from app.models.job import StageResult
+
+
+def _material(value: Any) -> str:
+    if isinstance(value, bytes):
+        return hashlib.sha256(value).hexdigest()
+    return str(value)
+
+
+def fingerprint(inputs: Any) -> str:
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=_material).encode()).hexdigest()
+
+
+class StageCheckpoints:
+    def __init__(self, application_id: int, pipeline: str) -> None:
+        self.application_id = application_id
+        self.pipeline = pipeline
+
+    def _query(self, db, stage: str | None = None):
+        query = db.query(StageResult).filter(
+            StageResult.application_id == self.application_id,
+            StageResult.pipeline == self.pipeline,
+        )
+        return query if stage is None else query.filter(StageResult.stage == stage)
+
+    def load(self, stage: str, fp: str) -> tuple[bool, Any]:
+        """``(True, output)`` if ``stage`` already succeeded on the same inputs."""
+        db = SessionLocal()
+        try:
+            row = self._query(db, stage).first()
+            if row is None or row.fingerprint != fp:
+                return False, None
+            return True, json.loads(row.output_json)
+        finally:
+            db.close()
+
+    def save(self, stage: str, fp: str, output: Any, duration_ms: float | None = None) -> None:
+        values = {
+            "fingerprint": fp,
+            "output_json": json.dumps(output, default=str),
+            "duration_ms": duration_ms,
+        }
+        db = SessionLocal()
+        try:
+            if not self._query(db, stage).update(values, synchronize_session=False):
+                db.add(StageResult(
+                    application_id=self.application_id, pipeline=self.pipeline, stage=stage, **values,
+                ))
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another run of the same pipeline stored this stage first
+                db.rollback()
+        finally:
+            db.close()
+
+    def clear(self) -> None:
+        db = SessionLocal()
+        try:
+            self._query(db).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
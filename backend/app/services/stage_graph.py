@@ -0,0 +1,253 @@
+"""Dependency-graph executor for pipeline stages.
+
+A pipeline registers each stage with the inputs it reads: values passed to
+``run`` or the outputs of other stages. ``run`` starts every stage as soon
+as its inputs are ready, so stages that do not depend on each other overlap
+(intake's GitHub fetch and PDF parse; the crew and the government check in
+``/verify``). A stage runs according to its kind:
+
+* ``io``: a coroutine function, awaited on the caller's loop;
+* ``thread``: a blocking function, run in a thread;
+* ``cpu``: a CPU-bound function, run in the ``PIPELINE_CPU_EXECUTOR`` pool
+  (with ``process`` it and its inputs must be picklable).
+
+Each stage has a timeout (``PIPELINE_STAGE_TIMEOUTS`` overrides the
+defaults) and goes through ``StageTracker.run``, so it is tracked and
+checkpointed. When a stage fails, the stages already running are allowed
+to finish, keeping their checkpoints for the retry, and the first error is
+raised. Every run stores its per-stage timings in ``pipeline_runs``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from app.core.concurrency import CPUPool
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.job import PipelineRun
+from app.services.job_queue import StageTracker
+
+KINDS = ("io", "thread", "cpu")
+
+# Seconds; generous, they only stop a stage that hangs
+_DEFAULT_TIMEOUTS = {
+    "github": settings.github_max_wait_seconds + settings.github_deadline_seconds + 30,
+    "resume": 60,
+    "scores": 30,
+    "llm_analysis": 300,
+    "save": 30,
+    "verification": 900,
+    "crew": 900,
+    "government": 60,
+}
+
+
+def _parse_timeouts(raw: str) -> dict[str, float]:
+    if not raw:
+        return {}
+    try:
+        timeouts = json.loads(raw)
+    except ValueError:
+        print("[pipeline] Ignoring PIPELINE_STAGE_TIMEOUTS: not valid JSON")
+        return {}
+    return {k: float(v) for k, v in timeouts.items() if isinstance(v, (int, float))}
+
+
+STAGE_TIMEOUTS = {**_DEFAULT_TIMEOUTS, **_parse_timeouts(settings.pipeline_stage_timeouts)}
+
+cpu_pool = CPUPool(settings.pipeline_cpu_executor, settings.pipeline_cpu_workers)
+
+
+class StageTimeout(TimeoutError):
+    pass
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    fn: Callable[..., Any]
+    inputs: tuple[str, ...]
+    kind: str
+    timeout: float | None
+    # Called with the inputs; a false result skips the stage (output None)
+    when: Callable[..., bool] | None
+    # A failed optional stage is logged and outputs None instead of failing the run
+    optional: bool
+
+
+class StageGraph:
+    def __init__(self, pipeline: str) -> None:
+        self.pipeline = pipeline
+        self.stages: dict[str, Stage] = {}
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        inputs: tuple[str, ...] = (),
+        kind: str = "io",
+        timeout: float | None = None,
+        when: Callable[..., bool] | None = None,
+        optional: bool = False,
+    ) -> None:
+        """Register stage ``name``; ``fn`` is called with ``inputs`` in order."""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown stage kind: {kind}")
+        if name in self.stages:
+            raise ValueError(f"Stage {name} is already registered")
+        if timeout is None:
+            timeout = STAGE_TIMEOUTS.get(name)
+        self.stages[name] = Stage(name, fn, tuple(inputs), kind, timeout, when, optional)
+
+    def _check(self, values: dict[str, Any]) -> None:
+        for stage in self.stages.values():
+            for name in stage.inputs:
+                if name not in values and name not in self.stages:
+                    raise ValueError(f"Stage {stage.name} reads unknown input {name}")
+        # Kahn's algorithm: every stage must become runnable
+        ready = set(values)
+        remaining = dict(self.stages)
+        while remaining:
+            runnable = [n for n, s in remaining.items() if all(i in ready for i in s.inputs)]
+            if not runnable:
+                raise ValueError(f"Stages {sorted(remaining)} form a dependency cycle")
+            for name in runnable:
+                ready.add(name)
+                del remaining[name]
+
+    async def _run_stage(self, stage: Stage, tracker: StageTracker, results: dict[str, Any]) -> Any:
+        args = [results[name] for name in stage.inputs]
+        if stage.when is not None and not stage.when(*args):
+            return None
+
+        async def compute() -> Any:
+            if stage.kind == "io":
+                work = stage.fn(*args)
+            elif stage.kind == "thread":
+                work = asyncio.to_thread(stage.fn, *args)
+            else:
+                work = cpu_pool.run(stage.fn, *args)
+            try:
+                return await asyncio.wait_for(work, stage.timeout)
+            except asyncio.TimeoutError:
+                raise StageTimeout(f"Stage {stage.name} timed out after {stage.timeout:g}s") from None
+
+        try:
+            return await tracker.run(stage.name, dict(zip(stage.inputs, args)), compute)
+        except Exception as exc:
+            if not stage.optional:
+                raise
+            print(f"[pipeline] {self.pipeline} stage {stage.name} failed (non-fatal): {exc!r}")
+            return None
+
+    async def run(
+        self,
+        tracker: StageTracker,
+        values: dict[str, Any],
+        application_id: int | None = None,
+    ) -> dict[str, Any]:
+        """Run every stage; returns ``values`` plus each stage's output by name."""
+        self._check(values)
+        results = dict(values)
+        pending = dict(self.stages)
+        running: dict[asyncio.Task, str] = {}
+        first_stage = len(tracker.stages)
+        started = time.perf_counter()
+        error: BaseException | None = None
+        try:
+            while pending or running:
+                if error is None:
+                    for name, stage in list(pending.items()):
+                        if all(i in results for i in stage.inputs):
+                            del pending[name]
+                            running[asyncio.create_task(self._run_stage(stage, tracker, results))] = name
+                if not running:
+                    break
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                    else:
+                        results[name] = task.result()
+        except BaseException as exc:
+            # Cancelled from outside: stop the stages still running
+            for task in running:
+                task.cancel()
+            error = error or exc
+            raise
+        finally:
+            if application_id is not None:
+                record_run(
+                    application_id,
+                    self.pipeline,
+                    tracker.job_id or uuid.uuid4().hex,
+                    "failed" if error is not None else "succeeded",
+                    (time.perf_counter() - started) * 1000,
+                    tracker.stages[first_stage:],
+                )
+        if error is not None:
+            raise error
+        return results
+
+
+def record_run(
+    application_id: int,
+    pipeline: str,
+    run_id: str,
+    status: str,
+    wall_ms: float,
+    stages: list[dict[str, Any]],
+) -> None:
+    db = SessionLocal()
+    try:
+        # A retried job keeps its id; its latest attempt replaces the row
+        db.merge(PipelineRun(
+            id=run_id,
+            application_id=application_id,
+            pipeline=pipeline,
+            status=status,
+            wall_ms=round(wall_ms, 1),
+            stages_json=json.dumps(stages),
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def timing_breakdown(application_id: int, limit: int = 10) -> list[dict[str, Any]]:
+    """Recent pipeline runs of an application, newest first.
+
+    ``stage_ms`` sums the stage durations; more than ``wall_ms`` means
+    stages overlapped.
+    """
+    db = SessionLocal()
+    try:
+        runs = (
+            db.query(PipelineRun)
+            .filter(PipelineRun.application_id == application_id)
+            .order_by(PipelineRun.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+    finally:
+        db.close()
+    breakdown = []
+    for run in runs:
+        stages = json.loads(run.stages_json or "[]")
+        breakdown.append({
+            "run_id": run.id,
+            "pipeline": run.pipeline,
+            "status": run.status,
+            "created_at": run.created_at,
+            "wall_ms": run.wall_ms,
+            "stage_ms": round(sum(stage.get("duration_ms", 0) for stage in stages), 1),
+            "stages": stages,
+        })
+    return breakdown
@@ -0,0 +1,208 @@
+"""Recorded GitHub fixtures shared by the benchmarks and stand-in servers.
+
+A fixture file maps REST paths (without query string) to the JSON bodies
+GitHub returned for them. GraphQL answers are derived from the same data so
+both backends see an identical profile. ``synthetic_fixture`` generates
+many such profiles for load tests that must not hit a warm cache, and
+``resume_pdf`` a one-page resume for the intake benchmarks.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+DEFAULT_FIXTURE = FIXTURES_DIR / "github_profile.json"
+
+
+def load_fixture(path: Path = DEFAULT_FIXTURE) -> dict[str, Any]:
+    with open(path) as fh:
+        return json.load(fh)
+
+
+_LANGUAGES = ["Python", "TypeScript", "JavaScript", "Go", "Rust", "Java", "Shell", "HTML", "CSS", "Dockerfile"]
+
+
+def synthetic_fixture(users: int = 32, repos: int = 30, seed: int = 0) -> dict[str, Any]:
+    """Generate ``users`` profiles (``bench-user-000`` ...) with ``repos`` repos each.
+
+    Push dates fall within the last year relative to now, so the 90-day
+    commit window always has something to count.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    responses: dict[str, Any] = {}
+    usernames = [f"bench-user-{i:03d}" for i in range(users)]
+    for login in usernames:
+        responses[f"/users/{login}"] = {"login": login, "type": "User", "public_repos": repos}
+        repo_list = []
+        for j in range(repos):
+            name = f"repo-{j:02d}"
+            languages = rng.sample(_LANGUAGES, rng.randint(1, 3))
+            pushed_at = now - timedelta(days=rng.expovariate(1 / 60), minutes=rng.randint(0, 1440))
+            repo_list.append({
+                "name": name,
+                "full_name": f"{login}/{name}",
+                "fork": rng.random() < 0.1,
+                "owner": {"login": login},
+                "stargazers_count": int(rng.paretovariate(1.5)) - 1,
+                "language": languages[0],
+                "pushed_at": pushed_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            })
+            base = f"/repos/{login}/{name}"
+            responses[f"{base}/languages"] = {lang: rng.randint(500, 250_000) for lang in languages}
+            recent = (now - pushed_at).days < 90
+            responses[f"{base}/commits"] = [
+                {"sha": hashlib.sha1(f"{base}/{k}".encode()).hexdigest()}
+                for k in range(rng.randint(1, 60) if recent else 0)
+            ]
+        responses[f"/users/{login}/repos"] = repo_list
+    return {"username": usernames[0], "usernames": usernames, "responses": responses}
+
+
+_RESUME_SKILLS = ["Python", "FastAPI", "PostgreSQL", "Docker", "Kubernetes", "React", "TypeScript", "Redis", "AWS", "Git"]
+
+
+def resume_pdf(name: str, experience_lines: int = 40, seed: int = 0) -> bytes:
+    """A minimal single-page PDF resume, built without a PDF library.
+
+    ``experience_lines`` sets how much text it carries, which is what makes
+    parsing it cost CPU time.
+    """
+    rng = random.Random(seed)
+    lines = [name, "Backend Engineer", "Skills: " + ", ".join(rng.sample(_RESUME_SKILLS, 6)), "Experience"]
+    for i in range(experience_lines):
+        skills = " and ".join(rng.sample(_RESUME_SKILLS, 2))
+        lines.append(f"- Built service {i} with {skills}, cutting latency by {rng.randint(10, 60)} percent")
+    text = "BT /F1 9 Tf 40 780 Td 11 TL " + " ".join(f"({line}) '" for line in lines) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(text)} >>\nstream\n{text}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+
+def rest_body(fixture: dict[str, Any], path: str) -> Any | None:
+    path = path.rstrip("/")
+    if path.endswith("/stats/participation"):
+        # Not recorded; place every fixture commit in the current week
+        commits = fixture["responses"].get(path.replace("/stats/participation", "/commits"))
+        if commits is None:
+            return None
+        return {"all": [0] * 51 + [len(commits)], "owner": [0] * 51 + [len(commits)]}
+    return fixture["responses"].get(path)
+
+
+def rest_response(
+    fixture: dict[str, Any], path: str, params: dict[str, str]
+) -> tuple[Any | None, dict[str, str]]:
+    """Body and extra headers for a REST GET, paginating lists like GitHub.
+
+    List bodies honour ``per_page`` / ``page`` and carry a ``Link`` header
+    with ``rel="next"`` / ``rel="last"`` entries.
+    """
+    body = rest_body(fixture, path)
+    if not isinstance(body, list) or "per_page" not in params:
+        return body, {}
+
+    per_page = max(1, int(params["per_page"]))
+    page = max(1, int(params.get("page", 1)))
+    last = max(1, -(-len(body) // per_page))
+    page_body = body[(page - 1) * per_page: page * per_page]
+
+    links = []
+    base = "&".join(f"{k}={v}" for k, v in params.items() if k != "page")
+    if page < last:
+        links.append(f'<https://api.github.com{path}?{base}&page={page + 1}>; rel="next"')
+        links.append(f'<https://api.github.com{path}?{base}&page={last}>; rel="last"')
+    return page_body, {"Link": ", ".join(links)} if links else {}
+
+
+def graphql_body(fixture: dict[str, Any], login: str, with_details: bool) -> dict[str, Any]:
+    """Build the response to ``github_graphql.REPOS_QUERY`` from REST fixtures."""
+    responses = fixture["responses"]
+    if f"/users/{login}" not in responses:
+        return {
+            "data": {"user": None},
+            "errors": [{"type": "NOT_FOUND", "message": f"Could not resolve to a User with the login of '{login}'."}],
+        }
+
+    repos = [r for r in responses.get(f"/users/{login}/repos", []) if not r.get("fork")]
+    repos.sort(key=lambda r: r.get("pushed_at") or "", reverse=True)
+
+    user: dict[str, Any] = {
+        "repositories": {
+            "pageInfo": {"hasNextPage": False, "endCursor": None},
+            "nodes": [
+                {
+                    "name": r["name"],
+                    "stargazerCount": r.get("stargazers_count", 0),
+                    "pushedAt": r.get("pushed_at"),
+                    "owner": {"login": login},
+                    "primaryLanguage": {"name": r["language"]} if r.get("language") else None,
+                }
+                for r in repos
+            ],
+        }
+    }
+    if with_details:
+        user["recent"] = {
+            "nodes": [
+                {
+                    "name": r["name"],
+                    "languages": {
+                        "edges": [
+                            {"size": size, "node": {"name": lang}}
+                            for lang, size in responses.get(f"/repos/{login}/{r['name']}/languages", {}).items()
+                        ]
+                    },
+                    "defaultBranchRef": {
+                        "target": {
+                            "history": {
+                                "totalCount": len(responses.get(f"/repos/{login}/{r['name']}/commits", []))
+                            }
+                        }
+                    },
+                }
+                for r in repos[:10]
+            ]
+        }
+    return {"data": {"user": user}}
+
+
+def record_fixture(username: str, token: str, path: Path) -> None:
+    """Record a live GitHub profile into a fixture file (REST endpoints only)."""
+    import httpx
+
+    headers = {"Accept": "application/vnd.github+json", "Authorization": f"Bearer {token}"}
+    responses: dict[str, Any] = {}
+    with httpx.Client(base_url="https://api.github.com", headers=headers, timeout=10.0) as client:
+        responses[f"/users/{username}"] = client.get(f"/users/{username}").json()
+        repos = client.get(f"/users/{username}/repos", params={"per_page": 100}).json()
+        responses[f"/users/{username}/repos"] = repos
+        for repo in repos:
+            base = f"/repos/{username}/{repo['name']}"
+            responses[f"{base}/languages"] = client.get(f"{base}/languages").json()
+            commits = client.get(f"{base}/commits", params={"per_page": 100})
+            responses[f"{base}/commits"] = commits.json() if commits.status_code == 200 else []
+
+    with open(path, "w") as fh:
+        json.dump({"username": username, "responses": responses}, fh, indent=1)
@@ -0,0 +1,123 @@
+"""Compare the REST and GraphQL GitHub backends on recorded fixtures.
+
+Run from the backend directory:
+    .venv/bin/python -m bench.github_backends [--latency 0.08] [--runs 5]
+
+Every request is answered from ``bench/fixtures`` after a simulated network
+round trip, so the numbers isolate request count, bytes transferred and
+fan-out from GitHub's own response times. Set ``GITHUB_COMMIT_COUNT`` to
+compare commit counting strategies. Record a real profile first with
+``--record <username>`` (needs GITHUB_TOKEN) to benchmark against it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+# Measure the network path, not the response cache; GraphQL needs a token.
+os.environ.setdefault("GITHUB_CACHE_ENABLED", "false")
+os.environ.setdefault("GITHUB_TOKENS", "bench-token")
+# Per-repo snapshots are written on every fetch; keep them out of the app DB
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+import httpx  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.database import Base, engine  # noqa: E402
+from app.services import github_service  # noqa: E402
+from bench.fixtures import DEFAULT_FIXTURE, graphql_body, load_fixture, record_fixture, rest_response  # noqa: E402
+
+
+def _make_transport(fixture: dict, latency: float, counter: list[int]) -> httpx.MockTransport:
+    """Answer from fixtures; ``counter`` accumulates [requests, response bytes]."""
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/graphql":
+            variables = json.loads(request.content)["variables"]
+            return httpx.Response(200, json=graphql_body(fixture, variables["login"], variables["withDetails"]))
+        body, headers = rest_response(fixture, request.url.path, dict(request.url.params))
+        if body is None:
+            return httpx.Response(404, json={"message": "Not Found"})
+        return httpx.Response(200, json=body, headers=headers)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        resp = respond(request)
+        counter[0] += 1
+        counter[1] += len(resp.content)
+        return resp
+
+    return httpx.MockTransport(handler)
+
+
+async def _run_backend(backend: str, fixture: dict, latency: float, runs: int) -> dict:
+    github_service.settings = replace(github_service.settings, github_backend=backend)
+    counter = [0, 0]
+    timings = []
+    metrics = None
+    async with httpx.AsyncClient(transport=_make_transport(fixture, latency, counter)) as client:
+        for _ in range(runs):
+            start = time.perf_counter()
+            metrics = await github_service.fetch_github_metrics_async(fixture["username"], client=client)
+            timings.append(time.perf_counter() - start)
+
+    return {
+        "backend": backend,
+        "requests_per_fetch": counter[0] / runs,
+        "kb_per_fetch": counter[1] / runs / 1024,
+        "wall_ms_p50": round(statistics.median(timings) * 1000, 1),
+        "wall_ms_max": round(max(timings) * 1000, 1),
+        "metrics": metrics,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    Base.metadata.create_all(bind=engine)
+    fixture = load_fixture(Path(args.fixture))
+    results = [
+        await _run_backend(backend, fixture, args.latency, args.runs)
+        for backend in ("rest", "graphql")
+    ]
+
+    print(f"commit counting: {github_service.settings.github_commit_count}")
+    print(f"{'backend':<10}{'requests':>10}{'kB':>10}{'p50 ms':>10}{'max ms':>10}")
+    for r in results:
+        print(
+            f"{r['backend']:<10}{r['requests_per_fetch']:>10.1f}{r['kb_per_fetch']:>10.1f}"
+            f"{r['wall_ms_p50']:>10}{r['wall_ms_max']:>10}"
+        )
+
+    rest, graphql = results[0]["metrics"], results[1]["metrics"]
+    mismatched = [key for key in rest if rest[key] != graphql[key]]
+    print("schema match:", sorted(rest) == sorted(graphql))
+    if mismatched:
+        print("differing fields:", ", ".join(mismatched))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixture", default=str(DEFAULT_FIXTURE))
+    parser.add_argument("--latency", type=float, default=0.08, help="simulated round trip in seconds")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--record", metavar="USERNAME", help="record a live profile into --fixture and exit")
+    args = parser.parse_args()
+
+    if args.record:
+        token = os.environ.get("GITHUB_TOKEN")
+        if not token or token == "bench-token":
+            sys.exit("--record needs a real GITHUB_TOKEN")
+        record_fixture(args.record, token, Path(args.fixture))
+        print(f"recorded {args.record} -> {args.fixture}")
+    else:
+        asyncio.run(main(args))
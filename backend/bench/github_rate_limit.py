@@ -0,0 +1,85 @@
+"""Check that GitHub rate limits delay metric fetches instead of degrading them.
+
+Run from the backend directory:
+    .venv/bin/python -m bench.github_rate_limit [--fetches 8] [--quota 40] [--window 4]
+
+Starts the GitHub stand-in with a small per-token quota, points the backend
+at it with two tokens and fires concurrent fetches that need several quota
+windows to complete. Every fetch must return the full profile (never the
+empty fallback), and the scheduler's budget metrics are printed at the end.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from bench.load import free_port  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fetches", type=int, default=8)
+    parser.add_argument("--quota", type=int, default=40, help="requests per token per window")
+    parser.add_argument("--window", type=float, default=4.0)
+    parser.add_argument("--retry-after", action="store_true")
+    args = parser.parse_args()
+
+    port = free_port()
+    os.environ["GITHUB_API_URL"] = f"http://127.0.0.1:{port}"
+    os.environ["GITHUB_TOKENS"] = "standin-token-a,standin-token-b"
+    os.environ["GITHUB_CACHE_ENABLED"] = "false"
+    os.environ["GITHUB_METRICS_TTL_SECONDS"] = "0"
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+    os.environ.setdefault("GITHUB_MAX_WAIT_SECONDS", str(args.window * 10))
+
+    import app.models  # noqa: F401
+    from app.core.http import http_clients
+    from app.database import Base, engine
+    from app.services.github_ratelimit import rate_limit_stats
+    from app.services.github_service import fetch_github_metrics_async
+    from bench.fixtures import load_fixture
+    from bench.github_standin import StandinConfig, create_app, serve_in_thread
+
+    Base.metadata.create_all(bind=engine)
+    fixture = load_fixture()
+    standin = create_app(fixture, StandinConfig(quota=args.quota, window=args.window, retry_after=args.retry_after))
+    server = serve_in_thread(standin, port)
+
+    async def run() -> list[dict]:
+        # An explicit client skips the metrics cache and the single-flight that
+        # would merge these identical fetches into one; each must pay its quota
+        async with httpx.AsyncClient() as client:
+            return await asyncio.gather(
+                *(fetch_github_metrics_async(fixture["username"], client=client) for _ in range(args.fetches))
+            )
+
+    start = time.perf_counter()
+    try:
+        results = asyncio.run(run())
+    finally:
+        elapsed = time.perf_counter() - start
+        server.should_exit = True
+        http_clients.close()
+
+    degraded = [r for r in results if r["total_public_repos"] == 0]
+    consistent = all(r == results[0] for r in results)
+    print(f"fetches: {len(results)}  elapsed: {elapsed:.1f}s  degraded: {len(degraded)}  consistent: {consistent}")
+    print(f"stand-in: {standin.state.standin.requests} requests, "
+          f"{standin.state.standin.rate_limited} rate-limited responses")
+    print(json.dumps(rate_limit_stats()["core"], indent=2))
+    if degraded or not consistent:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
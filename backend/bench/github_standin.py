@@ -0,0 +1,203 @@
+"""Local stand-in for the GitHub API, serving recorded fixtures.
+
+Run from the backend directory:
+    .venv/bin/python -m bench.github_standin --port 8765 --quota 5000 --window 3600 \
+        [--synthetic 32] [--latency 0.05 --jitter 0.1] [--error-rate 0.01]
+
+then point the backend at it with ``GITHUB_API_URL=http://127.0.0.1:8765``.
+Each token (Authorization header) gets its own quota per window and every
+response carries GitHub's ``X-RateLimit-*`` headers. Exhausted tokens get a
+403 like the real API; ``If-None-Match`` hits return an uncharged 304.
+Every response is delayed by ``latency`` plus an exponentially distributed
+``jitter`` (mean), and ``error_rate`` of them fail with a 502.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+from bench.fixtures import DEFAULT_FIXTURE, graphql_body, load_fixture, rest_response, synthetic_fixture
+
+
+@dataclass
+class StandinConfig:
+    quota: int = 5000
+    window: float = 3600.0
+    retry_after: bool = False
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    seed: int | None = None
+
+
+@dataclass
+class _Window:
+    reset_at: float
+    used: int = 0
+
+
+@dataclass
+class StandinState:
+    config: StandinConfig
+    windows: dict[str, _Window] = field(default_factory=dict)
+    requests: int = 0
+    rate_limited: int = 0
+    errors: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    rng: random.Random = field(default_factory=random.Random)
+
+    def __post_init__(self) -> None:
+        self.rng.seed(self.config.seed)
+
+    async def delay(self) -> None:
+        """Sleep for the fixed latency plus a random jitter draw."""
+        with self.lock:
+            extra = self.rng.expovariate(1 / self.config.jitter) if self.config.jitter > 0 else 0.0
+        if self.config.latency + extra > 0:
+            await asyncio.sleep(self.config.latency + extra)
+
+    def fail(self) -> bool:
+        """Draw whether this request should fail with a server error."""
+        with self.lock:
+            failed = self.config.error_rate > 0 and self.rng.random() < self.config.error_rate
+            if failed:
+                self.errors += 1
+            return failed
+
+    def charge(self, key: str, cost: int) -> tuple[bool, dict[str, str]]:
+        """Charge ``cost`` units to ``key``; return (allowed, rate-limit headers)."""
+        now = time.time()
+        with self.lock:
+            self.requests += 1
+            window = self.windows.get(key)
+            if window is None or now >= window.reset_at:
+                window = self.windows[key] = _Window(reset_at=now + self.config.window)
+            allowed = window.used + cost <= self.config.quota
+            if allowed:
+                window.used += cost
+            else:
+                self.rate_limited += 1
+            headers = {
+                "X-RateLimit-Limit": str(self.config.quota),
+                "X-RateLimit-Remaining": str(max(0, self.config.quota - window.used)),
+                "X-RateLimit-Reset": str(int(window.reset_at) + 1),
+                "X-RateLimit-Used": str(window.used),
+            }
+            if not allowed and self.config.retry_after:
+                headers["Retry-After"] = str(int(window.reset_at - now) + 1)
+            return allowed, headers
+
+
+def create_app(fixture: dict[str, Any], config: StandinConfig) -> FastAPI:
+    app = FastAPI(title="GitHub API stand-in")
+    state = StandinState(config=config)
+    app.state.standin = state
+
+    def _server_error() -> JSONResponse:
+        return JSONResponse({"message": "Server Error"}, status_code=502)
+
+    def _limited(headers: dict[str, str]) -> JSONResponse:
+        return JSONResponse(
+            {"message": "API rate limit exceeded", "documentation_url": "https://docs.github.com/rest/rate-limit"},
+            status_code=403,
+            headers=headers,
+        )
+
+    @app.get("/_standin/stats")
+    def stats():
+        return {"requests": state.requests, "rate_limited": state.rate_limited, "errors": state.errors}
+
+    @app.post("/graphql")
+    async def graphql(request: Request):
+        await state.delay()
+        if state.fail():
+            return _server_error()
+        token = request.headers.get("Authorization", "anonymous")
+        allowed, headers = state.charge(f"graphql:{token}", 1)
+        headers["X-RateLimit-Resource"] = "graphql"
+        if not allowed:
+            return _limited(headers)
+        variables = (await request.json())["variables"]
+        return JSONResponse(graphql_body(fixture, variables["login"], variables["withDetails"]), headers=headers)
+
+    @app.get("/{path:path}")
+    async def rest(path: str, request: Request):
+        await state.delay()
+        if state.fail():
+            return _server_error()
+        token = request.headers.get("Authorization", "anonymous")
+        body, extra_headers = rest_response(fixture, f"/{path}", dict(request.query_params))
+        payload = json.dumps(body).encode()
+        etag = f'W/"{hashlib.sha1(payload).hexdigest()}"'
+
+        # Conditional hits are not charged, like on the real API
+        not_modified = body is not None and request.headers.get("If-None-Match") == etag
+        allowed, headers = state.charge(f"core:{token}", 0 if not_modified else 1)
+        headers["X-RateLimit-Resource"] = "core"
+        if not allowed:
+            return _limited(headers)
+        if body is None:
+            return JSONResponse({"message": "Not Found"}, status_code=404, headers=headers)
+        headers["ETag"] = etag
+        headers.update(extra_headers)
+        if not_modified:
+            return Response(status_code=304, headers=headers)
+        return Response(payload, media_type="application/json", headers=headers)
+
+    return app
+
+
+def serve_in_thread(app: FastAPI, port: int):
+    """Start ``app`` with uvicorn on a daemon thread; returns the server."""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve recorded GitHub fixtures")
+    parser.add_argument("--fixture", default=str(DEFAULT_FIXTURE))
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--quota", type=int, default=5000, help="requests per token per window")
+    parser.add_argument("--window", type=float, default=3600.0, help="rate-limit window in seconds")
+    parser.add_argument("--retry-after", action="store_true", help="send Retry-After on 403s")
+    parser.add_argument("--synthetic", type=int, metavar="USERS", help="serve generated profiles instead of --fixture")
+    parser.add_argument("--latency", type=float, default=0.0, help="fixed delay per response in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="mean of extra exponential delay in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 502")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    fixture = synthetic_fixture(args.synthetic) if args.synthetic else load_fixture(Path(args.fixture))
+    standin = create_app(
+        fixture,
+        StandinConfig(
+            quota=args.quota,
+            window=args.window,
+            retry_after=args.retry_after,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            seed=args.seed,
+        ),
+    )
+    uvicorn.run(standin, host="127.0.0.1", port=args.port, access_log=False)
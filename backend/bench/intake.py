@@ -0,0 +1,201 @@
+"""Load-test GitHub metric fetches and the full intake path against the stand-in.
+
+Run from the backend directory:
+    .venv/bin/python -m bench.intake [--mode fetch|intake|both] [--levels 1,4,16,32] \\
+        [--requests 64] [--latency 0.05 --jitter 0.05] [--error-rate 0.0] \\
+        [--llm --llm-latency 0.3 --llm-token-latency 0.002] [--job-workers 8]
+
+Starts the GitHub stand-in in a subprocess with synthetic profiles, then
+
+* ``fetch``: calls ``fetch_github_metrics_async`` in-process;
+* ``intake``: starts the API with uvicorn in a second subprocess, posts
+  multipart ``POST /applications`` forms to it and polls each accepted
+  job's ``GET /jobs/{id}`` until it finishes, so latency is end to end;
+
+at each concurrency level, reporting p50 / p95 / p99 latency and requests
+per second. Fetches that come back empty (a failed ``/users`` or repo
+list call) and intake jobs that do not succeed count as errors. Every request uses a different synthetic user and both GitHub
+caches are disabled unless ``--warm`` is given, so each one pays for a full
+fetch. The LLM is disabled (no ``LLM_API_KEY``) to isolate the GitHub and
+scoring path, unless ``--llm`` is given: then ``bench.llm_standin`` runs in a
+third subprocess and intake makes its ATS and profile calls against it (the
+LLM reply cache is off unless ``--warm``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from bench.load import free_port, print_table, run_load  # noqa: E402
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _spawn(args: list[str], env: dict[str, str], ready_url: str) -> subprocess.Popen:
+    proc = subprocess.Popen([sys.executable, *args], cwd=BACKEND_DIR, env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"{args[1]} exited with {proc.returncode}")
+        try:
+            httpx.get(ready_url, timeout=1.0)
+            return proc
+        except httpx.TransportError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"{args[1]} did not start within 30s")
+
+
+async def bench_fetch(usernames: list[str], levels: list[int], requests: int) -> list[dict]:
+    from app.services.github_service import fetch_github_metrics_async
+
+    rows = []
+    offset = 0
+    for level in levels:
+        async def call(i: int, offset: int = offset) -> bool:
+            metrics = await fetch_github_metrics_async(usernames[(offset + i) % len(usernames)])
+            return metrics["total_public_repos"] > 0
+
+        rows.append((await run_load(call, requests, level)).summary())
+        offset += requests
+    return rows
+
+
+async def bench_intake(base_url: str, usernames: list[str], levels: list[int], requests: int) -> list[dict]:
+    rows = []
+    offset = 0
+    limits = httpx.Limits(max_connections=max(levels))
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0, limits=limits) as client:
+        for level in levels:
+            async def call(i: int, offset: int = offset) -> bool:
+                username = usernames[(offset + i) % len(usernames)]
+                resp = await client.post("/applications", data={
+                    "full_name": f"Bench Candidate {offset + i}",
+                    "email": f"candidate{offset + i}@bench.test",
+                    "github_url": f"https://github.com/{username}",
+                    "role_applied": "Backend Engineer",
+                })
+                if resp.status_code != 202:
+                    return False
+                job_url = resp.headers["Location"]
+                while True:
+                    job = (await client.get(job_url)).json()
+                    if job["status"] in ("succeeded", "failed"):
+                        return job["status"] == "succeeded"
+                    await asyncio.sleep(0.05)
+
+            rows.append((await run_load(call, requests, level)).summary())
+            offset += requests
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["fetch", "intake", "both"], default="both")
+    parser.add_argument("--levels", default="1,4,16,32", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=64, help="requests per level")
+    parser.add_argument("--users", type=int, default=64, help="synthetic GitHub profiles")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for --mode intake")
+    parser.add_argument("--job-workers", type=int, default=8, help="intake job workers per API worker")
+    parser.add_argument("--warm", action="store_true", help="keep the GitHub and LLM caches enabled")
+    parser.add_argument("--llm", action="store_true", help="run intake against the LLM stand-in")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="stand-in first-token delay")
+    parser.add_argument("--llm-token-latency", type=float, default=0.002, help="stand-in delay per output token")
+    args = parser.parse_args()
+    levels = [int(level) for level in args.levels.split(",")]
+
+    standin_port, api_port, llm_port = free_port(), free_port(), free_port()
+    # Applies to the in-process fetches and is inherited by both subprocesses
+    os.environ.pop("LLM_API_KEY", None)
+    os.environ.update({
+        "GITHUB_API_URL": f"http://127.0.0.1:{standin_port}",
+        "GITHUB_TOKENS": "standin-token",
+        "DATABASE_URL": f"sqlite:///{tempfile.mkdtemp()}/bench.db",
+        "JOB_INPROCESS_WORKERS": str(args.job_workers),
+        "JOB_POLL_SECONDS": "0.05",
+    })
+    if args.llm:
+        os.environ.update({"LLM_API_KEY": "standin-key", "LLM_BASE_URL": f"http://127.0.0.1:{llm_port}"})
+    if not args.warm:
+        os.environ.update({
+            "GITHUB_CACHE_ENABLED": "false",
+            "GITHUB_METRICS_TTL_SECONDS": "0",
+            "LLM_CACHE_TTL_SECONDS": "0",
+        })
+    env = dict(os.environ)
+
+    from bench.fixtures import synthetic_fixture
+
+    usernames = synthetic_fixture(args.users)["usernames"]
+    procs = [_spawn(
+        [
+            "-m", "bench.github_standin", "--port", str(standin_port), "--quota", str(10**9),
+            "--synthetic", str(args.users), "--latency", str(args.latency),
+            "--jitter", str(args.jitter), "--error-rate", str(args.error_rate), "--seed", "0",
+        ],
+        env,
+        f"http://127.0.0.1:{standin_port}/_standin/stats",
+    )]
+    if args.llm:
+        procs.append(_spawn(
+            [
+                "-m", "bench.llm_standin", "--port", str(llm_port), "--latency", str(args.llm_latency),
+                "--token-latency", str(args.llm_token_latency), "--seed", "0",
+            ],
+            env,
+            f"http://127.0.0.1:{llm_port}/_standin/stats",
+        ))
+    try:
+        print(f"stand-in latency {args.latency * 1000:.0f} ms + exp({args.jitter * 1000:.0f} ms), "
+              f"error rate {args.error_rate:.1%}, caches {'on' if args.warm else 'off'}\n")
+        if args.mode in ("fetch", "both"):
+            import app.models  # noqa: F401
+            from app.core.http import http_clients
+            from app.database import Base, engine
+
+            Base.metadata.create_all(bind=engine)
+            try:
+                print_table("fetch_github_metrics", asyncio.run(bench_fetch(usernames, levels, args.requests)))
+            finally:
+                http_clients.close()
+            print()
+
+        if args.mode in ("intake", "both"):
+            procs.append(_spawn(
+                [
+                    "-m", "uvicorn", "app.main:app", "--port", str(api_port),
+                    "--workers", str(args.workers), "--log-level", "warning",
+                ],
+                env,
+                f"http://127.0.0.1:{api_port}/health",
+            ))
+            base_url = f"http://127.0.0.1:{api_port}"
+            print_table("POST /applications", asyncio.run(bench_intake(base_url, usernames, levels, args.requests)))
+
+        stats = httpx.get(f"http://127.0.0.1:{standin_port}/_standin/stats").json()
+        print(f"\nstand-in: {stats['requests']} requests, {stats['errors']} injected errors")
+        if args.llm:
+            llm_stats = httpx.get(f"http://127.0.0.1:{llm_port}/_standin/stats").json()
+            print(f"LLM stand-in: {llm_stats['by_kind']}, {llm_stats['prompt_tokens']} prompt / "
+                  f"{llm_stats['completion_tokens']} completion tokens")
+    finally:
+        for proc in procs:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
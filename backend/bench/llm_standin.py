@@ -0,0 +1,351 @@
+"""Local stand-in for an OpenAI-compatible chat-completions API.
+
+Run from the backend directory:
+    .venv/bin/python -m bench.llm_standin --port 8766 [--latency 0.3 --jitter 0.2] \\
+        [--distribution exponential|lognormal|uniform] [--token-latency 0.005] \\
+        [--error-rate 0.01] [--rate-limit-rate 0.01] [--invalid-json-rate 0.01]
+
+then point the backend at it with ``LLM_BASE_URL=http://127.0.0.1:8766`` and
+any ``LLM_API_KEY``. The prompt type is recognised from the system prompt
+(resume ATS, profile analysis, training plan, plan modification as a full
+rewrite or as edit operations, and CrewAI agent turns) and answered with a
+reply that matches the schema ``llm_service`` and the verification crew
+expect. Replies carry ``usage`` token counts and honour ``stream=true``
+(server-sent events, with a final usage chunk when
+``stream_options.include_usage`` is set).
+
+Each response waits for a first-token delay drawn from ``--distribution``
+(``latency`` plus exponential ``jitter``, a log-normal with median
+``latency`` and sigma ``jitter``, or uniform in ``latency`` ± ``jitter``),
+then ``token_latency`` per completion token, so long outputs cost more than
+short ones. ``error_rate`` of requests fail with a 503, ``rate_limit_rate``
+with a 429 and ``Retry-After: 1``, and ``invalid_json_rate`` get a truncated
+JSON body.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.services.prompt_builder import count_tokens  # noqa: E402
+
+
+@dataclass
+class StandinConfig:
+    latency: float = 0.0
+    jitter: float = 0.0
+    distribution: str = "exponential"
+    token_latency: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    invalid_json_rate: float = 0.0
+    seed: int | None = None
+
+
+@dataclass
+class StandinState:
+    config: StandinConfig
+    requests: Counter = field(default_factory=Counter)
+    failures: Counter = field(default_factory=Counter)
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    rng: random.Random = field(default_factory=random.Random)
+
+    def __post_init__(self) -> None:
+        self.rng.seed(self.config.seed)
+
+    def first_token_delay(self) -> float:
+        config = self.config
+        with self.lock:
+            if config.distribution == "lognormal":
+                base = config.latency or 0.001
+                return self.rng.lognormvariate(0, config.jitter) * base if config.jitter > 0 else base
+            if config.distribution == "uniform":
+                return max(0.0, self.rng.uniform(config.latency - config.jitter, config.latency + config.jitter))
+            extra = self.rng.expovariate(1 / config.jitter) if config.jitter > 0 else 0.0
+            return config.latency + extra
+
+    def draw_failure(self) -> str | None:
+        """``server_error``, ``rate_limited``, ``invalid_json`` or ``None``."""
+        config = self.config
+        with self.lock:
+            roll = self.rng.random()
+            for failure, rate in (
+                ("server_error", config.error_rate),
+                ("rate_limited", config.rate_limit_rate),
+                ("invalid_json", config.invalid_json_rate),
+            ):
+                if roll < rate:
+                    self.failures[failure] += 1
+                    return failure
+                roll -= rate
+            return None
+
+    def record(self, kind: str, prompt_tokens: int, completion_tokens: int) -> None:
+        with self.lock:
+            self.requests[kind] += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+
+
+# Replies, by prompt type
+
+def _candidate(user_prompt: str) -> str:
+    match = re.search(r"^(?:Analyze candidate|Candidate): (.+)$", user_prompt, re.MULTILINE)
+    return match.group(1).strip() if match else "the candidate"
+
+
+def _week(number: int, topic: str) -> dict[str, Any]:
+    return {
+        "week": number,
+        "goal": f"Week {number}: strengthen {topic}",
+        "objectives": [f"Understand {topic} fundamentals", f"Apply {topic} in a small project"],
+        "topics": [topic, "Testing", "Code review"],
+        "tasks": [f"Build a {topic} exercise with tests"],
+        "deliverables": [f"{topic} exercise repository"],
+    }
+
+
+def _plan(weeks: int, name: str) -> dict[str, Any]:
+    topics = ["Python", "APIs", "Databases", "Testing", "Docker", "CI/CD", "Observability", "System design"]
+    return {
+        "summary": f"A {weeks}-week plan for {name} that closes the identified gaps step by step.",
+        "focus_areas": topics[:3],
+        "weekly_plan": [_week(i + 1, topics[i % len(topics)]) for i in range(weeks)],
+    }
+
+
+def _existing_plan(user_prompt: str) -> dict[str, Any]:
+    match = re.search(r"Current Training Plan:\n(.*?)\n\nAdmin's", user_prompt, re.DOTALL)
+    try:
+        return json.loads(match.group(1)) if match else {}
+    except ValueError:
+        return {}
+
+
+def _ats_reply(system: str, user: str) -> dict[str, Any]:
+    text = user.lower()
+    known = ["python", "javascript", "react", "fastapi", "django", "sql", "docker", "aws", "git", "java"]
+    found = [k for k in known if k in text]
+    return {
+        "ats_score": min(95, 40 + 6 * len(found)),
+        "keywords_detected": found,
+        "missing_keywords": [k for k in ("docker", "kubernetes", "ci/cd") if k not in found],
+        "suggestions": ["Quantify project impact", "List the tech stack for each project"],
+    }
+
+
+def _profile_reply(system: str, user: str) -> dict[str, Any]:
+    name = _candidate(user)
+    summary = " ".join([f"{name} shows consistent hands-on work across their public repositories."] * 12)
+    return {
+        "summary": summary,
+        "strengths": ["Regular commit history", "Practical backend projects", "Clean repository structure"],
+        "weaknesses": ["Limited automated testing", "Little deployment experience"],
+        "risks": ["Claimed skills only partly visible on GitHub"],
+        "growth_direction": "Deepen testing and deployment practice on existing projects.",
+    }
+
+
+def _plan_reply(system: str, user: str) -> dict[str, Any]:
+    match = re.search(r"Create exactly (\d+) weeks", system)
+    return _plan(int(match.group(1)) if match else 6, _candidate(user))
+
+
+def _modify_reply(system: str, user: str) -> dict[str, Any]:
+    plan = _existing_plan(user) or _plan(4, _candidate(user))
+    for week in plan.get("weekly_plan", [])[:1]:
+        week["goal"] = f"{week.get('goal', '')} (revised)"
+    return plan
+
+
+def _patch_reply(system: str, user: str) -> dict[str, Any]:
+    if not _existing_plan(user).get("weekly_plan"):
+        return {"operations": None}
+    return {"operations": [
+        {"op": "replace", "path": "/weekly_plan/0/goal", "value": "Lighter first week: setup and fundamentals"},
+        {"op": "remove", "path": "/weekly_plan/0/tasks/0"},
+    ]}
+
+
+_CREW_ANSWERS: dict[str, dict[str, Any]] = {
+    "GitHub Activity Analyst": {
+        "total_repos": 12, "total_stars": 30, "commits_90_days": 85,
+        "top_languages": {"Python": 60, "JavaScript": 30}, "top_repositories": ["api", "web", "cli"],
+        "consistency_assessment": "Steady weekly activity", "overall_quality": "good",
+    },
+    "Background Verification Specialist": {
+        "verification_results": [{"skill": "Python", "status": "verified", "evidence": "60% of code"}],
+        "red_flags": [], "overall_integrity": "high",
+    },
+    "Hiring Compliance Officer": {
+        "trust_score": 74, "risk_level": "clear",
+        "verification_summary": "Claims are consistent with public GitHub evidence.",
+        "key_findings": ["Python claims verified"], "red_flags": [], "recommendation": "approve",
+    },
+    "Technical Onboarding Specialist": _plan(4, "the candidate"),
+}
+
+
+def _crew_reply(system: str, user: str) -> str:
+    answer = next((a for role, a in _CREW_ANSWERS.items() if role in system), {"result": "done"})
+    return f"Thought: I now know the final answer\nFinal Answer: {json.dumps(answer)}"
+
+
+# (system prompt marker, kind, responder); the first match wins
+_PROMPT_TYPES = [
+    ("ATS evaluator", "ats", _ats_reply),
+    ("senior technical evaluator", "profile", _profile_reply),
+    ("edit operations", "modify_patch", _patch_reply),
+    ("training plan editor", "modify", _modify_reply),
+    ("training architect", "plan", _plan_reply),
+]
+
+
+def reply_for(messages: list[dict[str, Any]]) -> tuple[str, str]:
+    """(kind, content) for a chat request."""
+    system = next((str(m.get("content", "")) for m in messages if m.get("role") == "system"), "")
+    user = next((str(m.get("content", "")) for m in reversed(messages) if m.get("role") == "user"), "")
+    for marker, kind, responder in _PROMPT_TYPES:
+        if marker in system:
+            return kind, json.dumps(responder(system, user))
+    return "crew_agent", _crew_reply(system, user)
+
+
+def _chunks(content: str, size: int = 16) -> list[str]:
+    return [content[i:i + size] for i in range(0, len(content), size)]
+
+
+def create_app(config: StandinConfig) -> FastAPI:
+    app = FastAPI(title="LLM API stand-in")
+    state = StandinState(config=config)
+    app.state.standin = state
+
+    @app.get("/_standin/stats")
+    def stats():
+        return {
+            "requests": sum(state.requests.values()),
+            "by_kind": dict(state.requests),
+            "failures": dict(state.failures),
+            "prompt_tokens": state.prompt_tokens,
+            "completion_tokens": state.completion_tokens,
+        }
+
+    @app.get("/models")
+    def models():
+        return {"object": "list", "data": [{"id": "standin", "object": "model", "owned_by": "bench"}]}
+
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages") or []
+        model = body.get("model", "standin")
+
+        await asyncio.sleep(state.first_token_delay())
+        failure = state.draw_failure()
+        if failure == "server_error":
+            return JSONResponse({"error": {"message": "stand-in overloaded", "type": "server_error"}}, status_code=503)
+        if failure == "rate_limited":
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}},
+                status_code=429,
+                headers={"Retry-After": "1"},
+            )
+
+        kind, content = reply_for(messages)
+        if failure == "invalid_json":
+            content = content[: len(content) // 2]
+        prompt_tokens = sum(count_tokens(str(m.get("content", ""))) for m in messages)
+        completion_tokens = count_tokens(content)
+        state.record(kind, prompt_tokens, completion_tokens)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        if body.get("stream"):
+            include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+
+            def chunk(delta: dict[str, Any], finish_reason: str | None = None, **extra: Any) -> str:
+                data = {
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}], **extra,
+                }
+                return f"data: {json.dumps(data)}\n\n"
+
+            async def events():
+                yield chunk({"role": "assistant", "content": ""})
+                for piece in _chunks(content):
+                    if config.token_latency > 0:
+                        await asyncio.sleep(config.token_latency * count_tokens(piece))
+                    yield chunk({"content": piece})
+                yield chunk({}, "stop")
+                if include_usage:
+                    data = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                            "model": model, "choices": [], "usage": usage}
+                    yield f"data: {json.dumps(data)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        if config.token_latency > 0:
+            await asyncio.sleep(config.token_latency * completion_tokens)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": usage,
+        }
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve an OpenAI-compatible LLM stand-in")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.0, help="first-token delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="spread of the delay (see --distribution)")
+    parser.add_argument("--distribution", choices=["exponential", "lognormal", "uniform"], default="exponential")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="seconds per completion token")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction answered with a 429")
+    parser.add_argument("--invalid-json-rate", type=float, default=0.0, help="fraction with truncated JSON")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    standin = create_app(StandinConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        distribution=args.distribution,
+        token_latency=args.token_latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        invalid_json_rate=args.invalid_json_rate,
+        seed=args.seed,
+    ))
+    uvicorn.run(standin, host="127.0.0.1", port=args.port, access_log=False)
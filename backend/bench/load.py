@@ -0,0 +1,82 @@
+"""Closed-loop load generation and latency reporting for the benchmarks."""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+@dataclass
+class LoadResult:
+    concurrency: int
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def summary(self) -> dict[str, float]:
+        ordered = sorted(self.latencies)
+        return {
+            "concurrency": self.concurrency,
+            "requests": len(ordered) + self.errors,
+            "errors": self.errors,
+            "p50_ms": round(percentile(ordered, 50) * 1000, 1),
+            "p95_ms": round(percentile(ordered, 95) * 1000, 1),
+            "p99_ms": round(percentile(ordered, 99) * 1000, 1),
+            "rps": round(len(ordered) / self.elapsed, 1) if self.elapsed else 0.0,
+        }
+
+
+async def run_load(
+    call: Callable[[int], Awaitable[bool]],
+    requests: int,
+    concurrency: int,
+) -> LoadResult:
+    """Issue ``requests`` calls with ``concurrency`` workers, each starting the next as one finishes.
+
+    ``call(i)`` returns whether request ``i`` succeeded; exceptions count as
+    errors. Only successful calls contribute latency samples.
+    """
+    result = LoadResult(concurrency=concurrency)
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                ok = await call(i)
+            except Exception:
+                ok = False
+            if ok:
+                result.latencies.append(time.perf_counter() - start)
+            else:
+                result.errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def print_table(title: str, rows: list[dict[str, float]]) -> None:
+    columns = ["concurrency", "requests", "errors", "p50_ms", "p95_ms", "p99_ms", "rps"]
+    print(title)
+    print("".join(f"{c:>13}" for c in columns))
+    for row in rows:
+        print("".join(f"{row[c]:>13}" for c in columns))
@@ -0,0 +1,195 @@
+"""Check that read endpoints stay fast while intake is under load.
+
+Run from the backend directory:
+    .venv/bin/python -m bench.read_latency [--seconds 10] [--probe-rate 20] \\
+        [--concurrency 16] [--job-workers 8] [--worker-process] [--resume-lines 40] [--llm]
+
+Starts the GitHub stand-in (with ``--llm`` also the LLM stand-in) and the
+API with a single uvicorn worker, so intake and reads share one event loop.
+``GET /applications/stats`` is then probed at a fixed rate twice: idle, and
+while ``--concurrency`` clients keep submitting applications with a PDF
+resume and waiting for their jobs to finish. The table's concurrency
+column is the number of intake clients. If blocking intake work reached the
+event loop, probe latency under load would grow with it; it should stay
+close to the idle numbers. Everything shares this machine's CPUs, so on
+a small box some of the difference is plain CPU contention; compare with
+``PIPELINE_CPU_EXECUTOR=process`` to take resume parsing off the API
+process, or ``--worker-process`` to run the jobs in ``worker.py`` instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from bench.intake import BACKEND_DIR, _spawn  # noqa: E402
+from bench.load import LoadResult, free_port, print_table  # noqa: E402
+
+
+async def probe(client: httpx.AsyncClient, seconds: float, rate: float, label: int) -> LoadResult:
+    """Open-loop probes: one request every ``1 / rate`` seconds, however slow the answers."""
+    result = LoadResult(concurrency=label)
+
+    async def one() -> None:
+        start = time.perf_counter()
+        try:
+            ok = (await client.get("/applications/stats")).status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        if ok:
+            result.latencies.append(time.perf_counter() - start)
+        else:
+            result.errors += 1
+
+    tasks = []
+    start = time.perf_counter()
+    for i in range(int(seconds * rate)):
+        delay = start + i / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one()))
+    await asyncio.gather(*tasks)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+async def intake_load(
+    client: httpx.AsyncClient,
+    usernames: list[str],
+    resumes: list[bytes],
+    concurrency: int,
+    stop: asyncio.Event,
+) -> tuple[int, int]:
+    """Keep ``concurrency`` intake submissions in flight until ``stop``; returns (succeeded, failed)."""
+    counts = [0, 0]
+    counter = iter(range(10**9))
+
+    async def client_loop() -> None:
+        for i in counter:
+            if stop.is_set():
+                return
+            resp = await client.post(
+                "/applications",
+                data={
+                    "full_name": f"Bench Candidate {i}",
+                    "email": f"candidate{i}@bench.test",
+                    "github_url": f"https://github.com/{usernames[i % len(usernames)]}",
+                    "role_applied": "Backend Engineer",
+                },
+                files={"resume_file": ("resume.pdf", resumes[i % len(resumes)], "application/pdf")},
+            )
+            status = "failed"
+            if resp.status_code == 202:
+                while True:
+                    status = (await client.get(resp.headers["Location"])).json()["status"]
+                    if status in ("succeeded", "failed"):
+                        break
+                    await asyncio.sleep(0.5)
+            counts[status != "succeeded"] += 1
+
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return counts[0], counts[1]
+
+
+async def run(base_url: str, args: argparse.Namespace, usernames: list[str], resumes: list[bytes]) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency + 64)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0, limits=limits) as client:
+        idle = await probe(client, args.seconds, args.probe_rate, 0)
+
+        stop = asyncio.Event()
+        load = asyncio.create_task(intake_load(client, usernames, resumes, args.concurrency, stop))
+        # Let the queue fill before measuring
+        await asyncio.sleep(min(2.0, args.seconds / 4))
+        loaded = await probe(client, args.seconds, args.probe_rate, args.concurrency)
+        stop.set()
+        succeeded, failed = await load
+
+    print_table("GET /applications/stats", [idle.summary(), loaded.summary()])
+    for label, result in (("idle", idle), ("under intake load", loaded)):
+        print(f"  {label}: max {max(result.latencies, default=0) * 1000:.1f} ms")
+    print(f"\nintake: {succeeded} jobs succeeded, {failed} failed")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10.0, help="length of each probe phase")
+    parser.add_argument("--probe-rate", type=float, default=20.0, help="stats requests per second")
+    parser.add_argument("--concurrency", type=int, default=16, help="intake clients during the load phase")
+    parser.add_argument("--job-workers", type=int, default=8, help="intake job workers")
+    parser.add_argument("--worker-process", action="store_true", help="run the job workers in worker.py")
+    parser.add_argument("--resume-lines", type=int, default=40, help="experience lines per resume PDF")
+    parser.add_argument("--users", type=int, default=64, help="synthetic GitHub profiles")
+    parser.add_argument("--latency", type=float, default=0.05, help="GitHub stand-in latency")
+    parser.add_argument("--llm", action="store_true", help="run intake against the LLM stand-in")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="stand-in first-token delay")
+    args = parser.parse_args()
+
+    standin_port, api_port, llm_port = free_port(), free_port(), free_port()
+    os.environ.pop("LLM_API_KEY", None)
+    os.environ.update({
+        "GITHUB_API_URL": f"http://127.0.0.1:{standin_port}",
+        "GITHUB_TOKENS": "standin-token",
+        "DATABASE_URL": f"sqlite:///{tempfile.mkdtemp()}/bench.db",
+        "JOB_INPROCESS_WORKERS": "0" if args.worker_process else str(args.job_workers),
+        "JOB_POLL_SECONDS": "0.05",
+        # Every submission pays for a full fetch and LLM calls
+        "GITHUB_CACHE_ENABLED": "false",
+        "GITHUB_METRICS_TTL_SECONDS": "0",
+        "LLM_CACHE_TTL_SECONDS": "0",
+    })
+    if args.llm:
+        os.environ.update({"LLM_API_KEY": "standin-key", "LLM_BASE_URL": f"http://127.0.0.1:{llm_port}"})
+    env = dict(os.environ)
+
+    from app.core.config import settings
+    from bench.fixtures import resume_pdf, synthetic_fixture
+
+    usernames = synthetic_fixture(args.users)["usernames"]
+    resumes = [resume_pdf(f"Candidate {i}", args.resume_lines, seed=i) for i in range(8)]
+    procs = [_spawn(
+        [
+            "-m", "bench.github_standin", "--port", str(standin_port), "--quota", str(10**9),
+            "--synthetic", str(args.users), "--latency", str(args.latency), "--seed", "0",
+        ],
+        env,
+        f"http://127.0.0.1:{standin_port}/_standin/stats",
+    )]
+    try:
+        if args.llm:
+            procs.append(_spawn(
+                ["-m", "bench.llm_standin", "--port", str(llm_port), "--latency", str(args.llm_latency),
+                 "--seed", "0"],
+                env,
+                f"http://127.0.0.1:{llm_port}/_standin/stats",
+            ))
+        procs.append(_spawn(
+            ["-m", "uvicorn", "app.main:app", "--port", str(api_port), "--log-level", "warning"],
+            env,
+            f"http://127.0.0.1:{api_port}/",
+        ))
+        if args.worker_process:
+            worker = subprocess.Popen(
+                [sys.executable, "worker.py", "--concurrency", str(args.job_workers)], cwd=BACKEND_DIR, env=env,
+            )
+            procs.append(worker)
+        print(f"probing at {args.probe_rate:g}/s for {args.seconds:g}s per phase, {args.concurrency} intake "
+              f"clients, {args.job_workers} job workers{' in worker.py' if args.worker_process else ''}, LLM {'stand-in' if args.llm else 'off'}, "
+              f"{settings.pipeline_cpu_executor} CPU pool, {os.cpu_count()} CPU(s)\n")
+        asyncio.run(run(f"http://127.0.0.1:{api_port}", args, usernames, resumes))
+    finally:
+        for proc in procs:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Periodic sweep: refresh stored GitHub metrics for every application.
+
+Run from the backend directory (e.g. from cron):
+    .venv/bin/python refresh_github_metrics.py [--concurrency 8]
+
+Uses the incremental refresh mode of the GitHub service, so a candidate whose
+repos have not been pushed to since the last fetch costs one conditional
+request (usually a rate-limit-free 304). Applications whose metrics changed
+get their deterministic scores recomputed.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.core.http import http_clients
+from app.database import SessionLocal, engine, Base
+import app.models  # noqa: F401  (register every table before create_all)
+from app.models.application import Application
+from app.services.github_ratelimit import rate_limit_stats
+from app.services.github_service import fetch_github_metrics_async
+from app.services.scoring_service import compute_scores
+
+
+async def _refresh_all(targets: list[tuple[int, str]], concurrency: int) -> dict[int, dict | Exception]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _one(github_url: str):
+        async with semaphore:
+            try:
+                return await fetch_github_metrics_async(github_url, refresh="incremental")
+            except Exception as exc:
+                return exc
+
+    results = await asyncio.gather(*(_one(url) for _, url in targets))
+    return {app_id: result for (app_id, _), result in zip(targets, results)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh stored GitHub metrics")
+    parser.add_argument("--concurrency", type=int, default=8, help="candidates refreshed in parallel")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        apps = {a.id: a for a in db.query(Application).all()}
+        print(f"Found {len(apps)} application(s)")
+
+        results = asyncio.run(
+            _refresh_all([(a.id, a.github_url) for a in apps.values()], args.concurrency)
+        )
+
+        changed = unchanged = failed = 0
+        for app_id, metrics in results.items():
+            application = apps[app_id]
+            stored = json.loads(application.github_metrics_json or "{}")
+            if isinstance(metrics, Exception):
+                print(f"  FAIL  [{app_id}] {application.full_name} — {metrics}")
+                failed += 1
+                continue
+            if metrics == stored:
+                unchanged += 1
+                continue
+            if not metrics.get("total_public_repos") and stored.get("total_public_repos"):
+                # Keep the last good metrics rather than overwriting them with an empty fallback
+                print(f"  FAIL  [{app_id}] {application.full_name} — no data returned")
+                failed += 1
+                continue
+
+            resume_data = json.loads(application.resume_analysis_json or "null")
+            score_result = compute_scores(metrics, resume_data=resume_data, role_applied=application.role_applied)
+            application.github_metrics_json = json.dumps(metrics)
+            application.master_score = score_result.get("master_score")
+            application.confidence_band = score_result.get("confidence_band")
+            application.score_breakdown_json = json.dumps(score_result.get("score_breakdown", {}))
+            application.learning_gaps_json = json.dumps(score_result.get("learning_gaps", []))
+            db.add(application)
+            print(f"  UPDT  [{app_id}] {application.full_name} → master_score={application.master_score}")
+            changed += 1
+
+        db.commit()
+        remaining = rate_limit_stats()["core"]["remaining_total"]
+        print(f"\nDone. Updated: {changed}, Unchanged: {unchanged}, Failed: {failed}, "
+              f"GitHub budget left: {remaining}")
+    finally:
+        db.close()
+        http_clients.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Run the auto-verifications that intake deferred because of the LLM token budget
+or an open LLM circuit breaker.
+
+Run from the backend directory (e.g. from cron):
+    .venv/bin/python run_deferred_verifications.py [--limit 10]
+
+Works through the queue oldest first and stops as soon as the budget is
+past its soft limit again, so a backlog drains across several runs instead
+of spending the next hour's budget at once.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.core.http import http_clients
+from app.database import SessionLocal, engine, Base
+import app.models  # noqa: F401  (register every table before create_all)
+from app.models.application import Application
+from app.models.llm_budget import DeferredVerification
+from app.services.auto_verification import run_auto_verification
+from app.services.llm_budget import token_budget
+from app.services.llm_service import _get_api_key
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run deferred auto-verifications")
+    parser.add_argument("--limit", type=int, default=10, help="verifications to run at most")
+    args = parser.parse_args()
+
+    api_key = _get_api_key()
+    if not api_key:
+        print("LLM_API_KEY is not set, nothing to do")
+        return
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        queued = db.query(DeferredVerification).order_by(DeferredVerification.created_at).limit(args.limit).all()
+        print(f"Found {len(queued)} deferred verification(s)")
+
+        done = failed = 0
+        for entry in queued:
+            if not token_budget.allows("auto_verification"):
+                print(f"Token budget is at '{token_budget.level()}', stopping")
+                break
+            application = db.get(Application, entry.application_id)
+            if application is not None:
+                resume_data = json.loads(application.resume_analysis_json or "null")
+                if not run_auto_verification(db, application, resume_data, api_key):
+                    print(f"  FAIL  [{entry.application_id}] {application.full_name}")
+                    failed += 1
+                    continue
+                print(f"  DONE  [{entry.application_id}] {application.full_name} → trust_score={application.trust_score}")
+                done += 1
+            db.delete(entry)
+            db.commit()
+
+        print(f"\nDone. Verified: {done}, Failed: {failed}, Still queued: {db.query(DeferredVerification).count()}")
+    finally:
+        db.close()
+        http_clients.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services import github_ratelimit
+from app.services.github_ratelimit import GitHubRateLimitError, RateLimitScheduler, TokenBucket, github_request
+
+
+def _response(remaining: int, reset: float, status: int = 200, **headers: str) -> httpx.Response:
+    return httpx.Response(status, headers={
+        "X-RateLimit-Limit": "100",
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(reset)),
+        **headers,
+    })
+
+
+def _scheduler(tokens=("token-a",), max_wait: float = 5.0) -> RateLimitScheduler:
+    return RateLimitScheduler("core", list(tokens), max_wait)
+
+
+def test_available_refills_once_the_window_resets():
+    bucket = TokenBucket(token="t", limit=100, remaining=0, reset_at=1000.0)
+    assert bucket.available(999.0) == 0
+    assert bucket.available(1000.0) == 100
+    assert bucket.reset_at == 0.0
+
+
+def test_new_window_header_is_authoritative():
+    scheduler = _scheduler()
+    bucket = scheduler._try_reserve(time.time())
+    other = scheduler._try_reserve(time.time())
+    assert bucket is other and bucket.in_flight == 2
+
+    scheduler.release(bucket, _response(remaining=40, reset=time.time() + 3600))
+    # One request of this window is still out, so one more unit is spoken for
+    assert bucket.remaining == 39
+    assert bucket.limit == 100
+
+
+def test_out_of_order_responses_in_one_window_never_raise_remaining():
+    scheduler = _scheduler()
+    reset = time.time() + 3600
+    for _ in range(3):
+        scheduler._try_reserve(time.time())
+    bucket = scheduler.buckets[0]
+    scheduler.release(bucket, _response(remaining=50, reset=reset))
+    # Two requests are still out
+    assert bucket.remaining == 48
+    # An older response (sent earlier, arrived later) reports more budget left
+    scheduler.release(bucket, _response(remaining=52, reset=reset))
+    assert bucket.remaining == 48
+    scheduler.release(bucket, _response(remaining=45, reset=reset))
+    assert bucket.remaining == 45
+    assert bucket.in_flight == 0
+
+
+def test_retry_after_blocks_the_token_until_then():
+    scheduler = _scheduler()
+    bucket = scheduler._try_reserve(time.time())
+    scheduler.release(bucket, _response(remaining=10, reset=time.time() + 3600, status=403, **{"Retry-After": "30"}))
+    now = time.time()
+    assert scheduler.rate_limited_responses == 1
+    assert bucket.available(now) == 0
+    assert 29 <= bucket.blocked_until - now <= 31
+    assert scheduler._try_reserve(now) == pytest.approx(bucket.blocked_until)
+    # A secondary limit pauses the token; the window's budget is still there
+    assert bucket.available(bucket.blocked_until) == 10
+
+
+def test_exhausted_without_retry_after_blocks_until_reset():
+    scheduler = _scheduler()
+    reset = time.time() + 120
+    bucket = scheduler._try_reserve(time.time())
+    scheduler.release(bucket, _response(remaining=0, reset=reset, status=403))
+    assert bucket.blocked_until == int(reset)
+
+
+def test_reserve_prefers_the_richest_token_and_waits_for_the_earliest_refill():
+    scheduler = _scheduler(("token-a", "token-b"))
+    now = 1000.0
+    a, b = scheduler.buckets
+    a.remaining, b.remaining = 1, 3
+    assert scheduler._try_reserve(now) is b
+
+    a.remaining, b.remaining = 0, 0
+    a.reset_at, b.reset_at = now + 50, now + 20
+    assert scheduler._try_reserve(now) == now + 20
+
+
+def test_acquire_waits_for_the_earliest_refill_across_tokens():
+    scheduler = _scheduler(("token-a", "token-b"))
+    a, b = scheduler.buckets
+    now = time.time()
+    a.remaining = b.remaining = 0
+    a.reset_at, b.reset_at = now + 5, now + 0.2
+
+    bucket, waited = asyncio.run(scheduler.acquire())
+    assert bucket is b
+    assert 0.1 <= waited < 1
+    assert scheduler.waits_total == 1
+
+
+def test_acquire_gives_up_past_max_wait():
+    scheduler = _scheduler(max_wait=1.0)
+    bucket = scheduler.buckets[0]
+    bucket.remaining, bucket.reset_at = 0, time.time() + 60
+    with pytest.raises(GitHubRateLimitError):
+        asyncio.run(scheduler.acquire())
+
+
+def test_cancelled_request_releases_its_token(monkeypatch):
+    scheduler = _scheduler()
+    monkeypatch.setattr(github_ratelimit, "schedulers", {"core": scheduler})
+
+    async def hang(request):
+        await asyncio.sleep(60)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(hang)) as client:
+            task = asyncio.create_task(github_request(client, "GET", "https://api.github.test/users/x", {}))
+            await asyncio.sleep(0.05)
+            assert scheduler.buckets[0].in_flight == 1
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+    asyncio.run(run())
+    assert scheduler.buckets[0].in_flight == 0
+
+
+def test_rate_limited_response_is_retried_on_another_token(monkeypatch):
+    scheduler = _scheduler(("token-a", "token-b"))
+    monkeypatch.setattr(github_ratelimit, "schedulers", {"core": scheduler})
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers["Authorization"])
+        if len(seen) == 1:
+            return httpx.Response(429, headers={"Retry-After": "60"})
+        return httpx.Response(200)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await github_request(client, "GET", "https://api.github.test/users/x", {})
+
+    resp, waited = asyncio.run(run())
+    assert resp.status_code == 200 and waited == 0
+    assert len(set(seen)) == 2
@@ -0,0 +1,28 @@
+from app.services.github_service import _last_page
+
+COMMITS = "https://api.github.com/repositories/1/commits"
+
+
+def test_last_page_from_link_header():
+    link = (
+        f'<{COMMITS}?since=2024-01-01T00:00:00Z&per_page=1&page=2>; rel="next", '
+        f'<{COMMITS}?since=2024-01-01T00:00:00Z&per_page=1&page=34>; rel="last"'
+    )
+    assert _last_page(link) == 34
+
+
+def test_last_page_with_page_first_in_the_query():
+    link = f'<{COMMITS}?page=2&per_page=1>; rel="next", <{COMMITS}?page=7&per_page=1>; rel="last"'
+    assert _last_page(link) == 7
+
+
+def test_last_page_ignores_per_page():
+    assert _last_page(f'<{COMMITS}?per_page=100>; rel="last"') is None
+
+
+def test_no_last_page():
+    # On the last page GitHub only links back
+    link = f'<{COMMITS}?per_page=1&page=1>; rel="first", <{COMMITS}?per_page=1&page=33>; rel="prev"'
+    assert _last_page(link) is None
+    assert _last_page("") is None
+    assert _last_page(None) is None
@@ -0,0 +1,41 @@
+import dataclasses
+from datetime import datetime, timedelta
+
+from app.services import github_snapshots
+from app.services.github_snapshots import reusable_details
+
+PUSHED_AT = "2024-05-01T12:00:00Z"
+WINDOW_START = datetime(2024, 3, 1)
+
+
+def _snapshot(pushed_at=PUSHED_AT, age=timedelta(hours=1)):
+    return {
+        "pushed_at": pushed_at,
+        "language_bytes": {"Python": 1200},
+        "commit_count": 17,
+        "window_start": "2024-02-28T00:00:00Z",
+        "fetched_at": datetime.utcnow() - age,
+    }
+
+
+def test_unchanged_repo_reuses_the_snapshot():
+    assert reusable_details(_snapshot(), {"pushed_at": PUSHED_AT}, WINDOW_START) == ({"Python": 1200}, 17)
+
+
+def test_pushed_repo_is_requeried():
+    assert reusable_details(_snapshot(), {"pushed_at": "2024-05-02T08:00:00Z"}, WINDOW_START) is None
+    assert reusable_details(None, {"pushed_at": PUSHED_AT}, WINDOW_START) is None
+
+
+def test_last_push_older_than_the_window_has_no_commits_left():
+    old = "2024-01-15T00:00:00Z"
+    assert reusable_details(_snapshot(pushed_at=old), {"pushed_at": old}, WINDOW_START) == ({"Python": 1200}, 0)
+
+
+def test_snapshot_older_than_the_max_age_is_requeried(monkeypatch):
+    monkeypatch.setattr(
+        github_snapshots, "settings", dataclasses.replace(github_snapshots.settings, github_snapshot_max_age_hours=24)
+    )
+    repo = {"pushed_at": PUSHED_AT}
+    assert reusable_details(_snapshot(age=timedelta(hours=23)), repo, WINDOW_START) is not None
+    assert reusable_details(_snapshot(age=timedelta(hours=25)), repo, WINDOW_START) is None
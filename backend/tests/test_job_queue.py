@@ -0,0 +1,69 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database import Base, SessionLocal, engine
+from app.models.job import Job
+from app.services import job_queue
+
+
+@pytest.fixture(autouse=True)
+def jobs_table():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.query(Job).delete()
+    db.commit()
+    db.close()
+
+
+def _expire_lease(job_id):
+    db = SessionLocal()
+    db.query(Job).filter(Job.id == job_id).update({Job.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+    db.close()
+
+
+def _row(job_id):
+    db = SessionLocal()
+    try:
+        return db.get(Job, job_id)
+    finally:
+        db.close()
+
+
+def test_heartbeat_renews_the_lease_while_the_job_runs():
+    job_queue.enqueue("intake", {})
+    job = job_queue.claim("worker-a")
+    _expire_lease(job.id)
+    with job_queue.heartbeat(job, interval=0.05):
+        time.sleep(0.2)
+    assert _row(job.id).lease_expires_at > datetime.utcnow()
+    assert job_queue.claim("worker-b") is None
+
+
+def test_a_worker_that_lost_its_lease_cannot_complete_or_fail_the_job():
+    job_id = job_queue.enqueue("intake", {})
+    stale = job_queue.claim("worker-a")
+    _expire_lease(job_id)
+    current = job_queue.claim("worker-b")
+    assert current.id == job_id and current.attempts == 2
+
+    assert not job_queue.complete(stale)
+    assert not job_queue.fail(stale, "boom")
+    assert not job_queue.renew_lease(stale)
+    job_queue.StageTracker(job_id, worker_id=stale.locked_by).start("verify")
+    row = _row(job_id)
+    assert (row.status, row.locked_by, row.error, row.stage) == ("running", "worker-b", None, None)
+
+    assert job_queue.complete(current)
+    assert _row(job_id).status == "succeeded"
+
+
+def test_fail_requeues_until_attempts_are_used_up():
+    job_id = job_queue.enqueue("intake", {}, max_attempts=2)
+    assert job_queue.fail(job_queue.claim("worker-a"), "boom", retry_after=0)
+    assert _row(job_id).status == "queued"
+    assert not job_queue.fail(job_queue.claim("worker-a"), "boom again")
+    row = _row(job_id)
+    assert (row.status, row.error, row.locked_by) == ("failed", "boom again", None)
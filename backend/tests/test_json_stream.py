@@ -0,0 +1,57 @@
+import json
+
+from app.core.json_stream import ArrayItemStream
+
+REPLY = {
+    "summary": "Plan with {braces} and [brackets]",
+    "weekly_plan": [
+        {"week": 1, "goal": 'Learn "quoted" things', "tasks": ["a}b", "c]d", "back\\slash\\"]},
+        {"week": 2, "goal": 'Escaped \\" quote { inside', "tasks": []},
+        {"week": 3, "goal": "Unicode é and \n newline", "tasks": ["[x]"]},
+    ],
+    "focus_areas": [{"not": "an item"}],
+}
+
+
+def _feed(stream: ArrayItemStream, chunks: list[str]) -> list:
+    items = []
+    for chunk in chunks:
+        items.extend(stream.feed(chunk))
+    return items
+
+
+def test_whole_document():
+    text = json.dumps(REPLY)
+    assert _feed(ArrayItemStream("weekly_plan"), [text]) == REPLY["weekly_plan"]
+
+
+def test_every_chunk_boundary():
+    for text in (json.dumps(REPLY), json.dumps(REPLY, ensure_ascii=False, indent=2)):
+        for size in (1, 2, 3, 7, 16):
+            chunks = [text[i:i + size] for i in range(0, len(text), size)]
+            assert _feed(ArrayItemStream("weekly_plan"), chunks) == REPLY["weekly_plan"], size
+
+
+def test_items_arrive_as_soon_as_they_close():
+    stream = ArrayItemStream("weekly_plan")
+    assert stream.feed('{"weekly_plan": [{"week": 1, "goal": "a}') == []
+    assert stream.feed('"}, {"week"') == [{"week": 1, "goal": "a}"}]
+    assert stream.feed(': 2}]}') == [{"week": 2}]
+
+
+def test_key_inside_a_string_or_nested_object_is_ignored():
+    text = json.dumps({
+        "note": "weekly_plan: [{\"week\": 0}]",
+        "meta": {"weekly_plan": [{"week": -1}]},
+        "weekly_plan": [{"week": 1}],
+    })
+    assert _feed(ArrayItemStream("weekly_plan"), [text]) == [{"week": 1}]
+
+
+def test_escaped_key_is_decoded():
+    text = '{"weekly\\u005fplan": [{"week": 1}]}'
+    assert _feed(ArrayItemStream("weekly_plan"), [text]) == [{"week": 1}]
+
+
+def test_scalar_elements_are_not_items():
+    assert _feed(ArrayItemStream("weekly_plan"), ['{"weekly_plan": [1, "two", {"week": 3}]}']) == [{"week": 3}]
@@ -0,0 +1,156 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services import llm_resilience, llm_service
+from app.services.llm_resilience import CircuitBreaker
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_resilience, "time", clock)
+    return clock
+
+
+def test_opens_after_threshold_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    clock.now += 10
+    assert breaker.retry_after() == 20
+    assert breaker.stats()["opened_total"] == 1
+
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.state == "half_open"
+    assert breaker.retry_after() == 0
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_successful_probe_closes(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow() and breaker.allow()
+    assert breaker.stats()["consecutive_failures"] == 0
+
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.retry_after() == 30
+    assert breaker.stats()["opened_total"] == 2
+    # ... and half-opens again after another reset period
+    clock.now += 30
+    assert breaker.allow()
+
+
+def test_late_failures_do_not_extend_open_period(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    # A call started before the breaker opened fails afterwards
+    clock.now += 20
+    breaker.record_failure()
+    clock.now += 10
+    assert breaker.state == "half_open"
+    assert breaker.stats()["opened_total"] == 1
+
+
+def test_release_probe_frees_the_slot(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.release_probe()
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+
+
+def _half_open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.state == "half_open"
+    return breaker
+
+
+@pytest.fixture
+def probe(monkeypatch):
+    breaker = _half_open_breaker()
+    monkeypatch.setattr(llm_service, "llm_breaker", breaker)
+    monkeypatch.setattr(llm_service, "_get_api_key", lambda: "test-key")
+    return breaker
+
+
+def test_cancelled_probe_releases_breaker(probe, monkeypatch):
+    started = asyncio.Event()
+
+    async def hang(*args, **kwargs):
+        started.set()
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(llm_service, "hedged", hang)
+
+    async def run():
+        task = asyncio.create_task(llm_service._request_llm("resume_ats", MESSAGES, use_cache=False))
+        await asyncio.wait_for(started.wait(), 5)
+        # The probe is out: nobody else may call the provider
+        assert not probe.allow()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    # Send on this loop instead of the I/O loop, so the test owns the task
+    monkeypatch.setattr(llm_service.io_loop, "run", lambda factory: factory())
+    asyncio.run(run())
+    assert probe.state == "half_open"
+    assert probe.allow()
+
+
+def test_closed_stream_probe_releases_breaker(probe, monkeypatch):
+    async def deltas(payload, headers, route, usage):
+        yield '{"weekly_plan": [{"week": 1}'
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(llm_service, "_stream_deltas", deltas)
+
+    async def run():
+        stream = llm_service._stream_llm("training_plan", MESSAGES, "weekly_plan", use_cache=False)
+        assert await stream.__anext__() == ("item", {"week": 1})
+        # A client disconnect closes the generator mid-stream
+        await stream.aclose()
+
+    asyncio.run(run())
+    assert probe.allow()
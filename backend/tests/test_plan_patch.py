@@ -0,0 +1,108 @@
+import pytest
+
+from app.services.plan_patch import PlanPatchError, apply_plan_patch
+
+PLAN = {
+    "summary": "Eight weeks of backend work",
+    "focus_areas": ["APIs"],
+    "weekly_plan": [
+        {"week": 1, "goal": "Basics", "tasks": ["read docs", "set up"], "topics": ["HTTP"]},
+        {"week": 2, "goal": "Databases", "tasks": ["schema"]},
+    ],
+}
+
+
+def test_replace_fields_and_items():
+    patched, touched = apply_plan_patch(PLAN, [
+        {"op": "replace", "path": "/summary", "value": "New summary"},
+        {"op": "replace", "path": "/weekly_plan/1/goal", "value": "SQL"},
+        {"op": "replace", "path": "/weekly_plan/0/tasks/1", "value": "install tools"},
+        {"op": "replace", "path": "/weekly_plan/1/tasks/0", "value": "migrations"},
+    ])
+    assert patched["summary"] == "New summary"
+    assert patched["weekly_plan"][1]["goal"] == "SQL"
+    assert patched["weekly_plan"][0]["tasks"] == ["read docs", "install tools"]
+    assert touched == [1, 0]
+    # The input plan is left alone
+    assert PLAN["weekly_plan"][0]["tasks"] == ["read docs", "set up"]
+
+
+def test_dash_appends():
+    patched, _ = apply_plan_patch(PLAN, [
+        {"op": "add", "path": "/weekly_plan/0/tasks/-", "value": "write tests"},
+        {"op": "add", "path": "/weekly_plan/1/deliverables/-", "value": "ERD"},
+    ])
+    assert patched["weekly_plan"][0]["tasks"][-1] == "write tests"
+    assert patched["weekly_plan"][1]["deliverables"] == ["ERD"]
+
+
+def test_add_inserts_at_index_and_at_end():
+    patched, _ = apply_plan_patch(PLAN, [
+        {"op": "add", "path": "/weekly_plan/0/tasks/0", "value": "first"},
+        {"op": "add", "path": "/weekly_plan/0/tasks/3", "value": "last"},
+    ])
+    assert patched["weekly_plan"][0]["tasks"] == ["first", "read docs", "set up", "last"]
+
+
+def test_remove_item():
+    patched, touched = apply_plan_patch(PLAN, [{"op": "remove", "path": "/weekly_plan/0/tasks/0"}])
+    assert patched["weekly_plan"][0]["tasks"] == ["set up"]
+    assert touched == [0]
+
+
+@pytest.mark.parametrize("path, op", [
+    ("/weekly_plan/2/goal", "replace"),       # week past the end
+    ("/weekly_plan/-1/goal", "replace"),      # negative week
+    ("/weekly_plan/-/goal", "replace"),       # "-" is only for list items
+    ("/weekly_plan/0/tasks/2", "replace"),    # item past the end
+    ("/weekly_plan/0/tasks/2", "remove"),
+    ("/weekly_plan/0/tasks/-", "replace"),
+    ("/weekly_plan/0/tasks/-", "remove"),
+    ("/weekly_plan/0/tasks/3", "add"),        # past the append position
+    ("/weekly_plan/0/tasks/x", "replace"),
+])
+def test_out_of_range_and_bad_indices(path, op):
+    with pytest.raises(PlanPatchError):
+        apply_plan_patch(PLAN, [{"op": op, "path": path, "value": "v"}])
+
+
+@pytest.mark.parametrize("operation", [
+    {"op": "replace", "path": "/weekly_plan/0/week", "value": "3"},
+    {"op": "replace", "path": "/weekly_plan/0/resources", "value": ["x"]},
+    {"op": "add", "path": "/weekly_plan/0/goal/-", "value": "x"},
+    {"op": "replace", "path": "/title", "value": "x"},
+    {"op": "add", "path": "/weekly_plan/-", "value": {"week": 3}},
+    {"op": "remove", "path": "/weekly_plan/1"},
+    {"op": "remove", "path": "/weekly_plan/0/goal"},
+    {"op": "move", "path": "/summary", "value": "x"},
+    {"op": "replace", "path": "summary", "value": "x"},
+])
+def test_unknown_fields_and_operations_are_rejected(operation):
+    with pytest.raises(PlanPatchError):
+        apply_plan_patch(PLAN, [operation])
+
+
+@pytest.mark.parametrize("operation", [
+    {"op": "replace", "path": "/summary", "value": 3},
+    {"op": "replace", "path": "/focus_areas", "value": "APIs"},
+    {"op": "replace", "path": "/weekly_plan/0/tasks", "value": ["ok", 2]},
+    {"op": "add", "path": "/weekly_plan/0/tasks/-", "value": ["nested"]},
+])
+def test_wrong_value_types_are_rejected(operation):
+    with pytest.raises(PlanPatchError):
+        apply_plan_patch(PLAN, [operation])
+
+
+def test_a_bad_operation_applies_nothing():
+    with pytest.raises(PlanPatchError):
+        apply_plan_patch(PLAN, [
+            {"op": "replace", "path": "/summary", "value": "changed"},
+            {"op": "replace", "path": "/weekly_plan/9/goal", "value": "x"},
+        ])
+    assert PLAN["summary"] == "Eight weeks of backend work"
+
+
+@pytest.mark.parametrize("operations", [[], None, {"op": "replace"}, ["not an object"]])
+def test_malformed_operation_lists(operations):
+    with pytest.raises(PlanPatchError):
+        apply_plan_patch(PLAN, operations)
@@ -0,0 +1,81 @@
+from app.services.prompt_builder import PromptBuilder, count_tokens
+
+HEADER = "Candidate: Ada Lovelace, applying for Backend Engineer.\n"
+RESUME = "\nResume: " + "Built data pipelines and APIs in Python. " * 20
+KEYWORDS = [f"skill{i}" for i in range(40)]
+
+
+def _builder(budget: int) -> PromptBuilder:
+    return (
+        PromptBuilder(budget)
+        .text("header", HEADER, required=True)
+        .items("keywords", KEYWORDS, prefix="\nKeywords: ", priority=2)
+        .text("resume", RESUME, priority=1)
+    )
+
+
+def _full_tokens() -> int:
+    return count_tokens(HEADER + "\nKeywords: " + ", ".join(KEYWORDS) + RESUME)
+
+
+def _sections(builder: PromptBuilder) -> dict:
+    return {s.name: s for s in builder.sections}
+
+
+def test_within_budget_is_untouched():
+    builder = _builder(_full_tokens())
+    assert builder.build() == HEADER + "\nKeywords: " + ", ".join(KEYWORDS) + RESUME
+
+
+def test_lowest_priority_is_trimmed_first():
+    builder = _builder(_full_tokens() - 10)
+    prompt = builder.build()
+    sections = _sections(builder)
+    assert count_tokens(prompt) <= _full_tokens() - 10
+    assert sections["keywords"].items == KEYWORDS
+    assert len(sections["resume"].text) < len(RESUME)
+    assert RESUME.startswith(sections["resume"].text)
+
+
+def test_higher_priority_is_trimmed_once_lower_ones_are_gone():
+    resume_tokens = count_tokens(RESUME)
+    builder = _builder(_full_tokens() - resume_tokens - 10)
+    prompt = builder.build()
+    sections = _sections(builder)
+    assert sections["resume"].text == ""
+    # List sections lose items from the end
+    assert 0 < len(sections["keywords"].items) < len(KEYWORDS)
+    assert sections["keywords"].items == KEYWORDS[: len(sections["keywords"].items)]
+    assert prompt.startswith(HEADER)
+
+
+def test_required_sections_survive_any_budget():
+    builder = _builder(1)
+    prompt = builder.build()
+    sections = _sections(builder)
+    assert prompt == HEADER
+    assert sections["keywords"].items == []
+    assert sections["resume"].text == ""
+
+
+def test_equal_priorities_trim_in_insertion_order():
+    builder = (
+        PromptBuilder(count_tokens(HEADER + RESUME + RESUME) - 10)
+        .text("header", HEADER, required=True)
+        .text("first", RESUME)
+        .text("second", RESUME)
+    )
+    builder.build()
+    sections = _sections(builder)
+    assert len(sections["first"].text) < len(RESUME)
+    assert sections["second"].text == RESUME
+
+
+def test_sections_render_in_insertion_order():
+    builder = (
+        PromptBuilder(1000)
+        .text("late", "C", priority=9)
+        .items("middle", ["b1", "b2"], prefix="B:", joiner="/")
+        .text("early", "A", priority=-1)
+    )
+    assert builder.build() == "CB:b1/b2A"
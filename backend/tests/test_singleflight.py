@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_concurrent_calls_share_one_run():
+    flight = SingleFlight("test")
+    release = threading.Event()
+    runs = []
+
+    def work():
+        runs.append(1)
+        release.wait(2)
+        return "result"
+
+    with ThreadPoolExecutor(4) as pool:
+        leader = pool.submit(flight.do, "key", work)
+        _wait_for(lambda: runs)
+        followers = [pool.submit(flight.do, "key", work) for _ in range(3)]
+        _wait_for(lambda: flight.shared == 3)
+        release.set()
+        assert leader.result() == ("result", False)
+        assert [f.result() for f in followers] == [("result", True)] * 3
+    assert len(runs) == 1
+    assert flight.stats() == {"runs": 1, "shared": 3, "in_flight": 0}
+
+
+def test_followers_get_the_leaders_exception():
+    flight = SingleFlight("test")
+    release = threading.Event()
+
+    def work():
+        release.wait(2)
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(flight.do, "key", work)
+        _wait_for(lambda: flight.stats()["in_flight"] == 1)
+        follower = pool.submit(flight.do, "key", work)
+        _wait_for(lambda: flight.shared == 1)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(ValueError, match="boom"):
+                future.result()
+
+
+def test_nothing_is_cached_between_calls():
+    flight = SingleFlight("test")
+    assert flight.do("key", lambda: 1) == (1, False)
+    assert flight.do("key", lambda: 2) == (2, False)
+    assert flight.do("other", lambda: 3) == (3, False)
+
+
+def test_async_concurrent_calls_share_one_run():
+    async def main():
+        flight = AsyncSingleFlight("test")
+        runs = []
+
+        async def work():
+            runs.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(4)))
+        return flight, runs, results
+
+    flight, runs, results = asyncio.run(main())
+    assert len(runs) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert {result for result, _ in results} == {"result"}
+    assert flight.stats() == {"runs": 1, "shared": 3, "in_flight": 0}
+
+
+def test_cancelled_leader_does_not_cancel_the_shared_run():
+    async def main():
+        flight = AsyncSingleFlight("test")
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "result"
+
+        leader = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower, flight.stats()
+
+    assert asyncio.run(main()) == (("result", True), {"runs": 1, "shared": 1, "in_flight": 0})
+
+
+def test_async_followers_get_the_exception_after_the_leader_is_cancelled():
+    async def main():
+        flight = AsyncSingleFlight("test")
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            raise ValueError("boom")
+
+        leader = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        release.set()
+        with pytest.raises(ValueError, match="boom"):
+            await follower
+
+        async def ok():
+            return "fresh"
+
+        # The finished run is forgotten: the next call starts a new one
+        return await flight.do("key", ok)
+
+    assert asyncio.run(main()) == ("fresh", False)
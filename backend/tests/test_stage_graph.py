@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+
+from app.services.job_queue import StageTracker
+from app.services.stage_graph import StageGraph, StageTimeout
+
+
+def _run(graph, **values):
+    return asyncio.run(graph.run(StageTracker(None), values))
+
+
+async def _identity(value):
+    return value
+
+
+def test_unknown_input_is_rejected_before_anything_runs():
+    graph = StageGraph("test")
+    graph.add("a", _identity, inputs=("missing",))
+    with pytest.raises(ValueError, match="unknown input missing"):
+        _run(graph)
+
+
+def test_dependency_cycle_is_rejected():
+    graph = StageGraph("test")
+    graph.add("a", _identity, inputs=("b",))
+    graph.add("b", _identity, inputs=("a",))
+    graph.add("c", _identity, inputs=("x",))
+    with pytest.raises(ValueError, match=r"\['a', 'b'\] form a dependency cycle"):
+        _run(graph, x=1)
+
+
+def test_stages_receive_inputs_and_upstream_outputs():
+    async def add(x, y):
+        return x + y
+
+    graph = StageGraph("test")
+    graph.add("double", lambda x: x * 2, inputs=("x",), kind="thread")
+    graph.add("total", add, inputs=("x", "double"))
+    results = _run(graph, x=3)
+    assert results == {"x": 3, "double": 6, "total": 9}
+
+
+def test_independent_stages_overlap():
+    async def main():
+        a_started, b_started = asyncio.Event(), asyncio.Event()
+
+        async def stage(mine, other):
+            mine.set()
+            # Only completes if the other stage is running at the same time
+            await asyncio.wait_for(other.wait(), 1)
+            return True
+
+        graph = StageGraph("test")
+        graph.add("a", lambda: stage(a_started, b_started))
+        graph.add("b", lambda: stage(b_started, a_started))
+        return await graph.run(StageTracker(None), {})
+
+    assert asyncio.run(main()) == {"a": True, "b": True}
+
+
+def test_first_error_is_raised_after_running_stages_finish():
+    finished = []
+
+    async def fails():
+        raise RuntimeError("boom")
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        finished.append("slow")
+        return "done"
+
+    async def later_failure():
+        await asyncio.sleep(0.02)
+        raise KeyError("second")
+
+    async def downstream(_):
+        finished.append("downstream")
+
+    graph = StageGraph("test")
+    graph.add("fails", fails)
+    graph.add("slow", slow)
+    graph.add("later", later_failure)
+    graph.add("downstream", downstream, inputs=("slow",))
+    tracker = StageTracker(None)
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(graph.run(tracker, {}))
+    # The running stage completed, but nothing new started after the failure
+    assert finished == ["slow"]
+    statuses = {entry["name"]: entry["status"] for entry in tracker.stages}
+    assert statuses == {"fails": "failed", "slow": "succeeded", "later": "failed"}
+
+
+def test_failed_optional_stage_outputs_none():
+    async def fails():
+        raise RuntimeError("boom")
+
+    graph = StageGraph("test")
+    graph.add("extra", fails, optional=True)
+    graph.add("uses", _identity, inputs=("extra",))
+    assert _run(graph) == {"extra": None, "uses": None}
+
+
+def test_when_false_skips_the_stage():
+    called = []
+
+    async def stage(x):
+        called.append(x)
+        return x
+
+    graph = StageGraph("test")
+    graph.add("skipped", stage, inputs=("x",), when=lambda x: x > 10)
+    graph.add("after", _identity, inputs=("skipped",))
+    tracker = StageTracker(None)
+    results = asyncio.run(graph.run(tracker, {"x": 1}))
+    assert results["skipped"] is None and results["after"] is None
+    assert called == []
+    assert [entry["name"] for entry in tracker.stages] == ["after"]
+
+
+def test_stage_timeout():
+    async def hangs():
+        await asyncio.sleep(5)
+
+    graph = StageGraph("test")
+    graph.add("hangs", hangs, timeout=0.05)
+    with pytest.raises(StageTimeout, match="Stage hangs timed out after 0.05s"):
+        _run(graph)
+
+
+def test_unknown_kind_and_duplicate_names_are_rejected():
+    graph = StageGraph("test")
+    graph.add("a", _identity)
+    with pytest.raises(ValueError, match="already registered"):
+        graph.add("a", _identity)
+    with pytest.raises(ValueError, match="Unknown stage kind"):
+        graph.add("b", _identity, kind="gpu")
@@ -0,0 +1,55 @@
+"""
+Run queued intake jobs outside the API process.
+
+Run from the backend directory:
+    .venv/bin/python worker.py [--concurrency 4]
+
+Workers share the ``jobs`` table with the API, so any number of these can run
+next to it (set ``JOB_INPROCESS_WORKERS=0`` on the API to leave all intake to
+them). Ctrl-C or SIGTERM stops claiming new jobs and waits for the running
+ones.
+"""
+
+import argparse
+import os
+import signal
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.core.config import settings
+from app.core.http import http_clients
+from app.database import engine, Base
+import app.models  # noqa: F401  (register every table before create_all)
+from app.services.job_worker import WorkerPool
+from app.services.stage_graph import cpu_pool
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run queued intake jobs")
+    parser.add_argument("--concurrency", type=int, default=4, help="jobs run at once")
+    parser.add_argument("--poll", type=float, default=settings.job_poll_seconds, help="idle poll interval (s)")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    http_clients.start()
+    pool = WorkerPool(args.concurrency, args.poll)
+    pool.start()
+    print(f"Running {args.concurrency} job worker(s), Ctrl-C to stop")
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        while not stop.wait(1):
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("Stopping, waiting for running jobs...")
+        pool.stop()
+        cpu_pool.shutdown()
+        http_clients.close()
+
+
+if __name__ == "__main__":
+    main()